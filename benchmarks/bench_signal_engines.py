@@ -0,0 +1,60 @@
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "signal"))
+
+import polars as pl
+from synthetic import make_assets
+from create_signal import LOOKBACK, SKIP, compute_signal
+import numpy as np
+from dense import compute_signal_dense, cross_sectional_zscore, panel_index, rolling_lagged_sum, to_dense
+
+
+def _best_of(fn, repeat: int, *args) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _dense_kernels(df: pl.DataFrame):
+    # Only the array math, with the scatter done up front, to separate the
+    # kernel cost from the long <-> dense conversion
+    asset_idx, obs_idx, date_idx = panel_index(df)
+    log_return = np.log1p(df['return'].to_numpy() / 100)
+    panel = to_dense(log_return, asset_idx, obs_idx, (asset_idx[-1] + 1, obs_idx.max() + 1))
+
+    def run():
+        signal = rolling_lagged_sum(panel, LOOKBACK, SKIP)[asset_idx, obs_idx].astype(np.float64)
+        cross_sectional_zscore(signal, date_idx)
+
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the Polars and dense NumPy signal backends.")
+    parser.add_argument("--assets", type=int, nargs="+", default=[500, 1500, 3000])
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    for n_assets in args.assets:
+        df = make_assets(n_assets=n_assets, n_days=args.days)
+        polars_s = _best_of(compute_signal, args.repeat, df)
+        dense_s = _best_of(compute_signal_dense, args.repeat, df, LOOKBACK, SKIP)
+        kernel_s = _best_of(_dense_kernels(df), args.repeat)
+        rows.append({
+            "assets": n_assets,
+            "rows": df.height,
+            "polars_s": round(polars_s, 3),
+            "dense_s": round(dense_s, 3),
+            "dense_kernels_s": round(kernel_s, 3),
+            "speedup": round(polars_s / dense_s, 2),
+        })
+
+    print(pl.DataFrame(rows))
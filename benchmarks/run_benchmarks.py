@@ -0,0 +1,358 @@
+import os
+import sys
+import json
+import time
+import glob
+import platform
+import argparse
+import datetime as dt
+import subprocess
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "signal"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "framework"))
+
+import numpy as np
+import polars as pl
+import sf_quant.performance as sfp
+from synthetic import make_assets, make_signal, make_weights, write_weights
+from create_signal import LOOKBACK, SKIP, compute_signal
+from dense import compute_signal_dense
+from quantiles import bin_returns
+from daily import ic_term_structure, portfolio_daily
+from bootstrap import return_intervals
+from compact import pack
+from loading import scan_weights
+from risk import FACTORS, ex_ante_variance
+from rolling import rolling_returns
+
+ROOT = Path(__file__).resolve().parents[1]
+HISTORY_PATH = ROOT / "benchmarks" / "results" / "history.json"
+
+# (assets, days); churn and null rates are shared across sizes
+SIZES = {
+    "small": (500, 1260),
+    "medium": (2000, 2520),
+    "large": (4000, 7300),
+}
+
+
+# create_signal stages. load_data is stood in for by a local parquet read so
+# the suite runs without the group database.
+
+def bench_signal_load(ctx):
+    return lambda: pl.read_parquet(ctx["assets_path"])
+
+
+def bench_signal_compute(ctx):
+    return lambda: compute_signal(ctx["assets"])
+
+
+def bench_signal_compute_lazy(ctx):
+    out = os.path.join(ctx["tmp"], "signal_lazy.parquet")
+    return lambda: compute_signal(pl.scan_parquet(ctx["assets_path"])).sink_parquet(out, engine="streaming")
+
+
+def bench_signal_compute_dense(ctx):
+    return lambda: compute_signal_dense(ctx["assets"], LOOKBACK, SKIP)
+
+
+def bench_signal_write(ctx):
+    out = os.path.join(ctx["tmp"], "signal.parquet")
+    return lambda: ctx["computed"].write_parquet(out)
+
+
+# ew_dash cells. Quantile ports time the binning and pivot inside
+# sfr.generate_quantile_ports, which also joins benchmark returns from the
+# database.
+
+def _quantile_ports(signal: pl.DataFrame, num_bins: int) -> pl.DataFrame:
+    return (
+        signal
+        .with_columns(
+            pl.col('alpha')
+            .qcut(num_bins, labels=[f"p_{i}" for i in range(1, num_bins + 1)])
+            .alias('bin')
+            .over('date')
+        )
+        .group_by(['date', 'bin'])
+        .agg(pl.col('return').mean().alias('ew_return'))
+        .sort(['date', 'bin'])
+        .pivot(index='date', on='bin', values='ew_return')
+        .with_columns((pl.col(f"p_{num_bins}") - pl.col('p_1')).alias('spread'))
+    )
+
+
+def _quantile_metrics(ports: pl.DataFrame) -> pl.DataFrame:
+    return (
+        ports
+        .unpivot(index="date", variable_name="quantile", value_name="return")
+        .filter(pl.col("return").is_not_null())
+        .with_columns(pl.col("return").log1p().alias("log_return"))
+        .group_by("quantile")
+        .agg([
+            pl.col("return").mean().alias("mean_return"),
+            pl.col("return").std().alias("std_return"),
+            pl.col("log_return").sum().alias("cum_log_return"),
+            pl.col("return").count().alias("n_obs"),
+        ])
+        .with_columns([
+            (pl.col("cum_log_return").exp() - 1).alias("total_return"),
+            (pl.col("mean_return") / pl.col("std_return")).alias("sharpe_ratio"),
+            (pl.col("mean_return") * 252).alias("annual_return"),
+            (pl.col("std_return") * np.sqrt(252)).alias("annual_vol"),
+        ])
+        .sort("quantile")
+    )
+
+
+def bench_ew_quantiles(ctx):
+    return lambda: _quantile_ports(ctx["signal"], 5)
+
+
+def bench_ew_quantiles_all_bins(ctx):
+    # Every slider position from one ranking, versus one position above
+    return lambda: bin_returns(ctx["signal"])
+
+
+def bench_ew_ic(ctx):
+    signal = ctx["signal"]
+    return lambda: sfp.generate_alpha_ics(
+        signal.select("date", "barrid", "alpha"),
+        signal.filter(pl.col("return").is_not_null()).select("date", "barrid", "return"),
+    )
+
+
+def bench_ew_ic_term_structure(ctx):
+    # ICs at horizons 1 to 22 from one sort, versus the single window above
+    return lambda: ic_term_structure(ctx["signal"])
+
+
+def bench_ew_bootstrap(ctx):
+    # 10,000 stationary bootstrap resamples of one daily return series
+    returns = ctx["signal"].group_by("date").agg(pl.col("return").mean())
+    return lambda: return_intervals(returns)
+
+
+def bench_ew_rolling(ctx):
+    # Rolling Sharpe, volatility and hit rate over three windows from one set
+    # of prefix sums
+    returns = ctx["signal"].group_by("date").agg(pl.col("return").mean())
+    return lambda: rolling_returns(returns, windows=(63, 126, 252))
+
+
+def bench_ew_metrics(ctx):
+    ports = _quantile_ports(ctx["signal"], 5)
+    return lambda: _quantile_metrics(ports)
+
+
+# opt_dash cells. Portfolio returns time the join and aggregation inside
+# sfp.generate_returns_from_weights against the synthetic returns.
+
+def bench_opt_load_weights(ctx):
+    files = sorted(glob.glob(f"{ctx['weights_dir']}/[0-9][0-9][0-9][0-9].parquet"))
+    return lambda: pl.read_parquet(files)
+
+
+def bench_opt_load_weights_compact(ctx):
+    # Shared barrid dictionary and Float32 weights, versus the string keys above
+    target = os.path.join(ctx["tmp"], "weights_compact")
+    pack(ctx["weights_dir"], target, float32=True)
+    return lambda: scan_weights(target).collect()
+
+
+def bench_opt_returns(ctx):
+    returns = ctx["signal"].select("date", "barrid", "return")
+    return lambda: (
+        ctx["weights"]
+        .join(returns, on=["date", "barrid"], how="left")
+        .group_by("date")
+        .agg(pl.col("return").mul("weight").sum().alias("return"))
+        .sort("date")
+    )
+
+
+def bench_opt_leverage(ctx):
+    return lambda: sfp.generate_leverage_from_weights(ctx["weights"])
+
+
+def bench_opt_drawdown(ctx):
+    portfolio_returns = bench_opt_returns(ctx)()
+    return lambda: (
+        portfolio_returns.sort("date")
+        .with_columns(pl.col("return").log1p().cum_sum().alias("_log_val"))
+        .with_columns(pl.col("_log_val").cum_max().alias("_log_peak"))
+        .with_columns((pl.col("_log_val") - pl.col("_log_peak")).exp().sub(1).alias("drawdown"))
+        .select("date", "drawdown")
+    )
+
+
+def bench_opt_turnover(ctx):
+    return lambda: (
+        ctx["weights"]
+        .sort("date", "barrid")
+        .with_columns(pl.col("weight").sub(pl.col("weight").shift(1)).over("barrid").alias("diff"))
+        .group_by("date")
+        .agg(pl.col("diff").abs().sum().alias("two_sided_turnover"))
+        .sort("date")
+        .with_columns(pl.col("two_sided_turnover").rolling_mean(252))
+    )
+
+
+def bench_opt_portfolio_daily(ctx):
+    # Returns, leverage, counts and turnover from one sorted scan, versus
+    # the separate passes above
+    returns = ctx["signal"].select("date", "barrid", "return")
+    return lambda: portfolio_daily(ctx["weights"], returns)
+
+
+def bench_opt_ex_ante_risk(ctx):
+    # x' F x for every date in one batched contraction, with random stand-ins
+    # for the exposures and covariance tables
+    n_days, k = ctx["weights"]["date"].n_unique(), len(FACTORS)
+    rng = np.random.default_rng(0)
+    exposures = rng.normal(size=(n_days, k))
+    factors = rng.normal(size=(n_days, k, k))
+    covariances = factors @ factors.transpose(0, 2, 1) / k
+    return lambda: ex_ante_variance(exposures, covariances)
+
+
+BENCHMARKS = {
+    name.removeprefix("bench_"): fn
+    for name, fn in dict(globals()).items()
+    if name.startswith("bench_")
+}
+
+
+def _time(fn, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes: list[str], names: list[str], repeat: int, churn: float, null_rate: float) -> dict:
+    """
+    Run the selected benchmarks on synthetic data of each size.
+
+    Args:
+        sizes: Keys of `SIZES`
+        names: Keys of `BENCHMARKS`
+        repeat: Timed repetitions per benchmark
+        churn: Universe churn passed to `make_assets`
+        null_rate: Return null rate passed to `make_assets`
+
+    Returns:
+        dict: One history entry with run metadata and per-benchmark timings
+    """
+    results = []
+    for size in sizes:
+        n_assets, n_days = SIZES[size]
+        with tempfile.TemporaryDirectory() as tmp:
+            assets = make_assets(n_assets=n_assets, n_days=n_days, churn=churn, null_rate=null_rate)
+            assets_path = os.path.join(tmp, "assets.parquet")
+            assets.write_parquet(assets_path)
+            weights = make_weights(assets)
+            weights_dir = os.path.join(tmp, "weights")
+            write_weights(weights, weights_dir)
+            ctx = {
+                "tmp": tmp,
+                "assets": assets,
+                "assets_path": assets_path,
+                "computed": compute_signal(assets),
+                "signal": make_signal(assets),
+                "weights": weights,
+                "weights_dir": weights_dir,
+            }
+
+            for name in names:
+                fn = BENCHMARKS[name](ctx)
+                fn()  # warm up
+                times = _time(fn, repeat)
+                results.append({
+                    "benchmark": name,
+                    "size": size,
+                    "rows": assets.height,
+                    "min_s": round(min(times), 4),
+                    "median_s": round(float(np.median(times)), 4),
+                })
+                print(f"{size:>6} {name:<24} {min(times):8.3f}s")
+
+    return {
+        "timestamp": dt.datetime.now().isoformat(timespec="seconds"),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "numpy": np.__version__,
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} cpus)",
+        "config": {"repeat": repeat, "churn": churn, "null_rate": null_rate},
+        "results": results,
+    }
+
+
+def load_history(path: Path = HISTORY_PATH) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(previous: dict, current: dict) -> pl.DataFrame:
+    """
+    Compare two history entries benchmark by benchmark.
+
+    Args:
+        previous: Baseline run
+        current: New run
+
+    Returns:
+        pl.DataFrame: Min timings of both runs and their ratio; `ratio` above
+            1 means the current run is slower
+    """
+    keys = ["benchmark", "size"]
+    before = pl.DataFrame(previous["results"]).select(*keys, pl.col("min_s").alias("before_s"))
+    after = pl.DataFrame(current["results"]).select(*keys, pl.col("min_s").alias("after_s"))
+    return (
+        before
+        .join(after, on=keys, how="inner")
+        .with_columns(pl.col("after_s").truediv("before_s").round(2).alias("ratio"))
+        .sort(keys)
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the synthetic-data benchmark suite.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--churn", type=float, default=0.1)
+    parser.add_argument("--null-rate", type=float, default=0.01)
+    parser.add_argument("--history", type=Path, default=HISTORY_PATH)
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to the history.")
+    args = parser.parse_args()
+
+    entry = run(args.sizes, args.only, args.repeat, args.churn, args.null_rate)
+
+    history = load_history(args.history)
+    if history:
+        with pl.Config(tbl_rows=-1):
+            print(f"\nCompared with {history[-1]['timestamp']} ({history[-1]['git_rev']}):")
+            print(compare(history[-1], entry))
+
+    if not args.no_save:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.history, "w") as f:
+            json.dump(history + [entry], f, indent=2)
+        print(f"\nSaved run to {args.history}")
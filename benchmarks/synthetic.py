@@ -0,0 +1,131 @@
+import os
+import datetime as dt
+import numpy as np
+import polars as pl
+
+
+def _weekdays(start: dt.date, n_days: int) -> pl.Series:
+    calendar = pl.date_range(start, start + dt.timedelta(days=n_days * 2), eager=True)
+    return calendar.filter(calendar.dt.weekday() <= 5).head(n_days)
+
+
+def make_assets(
+    n_assets: int = 3000,
+    n_days: int = 2520,
+    churn: float = 0.0,
+    null_rate: float = 0.0,
+    start: dt.date = dt.date(2000, 1, 3),
+    seed: int = 0,
+) -> pl.DataFrame:
+    """
+    Generate a synthetic panel shaped like `load_data()` output.
+
+    Args:
+        n_assets: Number of distinct assets
+        n_days: Number of weekdays from `start`
+        churn: Expected fraction of assets entering or leaving the universe
+            per year. Each asset is present for one contiguous stretch with
+            an exponential lifetime of mean `1 / churn` years; 0 keeps every
+            asset for the whole sample
+        null_rate: Fraction of `return` values set to null
+        start: First date
+        seed: Random seed
+
+    Returns:
+        pl.DataFrame: `date`, `barrid`, `ticker`, `price`, `return` (percent),
+            `specific_risk` (percent) and `predicted_beta`, sorted by
+            (barrid, date)
+    """
+    rng = np.random.default_rng(seed)
+    dates = _weekdays(start, n_days)
+    barrids = np.array([f"USA{i:04X}" for i in range(n_assets)])
+
+    if churn > 0:
+        lifetime = rng.exponential(252 / churn, n_assets).astype(np.int64) + 1
+        first = rng.integers(-lifetime, n_days)
+    else:
+        lifetime = np.full(n_assets, n_days)
+        first = np.zeros(n_assets, dtype=np.int64)
+    first = np.clip(first, 0, n_days - 1)
+    last = np.clip(first + lifetime, 1, n_days)
+
+    asset = np.repeat(np.arange(n_assets), last - first)
+    offsets = np.arange(len(asset)) - np.repeat(np.cumsum(last - first) - (last - first), last - first)
+    day = np.repeat(first, last - first) + offsets
+    n = len(asset)
+
+    returns = rng.normal(0.03, 2.0, n)
+    if null_rate > 0:
+        returns[rng.random(n) < null_rate] = np.nan
+
+    return pl.DataFrame({
+        'date': dates.to_numpy()[day],
+        'barrid': barrids[asset],
+        'ticker': barrids[asset],
+        'price': np.exp(rng.normal(3.0, 1.0, n)),
+        'return': returns,
+        'specific_risk': rng.uniform(10.0, 60.0, n),
+        'predicted_beta': rng.normal(1.0, 0.3, n),
+    }).with_columns(pl.col('return').fill_nan(None))
+
+
+def make_signal(assets: pl.DataFrame, seed: int = 0) -> pl.DataFrame:
+    """
+    Generate a signal file like `create_signal` writes, from `make_assets` output.
+
+    Args:
+        assets: Synthetic panel
+        seed: Random seed
+
+    Returns:
+        pl.DataFrame: `date`, `barrid`, `return` (decimal), `predicted_beta`,
+            `signal` and `alpha`
+    """
+    rng = np.random.default_rng(seed)
+    signal = rng.normal(0.0, 1.0, assets.height)
+    return (
+        assets
+        .select('date', 'barrid', pl.col('return').truediv(100), 'predicted_beta', 'specific_risk')
+        .with_columns(pl.Series('signal', signal))
+        .with_columns(
+            pl.lit(0.05).mul('signal').mul(pl.col('specific_risk').truediv(100)).alias('alpha')
+        )
+        .drop('specific_risk')
+    )
+
+
+def make_weights(assets: pl.DataFrame, seed: int = 0) -> pl.DataFrame:
+    """
+    Generate persistent long-short portfolio weights over the synthetic universe.
+
+    Each asset's weight is a smoothed random walk, scaled to unit gross
+    leverage per date, so turnover looks like a real optimizer's.
+
+    Args:
+        assets: Synthetic panel
+        seed: Random seed
+
+    Returns:
+        pl.DataFrame: `date`, `barrid` and `weight`
+    """
+    rng = np.random.default_rng(seed)
+    return (
+        assets
+        .select('date', 'barrid')
+        .with_columns(pl.Series('weight', rng.normal(0.0, 1.0, assets.height)))
+        .with_columns(pl.col('weight').ewm_mean(alpha=0.05).over('barrid'))
+        .with_columns(pl.col('weight').truediv(pl.col('weight').abs().sum()).over('date'))
+    )
+
+
+def write_weights(weights: pl.DataFrame, output_dir: str):
+    """
+    Write weights in the backtester's `{YYYY}.parquet` layout.
+
+    Args:
+        weights: Output of `make_weights`
+        output_dir: Directory to write the year files to
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    for (year,), part in weights.group_by(pl.col('date').dt.year()):
+        part.sort('date', 'barrid').write_parquet(f"{output_dir}/{year}.parquet")
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import hashlib
+import polars as pl
+
+import local_backtest
+
+# Written next to the year weight files. Not `manifest.json`, which marks a
+# directory in the compact weights format
+MANIFEST = "backtest_manifest.json"
+FORMAT_VERSION = 1
+
+
+def year_digests(signal_path: str) -> dict[int, dict]:
+    """
+    Content hash of the backtest's input rows in every year of a signal.
+
+    Only the columns the backtest reads are hashed, sorted by (date, barrid),
+    so rewriting the signal with the same values, in another row order or
+    with extra research columns changes nothing. Numeric columns are hashed
+    from their raw buffers and barrids as one joined string, so the digest
+    does not depend on the parquet encoding or the Polars version.
+
+    Args:
+        signal_path: Signal parquet file or partitioned signal directory
+
+    Returns:
+        dict[int, dict]: `signal` digest and `rows` per year, in year order
+    """
+    signal = pl.scan_parquet(signal_path)
+    columns = local_backtest.backtest_columns(signal)
+    # One scan of the backtest columns, split by year in memory
+    years = (
+        signal
+        .select(columns)
+        .sort('date', 'barrid')
+        .with_columns(pl.col('date').dt.year().alias('_year'))
+        .collect()
+        .partition_by('_year', include_key=False, as_dict=True)
+    )
+    digests = {}
+    for (year,), rows in sorted(years.items()):
+        digest = hashlib.sha256()
+        for column in columns:
+            digest.update(column.encode())
+            values = rows[column]
+            if values.dtype == pl.String:
+                digest.update(values.str.join("\0").item().encode())
+            else:
+                digest.update(values.to_physical().cast(pl.Float64).to_numpy().tobytes())
+        digests[year] = {"signal": digest.hexdigest()[:32], "rows": rows.height}
+    return digests
+
+
+def read_manifest(output_dir: str) -> dict:
+    """
+    Inputs recorded for the year weight files of a backtest.
+
+    Args:
+        output_dir: Weight directory
+
+    Returns:
+        dict: Manifest entry per year (as a string), empty when the
+            directory has no manifest or one in another format
+    """
+    path = os.path.join(output_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        manifest = json.load(f)
+    return manifest["years"] if manifest.get("format") == FORMAT_VERSION else {}
+
+
+def stale_years(
+    digests: dict[int, dict],
+    output_dir: str,
+    gamma: float,
+    constraints: list[str],
+) -> list[int]:
+    """
+    Years whose weights are missing or were built from other inputs.
+
+    A year is up to date when the manifest records the same signal digest,
+    gamma and constraints for it and its weight file was written after that
+    submission, so a job that failed or never ran is submitted again.
+
+    Args:
+        digests: `year_digests` of the current signal
+        output_dir: Weight directory
+        gamma: Risk aversion
+        constraints: Constraint names
+
+    Returns:
+        list[int]: Years to submit, in year order
+    """
+    manifest = read_manifest(output_dir)
+    stale = []
+    for year, digest in digests.items():
+        entry = manifest.get(str(year))
+        path = os.path.join(output_dir, f"{year}.parquet")
+        up_to_date = (
+            entry is not None
+            and entry["signal"] == digest["signal"]
+            and entry["gamma"] == gamma
+            and entry["constraints"] == constraints
+            and os.path.exists(path)
+            and os.path.getmtime(path) >= entry["submitted"]
+        )
+        if not up_to_date:
+            stale.append(year)
+    return stale
+
+
+def record_submission(
+    digests: dict[int, dict],
+    years: list[int],
+    output_dir: str,
+    gamma: float,
+    constraints: list[str],
+) -> dict:
+    """
+    Record the inputs of years about to be submitted.
+
+    Entries of the other years of the signal are kept and years no longer
+    in the signal are dropped. Call this before submitting, so weight files
+    written by the jobs are newer than their entries.
+
+    Args:
+        digests: `year_digests` of the current signal
+        years: Years being submitted
+        output_dir: Weight directory
+        gamma: Risk aversion
+        constraints: Constraint names
+
+    Returns:
+        dict: The manifest
+    """
+    previous = read_manifest(output_dir)
+    submitted = time.time()
+    entries = {}
+    for year, digest in digests.items():
+        if year in years:
+            entries[str(year)] = {**digest, "gamma": gamma, "constraints": constraints, "submitted": submitted}
+        elif str(year) in previous:
+            entries[str(year)] = previous[str(year)]
+    manifest = {"format": FORMAT_VERSION, "years": entries}
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, MANIFEST)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+    return manifest
@@ -0,0 +1,195 @@
+import numpy as np
+import polars as pl
+
+# Resamples behind each confidence interval
+N_RESAMPLES = 10_000
+# Mean block length of the stationary bootstrap in observations, about a
+# trading month, so resamples keep the short-range dependence of daily series
+BLOCK_LENGTH = 22
+# Resamples expanded to full paths at once for the drawdown, bounding the
+# index array to BATCH_SIZE x n
+BATCH_SIZE = 500
+CONFIDENCE = 0.95
+
+
+def stationary_blocks(
+    n: int,
+    n_resamples: int,
+    block_length: float,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Blocks of the stationary bootstrap of Politis and Romano, for all resamples at once.
+
+    Each resample strings together blocks that start at uniform positions
+    and have geometric lengths with mean `block_length`, wrapping past the
+    end of the series. The last block of each resample is cut so the
+    resample has exactly `n` observations.
+
+    Args:
+        n: Length of the series
+        n_resamples: Number of resamples
+        block_length: Mean block length
+        rng: Random generator
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: (n_resamples, k) block starts and
+            lengths; each row of lengths sums to `n`, with zero-length
+            blocks padding the end
+    """
+    if n < 2:
+        raise ValueError(f"Need at least 2 observations to resample, got {n}")
+    # Enough blocks that running out before n observations is vanishingly rare
+    k = int(n / block_length * 1.5) + 64
+    lengths = np.minimum(rng.geometric(1 / block_length, (n_resamples, k)), n)
+    ends = np.minimum(np.cumsum(lengths, axis=1), n)
+    short = ends[:, -1] < n
+    ends[short, -1] = n
+    lengths = np.diff(ends, axis=1, prepend=0)
+    starts = rng.integers(0, n, (n_resamples, k))
+    return starts, lengths
+
+
+def _moments(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Mean and standard deviation of every resample from the block sums of
+    # the values and their squares, read off prefix sums of the series
+    # repeated twice so wrapping blocks are contiguous
+    n = len(values)
+    twice = np.tile(values, 2)
+    ends = starts + lengths
+    prefix = np.concatenate([[0.0], np.cumsum(twice)])
+    prefix_sq = np.concatenate([[0.0], np.cumsum(twice * twice)])
+    total = (prefix[ends] - prefix[starts]).sum(axis=1)
+    total_sq = (prefix_sq[ends] - prefix_sq[starts]).sum(axis=1)
+    mean = total / n
+    std = np.sqrt(np.maximum(total_sq - total * mean, 0) / (n - 1))
+    return mean, std
+
+
+def _max_drawdowns(returns: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # Drawdowns need the whole path, so resamples are expanded to index
+    # arrays BATCH_SIZE at a time. Same drawdown as the dashboards: from
+    # the running peak of cumulative log returns.
+    n = len(returns)
+    log_twice = np.tile(np.log1p(returns), 2).astype(np.float32)
+    positions = np.arange(n)
+    heads = np.cumsum(lengths, axis=1) - lengths
+
+    drawdowns = []
+    for i in range(0, len(starts), BATCH_SIZE):
+        offsets = (starts[i:i + BATCH_SIZE] - heads[i:i + BATCH_SIZE]).ravel()
+        index = np.repeat(offsets, lengths[i:i + BATCH_SIZE].ravel()).reshape(-1, n) + positions
+        log_value = log_twice[index].cumsum(axis=1)
+        drawdowns.append((log_value - np.maximum.accumulate(log_value, axis=1)).min(axis=1))
+    return np.expm1(np.concatenate(drawdowns).astype(np.float64))
+
+
+def _intervals(
+    estimates: dict[str, float],
+    draws: dict[str, np.ndarray],
+    confidence: float,
+) -> pl.DataFrame:
+    tail = (1 - confidence) / 2
+    rows = []
+    for name, estimate in estimates.items():
+        lower, upper = np.nanquantile(draws[name], [tail, 1 - tail])
+        rows.append({"metric": name, "estimate": float(estimate), "lower": float(lower), "upper": float(upper)})
+    return pl.DataFrame(rows)
+
+
+def _undefined(names: list[str]) -> pl.DataFrame:
+    # Fewer than two observations have no standard deviation to resample,
+    # e.g. an out-of-sample period that has barely started
+    return pl.DataFrame(
+        {"metric": names, "estimate": np.nan, "lower": np.nan, "upper": np.nan},
+        schema={"metric": pl.String, "estimate": pl.Float64, "lower": pl.Float64, "upper": pl.Float64},
+    )
+
+
+def _single_block(n: int) -> tuple[np.ndarray, np.ndarray]:
+    # The original series as one resample, for the point estimates
+    return np.zeros((1, 1), dtype=np.int64), np.full((1, 1), n)
+
+
+def return_intervals(
+    returns: pl.DataFrame,
+    column: str = 'return',
+    n_resamples: int = N_RESAMPLES,
+    block_length: float = BLOCK_LENGTH,
+    confidence: float = CONFIDENCE,
+    seed: int = 0,
+) -> pl.DataFrame:
+    """
+    Stationary bootstrap intervals for the Sharpe ratio, annual return and max drawdown.
+
+    Sharpe and annual return are annualized like
+    `sfp.generate_returns_summary_table` and come from block sums alone;
+    only the drawdown expands resamples to full paths.
+
+    Args:
+        returns: Frame with `date` and `column`, decimal daily returns
+        column: Return column
+        n_resamples: Number of resamples
+        block_length: Mean block length in days
+        confidence: Coverage of the percentile intervals
+        seed: Random seed, fixed so the dashboards show the same intervals
+            on every run
+
+    Returns:
+        pl.DataFrame: `metric`, `estimate`, `lower` and `upper`, NaN with
+            fewer than two returns
+    """
+    values = returns.sort('date')[column].drop_nulls().to_numpy().astype(np.float64)
+    if len(values) < 2:
+        return _undefined(["Sharpe", "Annual Return", "Max Drawdown"])
+    rng = np.random.default_rng(seed)
+
+    def statistics(starts, lengths):
+        mean, std = _moments(values, starts, lengths)
+        return {
+            "Sharpe": mean / std * np.sqrt(252),
+            "Annual Return": mean * 252,
+            "Max Drawdown": _max_drawdowns(values, starts, lengths),
+        }
+
+    estimates = {name: stat[0] for name, stat in statistics(*_single_block(len(values))).items()}
+    draws = statistics(*stationary_blocks(len(values), n_resamples, block_length, rng))
+    return _intervals(estimates, draws, confidence)
+
+
+def ic_intervals(
+    ics: pl.DataFrame,
+    n_resamples: int = N_RESAMPLES,
+    block_length: float = BLOCK_LENGTH,
+    confidence: float = CONFIDENCE,
+    seed: int = 0,
+) -> pl.DataFrame:
+    """
+    Stationary bootstrap intervals for the mean and IR of daily ICs.
+
+    Both are unannualized, like `daily.ic_summary`. Overlapping forward
+    windows make daily ICs strongly autocorrelated, which the blocks keep.
+
+    Args:
+        ics: Frame with `date` and `ic`
+        n_resamples: Number of resamples
+        block_length: Mean block length in days
+        confidence: Coverage of the percentile intervals
+        seed: Random seed
+
+    Returns:
+        pl.DataFrame: `metric`, `estimate`, `lower` and `upper`, NaN with
+            fewer than two ICs
+    """
+    values = ics.sort('date')['ic'].drop_nulls().drop_nans().to_numpy().astype(np.float64)
+    if len(values) < 2:
+        return _undefined(["IC Mean", "ICIR"])
+    rng = np.random.default_rng(seed)
+
+    def statistics(starts, lengths):
+        mean, std = _moments(values, starts, lengths)
+        return {"IC Mean": mean, "ICIR": mean / std}
+
+    estimates = {name: stat[0] for name, stat in statistics(*_single_block(len(values))).items()}
+    draws = statistics(*stationary_blocks(len(values), n_resamples, block_length, rng))
+    return _intervals(estimates, draws, confidence)
@@ -0,0 +1,189 @@
+import os
+import json
+import argparse
+import datetime as dt
+import polars as pl
+
+import loading
+
+FORMAT_VERSION = 1
+# Rows per parquet row group, roughly one month of the ~4,000-name universe,
+# so date filters can skip whole row groups
+ROW_GROUP_SIZE = 100_000
+
+
+def _write(frame: pl.DataFrame, path: str) -> None:
+    frame.write_parquet(f"{path}.tmp", row_group_size=ROW_GROUP_SIZE, statistics=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def pack(source: str, target: str, float32: bool = False) -> dict:
+    """
+    Rewrite backtest weights in the compact format.
+
+    Every barrid in the backtest goes into one sorted dictionary shared by
+    all year files (`barrids.parquet`), and the year files keep only `date`,
+    the UInt32 `code` of the barrid and `weight`, sorted by (date, code).
+    A `manifest.json` written last records the format, weight type and row
+    counts, so a directory without it is never read as compact.
+
+    Float64 weights round-trip exactly. Float32 halves the weight column and
+    is accurate to about seven significant digits; the largest absolute
+    error is recorded in the manifest.
+
+    Args:
+        source: Directory of `{YYYY}.parquet` files with `date`, `barrid`
+            and `weight`
+        target: Output directory, created if missing
+        float32: Store weights as Float32
+
+    Returns:
+        dict: The manifest
+    """
+    files = loading.year_files(source)
+    if not files:
+        raise FileNotFoundError(f"No year parquet files found in {source}")
+    if loading.read_manifest(source) is not None:
+        raise ValueError(f"{source} is already in the compact format")
+
+    barrids = (
+        pl.scan_parquet(list(files.values()))
+        .select(pl.col('barrid').unique().sort())
+        .collect()['barrid']
+    )
+    codes = pl.Enum(barrids)
+    weight_type = pl.Float32 if float32 else pl.Float64
+
+    os.makedirs(target, exist_ok=True)
+    manifest_path = os.path.join(target, loading.COMPACT_MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    for year in set(loading.year_files(target)) - set(files):
+        os.remove(os.path.join(target, f"{year}.parquet"))
+    _write(pl.DataFrame({'barrid': barrids}), os.path.join(target, loading.COMPACT_DICTIONARY))
+
+    years, max_error = {}, 0.0
+    for year, path in files.items():
+        weights = (
+            pl.scan_parquet(path)
+            .select(
+                'date',
+                pl.col('barrid').cast(codes).to_physical().cast(pl.UInt32).alias('code'),
+                pl.col('weight').cast(weight_type),
+                (pl.col('weight') - pl.col('weight').cast(weight_type).cast(pl.Float64)).abs().alias('_error'),
+            )
+            .sort('date', 'code')
+            .collect()
+        )
+        max_error = max(max_error, weights['_error'].max() or 0.0)
+        out = os.path.join(target, f"{year}.parquet")
+        _write(weights.drop('_error'), out)
+        years[str(year)] = {
+            "rows": weights.height,
+            "start": str(weights['date'].min()),
+            "end": str(weights['date'].max()),
+            "bytes": os.path.getsize(out),
+            "source_bytes": os.path.getsize(path),
+        }
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "weight_type": str(weight_type),
+        "max_weight_error": max_error,
+        "n_barrids": len(barrids),
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "years": years,
+    }
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return manifest
+
+
+def unpack(source: str, target: str) -> int:
+    """
+    Write a compact weights directory back in the backtester's format.
+
+    Year files get `date`, String `barrid` and Float64 `weight` again, sorted
+    by (date, barrid); a Float64 directory reproduces its source exactly up
+    to row order.
+
+    Args:
+        source: Compact weights directory
+        target: Output directory, created if missing
+
+    Returns:
+        int: Number of year files written
+    """
+    if loading.read_manifest(source) is None:
+        raise ValueError(f"{source} is not in the compact format")
+    codes = loading.barrid_enum(source)
+    os.makedirs(target, exist_ok=True)
+    files = loading.year_files(source)
+    for year, path in files.items():
+        weights = (
+            pl.scan_parquet(path)
+            .select(
+                'date',
+                pl.col('code').cast(codes).cast(pl.String).alias('barrid'),
+                pl.col('weight').cast(pl.Float64),
+            )
+            .collect()
+        )
+        _write(weights, os.path.join(target, f"{year}.parquet"))
+    return len(files)
+
+
+def info(directory: str) -> pl.DataFrame:
+    """
+    Per-year rows and file sizes of a compact weights directory.
+
+    Args:
+        directory: Compact weights directory
+
+    Returns:
+        pl.DataFrame: `year`, `rows`, `start`, `end`, `size_mb`, `source_mb`
+            and `ratio` of compact to source size
+    """
+    manifest = loading.read_manifest(directory)
+    if manifest is None:
+        raise ValueError(f"{directory} is not in the compact format")
+    return (
+        pl.DataFrame([{"year": int(year), **entry} for year, entry in manifest["years"].items()])
+        .with_columns(
+            pl.col('bytes').truediv(1024**2).round(2).alias('size_mb'),
+            pl.col('source_bytes').truediv(1024**2).round(2).alias('source_mb'),
+            pl.col('bytes').truediv('source_bytes').round(2).alias('ratio'),
+        )
+        .select('year', 'rows', 'start', 'end', 'size_mb', 'source_mb', 'ratio')
+        .sort('year')
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert backtest weights to and from the compact format.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="Write a weights directory in the compact format.")
+    pack_parser.add_argument("source")
+    pack_parser.add_argument("target")
+    pack_parser.add_argument("--float32", action="store_true", help="Store weights as Float32.")
+    unpack_parser = commands.add_parser("unpack", help="Write a compact directory back in the backtester's format.")
+    unpack_parser.add_argument("source")
+    unpack_parser.add_argument("target")
+    info_parser = commands.add_parser("info", help="Show the rows and sizes of a compact directory.")
+    info_parser.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        manifest = pack(args.source, args.target, args.float32)
+        sizes = info(args.target)
+        print(
+            f"Packed {sizes['rows'].sum():,} rows and {manifest['n_barrids']:,} barrids into {args.target}: "
+            f"{sizes['size_mb'].sum():.1f} MB from {sizes['source_mb'].sum():.1f} MB"
+            + (f", max weight error {manifest['max_weight_error']:.2e}" if args.float32 else "")
+        )
+    elif args.command == "unpack":
+        print(f"Wrote {unpack(args.source, args.target)} year files to {args.target}")
+    else:
+        with pl.Config(tbl_rows=-1):
+            print(info(args.directory))
@@ -0,0 +1,465 @@
+import datetime as dt
+import numpy as np
+import polars as pl
+import sf_quant.data as sfd
+
+# Forward return window of sfp.generate_alpha_ics, the horizon of the
+# headline IC
+IC_WINDOW = 22
+# Horizons of the IC term structure, in observations per asset
+HORIZONS = range(1, IC_WINDOW + 1)
+# Horizons evaluated per pass over the panel, bounding the number of
+# forward return columns held at once
+HORIZON_CHUNK = 6
+
+
+def sample_filter(mode: str, cutoff: dt.date) -> pl.Expr:
+    """
+    Row filter for the dashboards' sample period on a per-date table.
+
+    Args:
+        mode: "Full Sample", "In Sample" or "Out of Sample"
+        cutoff: Last in-sample date
+
+    Returns:
+        pl.Expr: Boolean expression to pass to `filter`
+    """
+    if mode == "In Sample":
+        return pl.col('date') <= cutoff
+    if mode == "Out of Sample":
+        return pl.col('date') > cutoff
+    return pl.lit(True)
+
+
+def _forward(h: int) -> list[pl.Expr]:
+    # On a panel sorted by (barrid, date): the log return summed over the
+    # asset's next h observations starting with the current one, the single
+    # log return h - 1 observations ahead, and the date of that observation.
+    # Plain shifts are masked where they run into the next asset. Rank ICs
+    # only see the order of returns, so log returns give the same ICs.
+    ahead = pl.col('barrid').shift(-(h - 1)) == pl.col('barrid')
+    return [
+        pl.when(ahead)
+        .then(pl.col('_cum').shift(-(h - 1)) - pl.col('_cum') + pl.col('_log'))
+        .alias(f"_cum_{h}"),
+        pl.when(ahead).then(pl.col('_log').shift(-(h - 1))).alias(f"_lag_{h}"),
+        pl.when(ahead).then(pl.col('date').shift(-(h - 1))).alias(f"_end_{h}"),
+    ]
+
+
+def _alpha_ranks(remaining: np.ndarray, runs: np.ndarray, days: np.ndarray, h: int) -> np.ndarray:
+    # On rows sorted by (date, alpha): the average rank of alpha among the
+    # date's rows with an h-observation forward window, as
+    # sfp.generate_alpha_ics ranks it. `runs` and `days` give the first and
+    # last row of each row's run of tied alphas and the first row of its
+    # date. Counting the rows with a window before those rows replaces a
+    # per-date sort for every horizon.
+    valid = remaining >= h - 1
+    seen = np.cumsum(valid)
+    before = seen - valid
+    first, last = runs
+    return np.where(valid, (before[first] + seen[last] + 1) / 2 - before[days], np.nan)
+
+
+def _rank_ic(h: int, returns: str) -> pl.Expr:
+    # Rank correlation over the rows with an h-observation forward window,
+    # ranking the returns within those rows
+    valid = pl.col(f"_cum_{h}").is_not_null()
+    return pl.corr(
+        pl.col(f"_alpha_rank_{h}").filter(valid),
+        pl.col(f"_{returns}_{h}").filter(valid).rank(),
+    )
+
+
+def ic_term_structure(signal: pl.DataFrame, horizons: range = HORIZONS) -> pl.DataFrame:
+    """
+    Daily rank ICs of the signal at several forward horizons from one pass.
+
+    The panel is sorted and cumulated once; every horizon's forward returns
+    are then differences and shifts of that one cumulative sum, evaluated a
+    few horizons per grouped pass. Alpha is sorted within each date once;
+    each horizon's alpha ranks are counted from that order. The `ic` at horizon h equals
+    `sfp.generate_alpha_ics(..., window=h)`, so the `IC_WINDOW` horizon is
+    the dashboards' headline IC.
+
+    Args:
+        signal: Frame with `date`, `barrid`, `alpha` and `return`
+        horizons: Forward horizons in observations per asset
+
+    Returns:
+        pl.DataFrame: `date`, `horizon`, `ic` (against the return over the
+            next `horizon` observations), `lag_ic` (against the single
+            return `horizon - 1` observations ahead), `n` and `window_end`,
+            the latest date of any forward window behind the ICs
+    """
+    horizons = list(horizons)
+    base = (
+        signal
+        .lazy()
+        .filter(pl.col('return').is_not_null())
+        .select('date', 'barrid', 'alpha', pl.col('return').log1p().alias('_log'))
+        .sort('barrid', 'date')
+        .with_columns(pl.col('_log').cum_sum().alias('_cum'))
+        .collect()
+    )
+    usable = pl.col('alpha').is_not_null() & pl.col('alpha').is_finite()
+
+    # Rows with a usable alpha in (date, alpha) order, each with the number
+    # of observations its asset has after it
+    ranked = (
+        base
+        .with_row_index('_row')
+        .with_columns(pl.len().over('barrid').sub(pl.int_range(pl.len()).over('barrid') + 1).alias('_remaining'))
+        .filter(usable)
+        .sort('date', 'alpha')
+        .with_row_index('_position')
+        .select(
+            '_row',
+            '_remaining',
+            pl.col('_position').first().over(pl.col('date').rle_id()).alias('_day_first'),
+            pl.col('_position').first().over(pl.struct('date', 'alpha').rle_id()).alias('_run_first'),
+            pl.col('_position').last().over(pl.struct('date', 'alpha').rle_id()).alias('_run_last'),
+        )
+    )
+    rows = ranked['_row'].to_numpy()
+    remaining = ranked['_remaining'].to_numpy()
+    days = ranked['_day_first'].to_numpy()
+    runs = ranked['_run_first'].to_numpy(), ranked['_run_last'].to_numpy()
+
+    parts = []
+    for i in range(0, len(horizons), HORIZON_CHUNK):
+        chunk = horizons[i:i + HORIZON_CHUNK]
+        alpha_ranks = []
+        for h in chunk:
+            values = np.full(base.height, np.nan)
+            values[rows] = _alpha_ranks(remaining, runs, days, h)
+            alpha_ranks.append(pl.Series(f"_alpha_rank_{h}", values, nan_to_null=True))
+        wide = (
+            base
+            .with_columns(alpha_ranks)
+            .lazy()
+            .with_columns(expr for h in chunk for expr in _forward(h))
+            .filter(usable)
+            .group_by('date')
+            .agg(
+                expr
+                for h in chunk
+                for expr in (
+                    _rank_ic(h, 'cum').alias(f"ic_{h}"),
+                    _rank_ic(h, 'lag').alias(f"lag_ic_{h}"),
+                    pl.col(f"_cum_{h}").count().alias(f"n_{h}"),
+                    pl.col(f"_end_{h}").max().alias(f"window_end_{h}"),
+                )
+            )
+            .collect()
+        )
+        parts.extend(
+            wide.select(
+                'date',
+                pl.lit(h, dtype=pl.Int16).alias('horizon'),
+                pl.col(f"ic_{h}").alias('ic'),
+                pl.col(f"lag_ic_{h}").alias('lag_ic'),
+                pl.col(f"n_{h}").alias('n'),
+                pl.col(f"window_end_{h}").alias('window_end'),
+            )
+            for h in chunk
+        )
+
+    return pl.concat(parts).filter(pl.col('n') > 0).sort('horizon', 'date')
+
+
+def sample_ics(
+    ics: pl.DataFrame,
+    signal: pl.DataFrame,
+    mode: str,
+    cutoff: dt.date,
+) -> pl.DataFrame:
+    """
+    ICs for a sample period from the full-history `ic_term_structure` table.
+
+    Equal to running `ic_term_structure` on the signal filtered to the
+    sample. Out-of-sample ICs and in-sample ICs whose forward windows end by
+    the cutoff are read from the table. The few dates just before the cutoff,
+    whose windows would see later returns, are recomputed from that slice of
+    the signal alone.
+
+    Args:
+        ics: Output of `ic_term_structure` on the full signal
+        signal: The full signal
+        mode: "Full Sample", "In Sample" or "Out of Sample"
+        cutoff: Last in-sample date
+
+    Returns:
+        pl.DataFrame: `date`, `horizon`, `ic`, `lag_ic` and `n`
+    """
+    if mode != "In Sample":
+        return ics.filter(sample_filter(mode, cutoff)).drop('window_end')
+
+    complete = ics.filter(pl.col('window_end') <= cutoff).drop('window_end')
+    stale = ics.filter((pl.col('date') <= cutoff) & (pl.col('window_end') > cutoff)).select('date', 'horizon')
+    if stale.is_empty():
+        return complete
+
+    # Forward windows only look ahead, so the slice starting at the first
+    # stale date gives the same window returns as the whole in-sample panel
+    recomputed = ic_term_structure(
+        signal.filter(pl.col('date').is_between(stale['date'].min(), cutoff)),
+        horizons=sorted(stale['horizon'].unique()),
+    )
+    return (
+        pl.concat([
+            complete,
+            recomputed.join(stale, on=['date', 'horizon'], how='semi').drop('window_end'),
+        ])
+        .sort('horizon', 'date')
+    )
+
+
+def headline_ics(ics: pl.DataFrame) -> pl.DataFrame:
+    """
+    Args:
+        ics: `ic_term_structure` or `sample_ics` output
+
+    Returns:
+        pl.DataFrame: `date`, `ic` and `n` at the `IC_WINDOW` horizon
+    """
+    return ics.filter(pl.col('horizon') == IC_WINDOW).select('date', 'ic', 'n')
+
+
+def ic_decay(ics: pl.DataFrame) -> pl.DataFrame:
+    """
+    Mean and IR of the daily ICs at each horizon.
+
+    Args:
+        ics: `ic_term_structure` or `sample_ics` output
+
+    Returns:
+        pl.DataFrame: `horizon`, `ic_mean`, `icir`, `lag_ic_mean`,
+            `lag_icir` and `n_dates`
+    """
+    return (
+        ics
+        .group_by('horizon')
+        .agg(
+            pl.col('ic').mean().alias('ic_mean'),
+            (pl.col('ic').mean() / pl.col('ic').std()).alias('icir'),
+            pl.col('lag_ic').mean().alias('lag_ic_mean'),
+            (pl.col('lag_ic').mean() / pl.col('lag_ic').std()).alias('lag_icir'),
+            pl.col('ic').count().alias('n_dates'),
+        )
+        .sort('horizon')
+    )
+
+
+def half_life(decay: pl.DataFrame) -> float | None:
+    """
+    Horizons from the strongest lagged IC until its mean has fallen by half.
+
+    Interpolates linearly between the horizons of `decay`. Measured in the
+    direction of the strongest IC, so negative signals decay too.
+
+    Args:
+        decay: Output of `ic_decay`
+
+    Returns:
+        float | None: The half-life in observations, or None if the lagged
+            IC does not halve within the horizons
+    """
+    decay = decay.drop_nulls('lag_ic_mean')
+    if decay.is_empty():
+        return None
+    horizon = decay['horizon'].cast(pl.Float64).to_list()
+    lag_ic = decay['lag_ic_mean'].to_list()
+
+    peak = max(range(len(lag_ic)), key=lambda i: abs(lag_ic[i]))
+    sign = 1.0 if lag_ic[peak] > 0 else -1.0
+    half = abs(lag_ic[peak]) / 2
+    for i in range(peak + 1, len(lag_ic)):
+        prev, curr = sign * lag_ic[i - 1], sign * lag_ic[i]
+        if curr <= half:
+            crossing = horizon[i - 1] + (prev - half) / (prev - curr) * (horizon[i] - horizon[i - 1])
+            return crossing - horizon[peak]
+    return None
+
+
+def asset_returns(start: dt.date, end: dt.date) -> pl.DataFrame:
+    """
+    Daily asset returns as `sfp.generate_returns_from_weights` loads them.
+
+    Args:
+        start: First date
+        end: Last date
+
+    Returns:
+        pl.DataFrame: `date`, `barrid` and decimal `return`
+    """
+    return (
+        sfd.load_assets(start=start, end=end, in_universe=True, columns=['date', 'barrid', 'return'])
+        .with_columns(pl.col('return').truediv(100))
+    )
+
+
+def portfolio_daily(weights: pl.DataFrame, returns: pl.DataFrame | None = None) -> pl.DataFrame:
+    """
+    Reduce backtest weights to one row per date in a single sorted pass.
+
+    Weights are joined with asset returns and sorted by (barrid, date)
+    once; every column below comes from plain shifts over that order and
+    one aggregation per date. Every opt_dash metric reads this table.
+
+    Turnover is the sum over names of the absolute weight change since the
+    previous portfolio date, treating a name that is not held as a zero
+    weight. Names entering the book count their full weight on the day
+    they enter and names leaving count their last weight on the day they
+    are gone. The first date has no previous book, so its turnover is null.
+
+    Args:
+        weights: Frame with `date`, `barrid` and `weight`; `barrid` may be
+            the Enum of a compact weights directory
+        returns: `date`, `barrid` and decimal `return`; loaded with
+            `asset_returns` over the weights' dates when omitted
+
+    Returns:
+        pl.DataFrame: `date`, `return` (as `sfp.generate_returns_from_weights`),
+            `gross_leverage`, `net_leverage`, `n_names`, `n_long`, `n_short`
+            and `two_sided_turnover`
+    """
+    if returns is None:
+        returns = asset_returns(weights['date'].min(), weights['date'].max())
+    returns = returns.lazy().select('date', 'barrid', 'return')
+    barrids = weights.schema['barrid']
+    if isinstance(barrids, pl.Enum):
+        # Compact weights: encode the returns with the same dictionary so
+        # the join and sort below run on integer codes
+        returns = (
+            returns
+            .filter(pl.col('barrid').is_in(barrids.categories.implode()))
+            .with_columns(pl.col('barrid').cast(barrids))
+        )
+
+    # Position of each date in the backtest, so "previous portfolio date"
+    # is an integer step even across weekends and holidays
+    dates = weights.select('date').unique().sort('date').with_row_index('_d')
+    same_prev = (pl.col('barrid') == pl.col('barrid').shift(1)) & (pl.col('_d').shift(1) == pl.col('_d') - 1)
+    same_next = (pl.col('barrid') == pl.col('barrid').shift(-1)) & (pl.col('_d').shift(-1) == pl.col('_d') + 1)
+
+    rows = (
+        weights
+        .lazy()
+        .select('date', 'barrid', 'weight')
+        .join(dates.lazy(), on='date')
+        .join(returns, on=['date', 'barrid'], how='left')
+        .sort('barrid', 'date')
+        .with_columns(
+            pl.when(same_prev)
+            .then(pl.col('weight') - pl.col('weight').shift(1))
+            .otherwise(pl.col('weight'))
+            .abs()
+            .alias('_trade'),
+            # A name missing on the next date was sold down to zero then
+            pl.when(~same_next.fill_null(False) & (pl.col('_d') < dates.height - 1))
+            .then(pl.col('_d') + 1)
+            .alias('_exit_d'),
+        )
+        .collect()
+    )
+
+    per_date = (
+        rows
+        .group_by('_d')
+        .agg(
+            pl.col('return').mul('weight').sum().alias('return'),
+            pl.col('weight').abs().sum().alias('gross_leverage'),
+            pl.col('weight').sum().alias('net_leverage'),
+            pl.len().alias('n_names'),
+            (pl.col('weight') > 0).sum().alias('n_long'),
+            (pl.col('weight') < 0).sum().alias('n_short'),
+            pl.col('_trade').sum().alias('_traded'),
+        )
+    )
+    exits = (
+        rows
+        .drop_nulls('_exit_d')
+        .group_by(pl.col('_exit_d').alias('_d'))
+        .agg(pl.col('weight').abs().sum().alias('_exited'))
+    )
+    return (
+        dates
+        .join(per_date, on='_d', how='left')
+        .join(exits, on='_d', how='left')
+        .with_columns(
+            pl.when(pl.col('_d') > 0)
+            .then(pl.col('_traded') + pl.col('_exited').fill_null(0))
+            .alias('two_sided_turnover')
+        )
+        .select(
+            'date',
+            'return',
+            'gross_leverage',
+            'net_leverage',
+            'n_names',
+            'n_long',
+            'n_short',
+            'two_sided_turnover',
+        )
+        .sort('date')
+    )
+
+
+def drawdown(returns: pl.DataFrame) -> pl.DataFrame:
+    """
+    Drawdown from the running peak of cumulative log returns.
+
+    Args:
+        returns: `date` and `return`, decimal
+
+    Returns:
+        pl.DataFrame: `date` and `drawdown`
+    """
+    return (
+        returns.sort("date")
+        .with_columns(pl.col("return").log1p().cum_sum().alias("_log_val"))
+        .with_columns(pl.col("_log_val").cum_max().alias("_log_peak"))
+        .with_columns(
+            (pl.col("_log_val") - pl.col("_log_peak")).exp().sub(1).alias("drawdown")
+        )
+        .select("date", "drawdown")
+    )
+
+
+def ic_summary(ics: pl.DataFrame) -> dict[str, float]:
+    """
+    Args:
+        ics: Daily ICs with an `ic` column
+
+    Returns:
+        dict[str, float]: `ic_mean` and `icir` (mean over standard deviation)
+    """
+    return ics.select(
+        pl.col('ic').mean().alias('ic_mean'),
+        (pl.col('ic').mean() / pl.col('ic').std()).alias('icir'),
+    ).row(0, named=True)
+
+
+def turnover_stats(daily: pl.DataFrame) -> pl.DataFrame:
+    """
+    Turnover summary in the `sfp.get_turnover_stats` layout from a `portfolio_daily` table.
+
+    Args:
+        daily: `date` and `two_sided_turnover`, already restricted to the sample
+
+    Returns:
+        pl.DataFrame: Mean, min and max of the rolling 252-day mean turnover
+    """
+    return (
+        daily
+        .sort('date')
+        .select(pl.col('two_sided_turnover').rolling_mean(252))
+        .drop_nulls('two_sided_turnover')
+        .select(
+            pl.col('two_sided_turnover').mean().alias('Mean Turnover'),
+            pl.col('two_sided_turnover').min().alias('Min Turnover'),
+            pl.col('two_sided_turnover').max().alias('Max Turnover'),
+        )
+        .with_columns(pl.selectors.float().round(4))
+    )
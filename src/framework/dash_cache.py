@@ -0,0 +1,206 @@
+import os
+import glob
+import json
+import hashlib
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable
+import polars as pl
+from dotenv import load_dotenv
+
+from sf_signal import cache_store
+
+
+def cache_dir() -> str | None:
+    """
+    Directory holding cached dashboard results, or None when caching is off.
+
+    Returns:
+        str | None: Value of `DASH_CACHE_DIR`
+    """
+    return os.getenv("DASH_CACHE_DIR") or None
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv("DASH_CACHE_MAX_MB", "2048")) * 1024**2)
+
+
+def _sf_quant_version() -> str | None:
+    try:
+        return version("sf-quant")
+    except PackageNotFoundError:
+        return None
+
+
+def _hash_files(paths: list[str]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash the contents of a signal file, or of every parquet file in a directory.
+
+    Hashing a multi-gigabyte signal takes seconds, so digests are remembered
+    in the cache directory by path, size and modification time and only
+    recomputed when the file changes.
+
+    Args:
+        path: Signal file or partitioned signal directory
+
+    Returns:
+        str: Hex digest of the contents
+    """
+    files = sorted(glob.glob(os.path.join(path, "*.parquet"))) if os.path.isdir(path) else [path]
+    stamp = [[os.path.abspath(f), os.path.getsize(f), os.stat(f).st_mtime_ns] for f in files]
+
+    root = cache_dir()
+    if root is None:
+        return _hash_files(files)
+
+    index_path = os.path.join(root, "digests.json")
+    index = {}
+    if os.path.exists(index_path):
+        with open(index_path) as f:
+            index = json.load(f)
+
+    known = index.get(os.path.abspath(path))
+    if known is not None and known["stamp"] == stamp:
+        return known["digest"]
+
+    digest = _hash_files(files)
+    index[os.path.abspath(path)] = {"stamp": stamp, "digest": digest}
+    os.makedirs(root, exist_ok=True)
+    with open(f"{index_path}.tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(f"{index_path}.tmp", index_path)
+    return digest
+
+
+def files_digest(paths: list[str]) -> str:
+    """
+    `file_digest` of several files, e.g. the year files of a weights sample.
+
+    Args:
+        paths: Files to hash
+
+    Returns:
+        str: Their digests, comma separated
+    """
+    return ",".join(file_digest(path) for path in paths)
+
+
+def cache_key(kind: str, digest: str, params: dict) -> str:
+    """
+    Hash a dashboard computation together with its inputs.
+
+    The installed `sf_quant` version is part of the key, so upgrading the
+    library recomputes everything instead of serving stale results.
+
+    Args:
+        kind: Name of the computation, e.g. `quantile_ports`
+        digest: `file_digest` of the signal
+        params: UI parameters the computation depends on
+
+    Returns:
+        str: Hex digest identifying the cached result
+    """
+    return cache_store.hash_params({
+        "kind": kind,
+        "signal": digest,
+        "params": params,
+        "sf_quant": _sf_quant_version(),
+    })
+
+
+def _store() -> cache_store.ArrowCache:
+    return cache_store.ArrowCache(cache_dir(), _max_bytes())
+
+
+def cached(
+    kind: str,
+    fn: Callable[[], pl.DataFrame],
+    digest: str | Callable[[], str],
+    **params,
+) -> pl.DataFrame:
+    """
+    Return the cached result of `fn` for this signal and parameters, computing it on a miss.
+
+    Results are stored as uncompressed Arrow IPC files and memory-mapped on
+    a hit. The cache is trimmed back under `DASH_CACHE_MAX_MB` by evicting
+    the least recently used entries.
+
+    Args:
+        kind: Name of the computation, e.g. `quantile_ports`
+        fn: Computes the result from scratch
+        digest: `file_digest` of the signal, or a function returning it.
+            A function is only called when caching is on, so a disabled
+            cache never reads the inputs just to hash them
+        **params: UI parameters the computation depends on
+
+    Returns:
+        pl.DataFrame: Result of `fn`
+    """
+    if cache_dir() is None:
+        return fn()
+    digest = digest() if callable(digest) else digest
+    meta = {"kind": kind, "signal": digest, "params": params}
+    return _store().get(cache_key(kind, digest, params), fn, meta)
+
+
+def cache_info() -> pl.DataFrame:
+    """
+    List cached results, most recently used first.
+
+    Returns:
+        pl.DataFrame: One row per entry with its computation, parameters, size and last use
+    """
+    return _store().info(lambda meta: {
+        "kind": meta.get("kind"),
+        "signal": meta.get("signal"),
+        "params": json.dumps(meta.get("params", {}), sort_keys=True),
+        "rows": meta.get("rows"),
+    })
+
+
+def evict(max_bytes: int) -> list[str]:
+    """
+    Delete least recently used entries until the cache fits in `max_bytes`.
+
+    Args:
+        max_bytes: Size budget for the cache directory
+
+    Returns:
+        list[str]: Keys that were evicted
+    """
+    return _store().evict(max_bytes)
+
+
+def clear_cache() -> int:
+    """
+    Remove every cached result and remembered file digest.
+
+    Returns:
+        int: Number of entries removed
+    """
+    removed = len(evict(0))
+    index_path = os.path.join(cache_dir() or "", "digests.json")
+    if cache_dir() is not None and os.path.exists(index_path):
+        os.remove(index_path)
+    return removed
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    cache_store.main(
+        "Inspect or clear the dashboard results cache.",
+        "DASH_CACHE_DIR",
+        cache_dir,
+        cache_info,
+        clear_cache,
+        hidden=["key", "signal"],
+    )
@@ -13,11 +13,32 @@ def _():
     import plotly.express as px
     import dataframely as dy
     from sf_quant.schema import AlphaSchema, SecurityRetSchema
+    import sf_quant.data as sfd
     import sf_quant.research as sfr
-    import sf_quant.performance as sfp
     import polars_ols
     import pandas
-    return go, marimo, np, pl, sfp, sfr
+    import bootstrap
+    import dash_cache
+    import daily
+    import quantiles
+    import sketch
+    import plotting
+    import rolling
+    return (
+        bootstrap,
+        daily,
+        dash_cache,
+        go,
+        marimo,
+        np,
+        pl,
+        plotting,
+        quantiles,
+        rolling,
+        sfd,
+        sfr,
+        sketch,
+    )
 
 
 @app.cell
@@ -47,6 +68,15 @@ def _(pl, signal_file):
     return (signal_df,)
 
 
+@app.cell
+def _(dash_cache, signal_file):
+    # Content hash of the signal; cached results are keyed on it. Only
+    # computed when a lookup needs it, so a disabled cache reads nothing
+    def signal_digest():
+        return dash_cache.file_digest(signal_file.value)
+    return (signal_digest,)
+
+
 @app.cell
 def _(marimo, signal_df):
     marimo.stop(signal_df.is_empty(), marimo.md("**⚠️ Please load a valid signal file first**"))
@@ -67,14 +97,17 @@ def _(marimo):
 
 
 @app.cell
-def _(pl, sample_cutoff, sample_mode, signal_df):
-    if sample_mode.value == "In Sample":
-        signal_df_filtered = signal_df.filter(pl.col("date") <= sample_cutoff.value)
-    elif sample_mode.value == "Out of Sample":
-        signal_df_filtered = signal_df.filter(pl.col("date") > sample_cutoff.value)
-    else:
-        signal_df_filtered = signal_df
-    return (signal_df_filtered,)
+def _(daily, sample_cutoff, sample_mode, signal_df):
+    # Per-date tables below are filtered with the same expression
+    sample_filter = daily.sample_filter(sample_mode.value, sample_cutoff.value)
+    signal_df_filtered = signal_df.filter(sample_filter)
+
+    # The cutoff only matters outside the full sample
+    sample_params = {
+        "sample_mode": sample_mode.value,
+        "sample_cutoff": None if sample_mode.value == "Full Sample" else sample_cutoff.value.isoformat(),
+    }
+    return sample_filter, sample_params, signal_df_filtered
 
 
 @app.cell
@@ -85,6 +118,20 @@ def _(marimo, signal_df_filtered):
     return
 
 
+@app.cell
+def _(marimo, signal_df):
+    # Plots show this window, thinned to about a thousand points per line;
+    # narrow it to see a shorter stretch at full resolution
+    plot_window = marimo.ui.date_range(
+        start=signal_df["date"].min(),
+        stop=signal_df["date"].max(),
+        value=(signal_df["date"].min(), signal_df["date"].max()),
+        label="Plot window:",
+    )
+    plot_window
+    return (plot_window,)
+
+
 @app.cell
 def _(marimo):
     marimo.md("""
@@ -102,17 +149,30 @@ def _(sfr, signal_df_filtered):
 
 
 @app.cell
-def _(signal_df_filtered):
+def _(marimo, np, signal_df_filtered, sketch):
     import matplotlib.pyplot as plt
     plt.style.use('default')
-    _signal_values = signal_df_filtered.select('signal').to_numpy().flatten()
+    # Histogram counts and a quantile digest built a year at a time, instead
+    # of copying the whole column out for plt.hist
+    _digest, _hist = sketch.column_sketch(signal_df_filtered, 'signal', bins=50)
     plt.figure(figsize=(10, 6))
-    plt.hist(_signal_values, bins=50, color='steelblue', edgecolor='black', alpha=0.7)
+    plt.bar(
+        _hist.edges[:-1], _hist.counts, width=np.diff(_hist.edges), align='edge',
+        color='steelblue', edgecolor='black', alpha=0.7,
+    )
     plt.title("Signal Distribution")
     plt.xlabel("Signal Value")
     plt.ylabel("Frequency")
     plt.tight_layout()
-    plt.gca()
+
+    _table = "\n".join(
+        ["| Quantile | Signal |", "|----------|--------|"]
+        + [
+            f"| {q:.1%} | {v:.4f} |"
+            for q, v in zip(sketch.TAIL_QUANTILES, _digest.quantile(sketch.TAIL_QUANTILES))
+        ]
+    )
+    marimo.hstack([plt.gca(), marimo.md(_table)])
     return
 
 
@@ -140,12 +200,48 @@ def _(marimo):
 
 
 @app.cell
-def _(n_quantiles, sfr, signal_df_filtered):
+def _(daily, dash_cache, quantiles, sfd, signal_df, signal_digest):
+    # Reduce the full panel once to per-date tables. Rank alpha once per
+    # date and keep equal-weight bin returns for every slider position, so
+    # moving the slider or the sample cutoff only filters small tables
+    quantile_returns = dash_cache.cached(
+        "bin_returns",
+        lambda: quantiles.bin_returns(signal_df, signal_col='alpha'),
+        signal_digest,
+    )
+    alpha_ic_terms = dash_cache.cached(
+        "ic_term_structure",
+        lambda: daily.ic_term_structure(signal_df),
+        signal_digest,
+    )
+    benchmark_returns = dash_cache.cached(
+        "benchmark_returns",
+        lambda: sfd.load_benchmark_returns(signal_df['date'].min(), signal_df['date'].max()),
+        signal_digest,
+    )
+    return alpha_ic_terms, benchmark_returns, quantile_returns
+
+
+@app.cell
+def _(alpha_ic_terms, daily, sample_cutoff, sample_mode, signal_df):
+    # Daily ICs at every horizon for the sample period
+    ic_terms = daily.sample_ics(alpha_ic_terms, signal_df, sample_mode.value, sample_cutoff.value)
+    return (ic_terms,)
+
+
+@app.cell
+def _(
+    benchmark_returns,
+    n_quantiles,
+    quantile_returns,
+    quantiles,
+    sample_filter,
+):
     # Create quantile portfolios based on alpha signal
-    quantile_df = sfr.generate_quantile_ports(
-        signal_df_filtered,
+    quantile_df = quantiles.quantile_ports(
+        quantile_returns.filter(sample_filter),
         num_bins=n_quantiles.value,
-        signal_col='alpha'
+        benchmark=benchmark_returns,
     ).drop_nulls()
     return (quantile_df,)
 
@@ -198,7 +294,7 @@ def _(pl, ports_long):
 
 
 @app.cell
-def _(cumul_returns, go, marimo, n_quantiles, pl):
+def _(cumul_returns, go, marimo, n_quantiles, pl, plot_window, plotting):
     # Plot cumulative returns
     fig = go.Figure()
 
@@ -208,18 +304,20 @@ def _(cumul_returns, go, marimo, n_quantiles, pl):
         dates = data.select("date").to_numpy().flatten()
         returns = data.select("cum_return").to_numpy().flatten()
 
-        fig.add_trace(go.Scatter(
+        fig.add_trace(plotting.trace(
             x=dates,
             y=returns,
+            x_range=plot_window.value,
             mode='lines',
             name=f"Q{i+1}",
             hovertemplate='<b>%{fullData.name}</b><br>Date: %{x|%Y-%m-%d}<br>Cum Return: %{y:.2f}<extra></extra>'
         ))
 
     _spread_data = cumul_returns.filter(pl.col("quantile") == "spread")
-    fig.add_trace(go.Scatter(
+    fig.add_trace(plotting.trace(
         x=_spread_data.select("date").to_numpy().flatten(),
         y=_spread_data.select("cum_return").to_numpy().flatten(),
+        x_range=plot_window.value,
         mode='lines',
         name="Spread",
         line=dict(color="black", width=2, dash="dash"),
@@ -240,62 +338,26 @@ def _(cumul_returns, go, marimo, n_quantiles, pl):
 
 
 @app.cell
-def _(np, pl, ports_long):
+def _(quantile_df, quantiles):
     # Calculate performance metrics
-    metrics = (
-        ports_long
-        .filter(
-            pl.col("return").is_not_null() &
-            (pl.col("quantile") != "bmk_return")
-        )
-        .with_columns([
-            pl.col("return").log1p().alias("log_return")
-        ])
-        .group_by("quantile")
-        .agg([
-            pl.col("return").mean().alias("mean_return"),
-            pl.col("return").std().alias("std_return"),
-            pl.col("log_return").sum().alias("cum_log_return"),
-            pl.col("return").count().alias("n_obs"),
-        ])
-        .with_columns([
-            (pl.col("cum_log_return").exp() - 1).alias("total_return"),
-            (pl.col("mean_return") / pl.col("std_return")).alias("sharpe_ratio"),
-            (pl.col("mean_return") * 252).alias("annual_return"),  # Assuming daily data
-            (pl.col("std_return") * np.sqrt(252)).alias("annual_vol"),
-        ])
-        .select([
-            "quantile",
-            "annual_return",
-            "annual_vol",
-            "sharpe_ratio",
-            "total_return",
-            "n_obs"
-        ])
-        .sort("quantile")
-    )
+    metrics = quantiles.port_metrics(quantile_df)
     return (metrics,)
 
 
 @app.cell
-def _(marimo, metrics, pl, sfp, signal_df_filtered):
+def _(daily, ic_terms, marimo, metrics, pl):
     _spread = metrics.filter(pl.col("quantile") == "spread")
     _spread_sharpe = _spread.select("sharpe_ratio").item()
     _spread_ann_ret = _spread.select("annual_return").item()
 
-    _ics = sfp.generate_alpha_ics(
-        signal_df_filtered.select("date", "barrid", "alpha"),
-        signal_df_filtered.filter(pl.col("return").is_not_null()).select("date", "barrid", "return"),
-    )
-    _ic_mean = _ics.select(pl.col("ic").mean()).item()
-    _ic_ir = _ics.select(
-        (pl.col("ic").mean() / pl.col("ic").std()).alias("icir")
-    ).item()
+    _ic = daily.ic_summary(daily.headline_ics(ic_terms))
+    _ic_mean = _ic["ic_mean"]
+    _ic_ir = _ic["icir"]
 
     marimo.md(f"""
     | Metric | Value |
     |--------|-------|
-    | Spread Sharpe | **{_spread_sharpe:.3f}** |
+    | Spread Sharpe (annualized) | **{_spread_sharpe:.3f}** |
     | Spread Ann. Return | **{_spread_ann_ret:.2%}** |
     | IC (mean) | **{_ic_mean:.4f}** |
     | IC IR | **{_ic_ir:.3f}** |
@@ -303,6 +365,23 @@ def _(marimo, metrics, pl, sfp, signal_df_filtered):
     return
 
 
+@app.cell
+def _(bootstrap, daily, ic_terms, marimo, pl, quantile_df):
+    # Stationary block bootstrap of the spread returns and the daily ICs
+    _intervals = pl.concat([
+        bootstrap.return_intervals(quantile_df.select("date", pl.col("spread").alias("return"))),
+        bootstrap.ic_intervals(daily.headline_ics(ic_terms)),
+    ])
+    marimo.md(f"""
+    ### Spread and IC 95% Confidence Intervals
+
+    {_intervals.to_pandas().to_markdown(index=False, floatfmt=".4f")}
+
+    Sharpe and annual return are annualized; 10,000 resamples with a mean block length of 22 days.
+    """)
+    return
+
+
 @app.cell
 def _(marimo, metrics):
     marimo.md(f"""
@@ -313,6 +392,128 @@ def _(marimo, metrics):
     return
 
 
+@app.cell
+def _(marimo):
+    marimo.md("""
+    ## Rolling Diagnostics
+
+    Spread Sharpe, volatility, beta to the benchmark and hit rate, and the IC mean and ICIR, over trailing windows. All windows come from one set of running sums, so adding a window costs almost nothing.
+    """)
+    return
+
+
+@app.cell
+def _(marimo, rolling):
+    rolling_windows = marimo.ui.multiselect(
+        options=[str(_w) for _w in rolling.WINDOW_OPTIONS],
+        value=[str(_w) for _w in rolling.WINDOWS],
+        label="Rolling windows (days):",
+    )
+    rolling_windows
+    return (rolling_windows,)
+
+
+@app.cell
+def _(daily, ic_terms, marimo, pl, quantile_df, rolling, rolling_windows):
+    marimo.stop(not rolling_windows.value, marimo.md("**Select at least one rolling window**"))
+    _windows = tuple(sorted(int(_w) for _w in rolling_windows.value))
+    rolling_returns = rolling.rolling_returns(
+        quantile_df.select("date", pl.col("spread").alias("return"), "bmk_return"),
+        market="bmk_return",
+        windows=_windows,
+    )
+    rolling_ics = rolling.rolling_ics(daily.headline_ics(ic_terms), windows=_windows)
+    return rolling_ics, rolling_returns
+
+
+@app.cell
+def _(go, marimo, pl, plot_window, plotting, rolling_ics, rolling_returns):
+    _panels = [
+        (rolling_returns, "sharpe", "Rolling Spread Sharpe (Annualized)"),
+        (rolling_returns, "vol", "Rolling Spread Volatility (Annualized)"),
+        (rolling_returns, "beta", "Rolling Spread Beta to Benchmark"),
+        (rolling_returns, "hit_rate", "Rolling Spread Hit Rate"),
+        (rolling_ics, "ic_mean", "Rolling IC Mean"),
+        (rolling_ics, "icir", "Rolling ICIR"),
+    ]
+    _figs = []
+    for _data, _column, _title in _panels:
+        _fig = go.Figure()
+        for _window in _data["window"].unique().sort():
+            _rows = _data.filter(pl.col("window") == _window)
+            _fig.add_trace(plotting.trace(
+                x=_rows.select("date").to_numpy().flatten(),
+                y=_rows.select(_column).to_numpy().flatten(),
+                x_range=plot_window.value,
+                mode='lines',
+                name=f"{_window}d",
+                hovertemplate=f'{_window}d<br>Date: %{{x|%Y-%m-%d}}<br>%{{y:.3f}}<extra></extra>'
+            ))
+        _fig.update_layout(
+            title=_title,
+            xaxis_title="Date",
+            hovermode='x unified',
+            height=350,
+            template="plotly_white"
+        )
+        _figs.append(marimo.ui.plotly(_fig))
+    marimo.vstack([marimo.hstack(_figs[_i:_i + 2], widths="equal") for _i in range(0, len(_figs), 2)])
+    return
+
+
+@app.cell
+def _(marimo):
+    marimo.md("""
+    ## IC Term Structure
+
+    Rank IC against the return over the next 1 to 22 days, and against the single return that many days ahead.
+    """)
+    return
+
+
+@app.cell
+def _(daily, go, ic_terms, marimo):
+    _decay = daily.ic_decay(ic_terms)
+    _half_life = daily.half_life(_decay)
+
+    _fig_decay = go.Figure()
+    _fig_decay.add_trace(go.Scatter(
+        x=_decay["horizon"],
+        y=_decay["ic_mean"],
+        mode='lines+markers',
+        name='Cumulative return IC',
+        line=dict(color='steelblue', width=2),
+        hovertemplate='Horizon: %{x}<br>IC: %{y:.4f}<extra></extra>'
+    ))
+    _fig_decay.add_trace(go.Scatter(
+        x=_decay["horizon"],
+        y=_decay["lag_ic_mean"],
+        mode='lines+markers',
+        name='Lagged return IC',
+        line=dict(color='darkorange', width=2),
+        hovertemplate='Horizon: %{x}<br>IC: %{y:.4f}<extra></extra>'
+    ))
+    _fig_decay.add_hline(y=0, line_dash="dash", line_color="red", opacity=0.3)
+    _fig_decay.update_layout(
+        title="Mean Rank IC by Horizon",
+        xaxis_title="Horizon (days)",
+        yaxis_title="Mean Rank IC",
+        height=400,
+        template="plotly_white"
+    )
+
+    _half_life_text = f"{_half_life:.1f} days" if _half_life is not None else "not reached"
+    marimo.vstack([
+        marimo.ui.plotly(_fig_decay),
+        marimo.md(f"""
+    **Half-life of the lagged IC:** {_half_life_text}
+
+    {_decay.to_pandas().to_markdown(index=False, floatfmt=".4f")}
+    """),
+    ])
+    return
+
+
 @app.cell
 def _(marimo):
     marimo.md("""
@@ -324,8 +525,14 @@ def _(marimo):
 
 
 @app.cell
-def _(quantile_df, sfr):
-    sfr.run_quantile_ff_regression(quantile_df)
+def _(dash_cache, n_quantiles, quantile_df, sample_params, sfr, signal_digest):
+    dash_cache.cached(
+        "quantile_ff_regression",
+        lambda: sfr.run_quantile_ff_regression(quantile_df),
+        signal_digest,
+        num_bins=n_quantiles.value,
+        **sample_params,
+    )
     return
 
 
@@ -0,0 +1,216 @@
+import os
+import glob
+import json
+import datetime as dt
+import polars as pl
+import pyarrow.parquet as pq
+
+# Columns each dashboard computation reads
+WEIGHT_COLUMNS = ['date', 'barrid', 'weight']
+SIGNAL_COLUMNS = ['date', 'barrid', 'alpha', 'return']
+# Types of the key columns, for the empty frame of a window no file covers
+_KEY_TYPES = {'date': pl.Date, 'barrid': pl.String}
+# Files a compact weights directory keeps next to its year files (see compact.py)
+COMPACT_MANIFEST = 'manifest.json'
+COMPACT_DICTIONARY = 'barrids.parquet'
+
+
+def year_files(directory: str) -> dict[int, str]:
+    """
+    Year files of a backtest or partitioned signal directory.
+
+    Args:
+        directory: Directory of `{YYYY}.parquet` files
+
+    Returns:
+        dict[int, str]: Path per year, in year order
+    """
+    paths = sorted(glob.glob(os.path.join(directory, "[0-9][0-9][0-9][0-9].parquet")))
+    return {int(os.path.basename(p)[:4]): p for p in paths}
+
+
+def sample_window(mode: str, cutoff: dt.date) -> tuple[dt.date | None, dt.date | None]:
+    """
+    Inclusive date bounds of the dashboards' sample period.
+
+    Args:
+        mode: "Full Sample", "In Sample" or "Out of Sample"
+        cutoff: Last in-sample date
+
+    Returns:
+        tuple[dt.date | None, dt.date | None]: (start, end), None where unbounded
+    """
+    if mode == "In Sample":
+        return None, cutoff
+    if mode == "Out of Sample":
+        return cutoff + dt.timedelta(days=1), None
+    return None, None
+
+
+def date_range(path: str) -> tuple[dt.date, dt.date] | None:
+    """
+    First and last `date` in a parquet file, from its row group statistics.
+
+    Only the footer is read.
+
+    Args:
+        path: Parquet file with a `date` column
+
+    Returns:
+        tuple[dt.date, dt.date] | None: (min, max), or None when the file
+            has no statistics for `date`
+    """
+    metadata = pq.ParquetFile(path).metadata
+    column = metadata.schema.to_arrow_schema().get_field_index('date')
+    if column < 0 or metadata.num_row_groups == 0:
+        return None
+    lows, highs = [], []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        lows.append(stats.min)
+        highs.append(stats.max)
+    return min(lows), max(highs)
+
+
+def files_in_window(files: dict[int, str], start: dt.date | None, end: dt.date | None) -> list[str]:
+    """
+    Year files that can hold dates between `start` and `end`.
+
+    The year in the file name rules out most files without opening them;
+    the rest are checked against their `date` statistics.
+
+    Args:
+        files: Output of `year_files`
+        start: First date, or None
+        end: Last date, or None
+
+    Returns:
+        list[str]: Paths to read, in year order
+    """
+    kept = []
+    for year, path in files.items():
+        if (start is not None and year < start.year) or (end is not None and year > end.year):
+            continue
+        bounds = date_range(path)
+        if bounds is not None and (
+            (start is not None and bounds[1] < start) or (end is not None and bounds[0] > end)
+        ):
+            continue
+        kept.append(path)
+    return kept
+
+
+def _empty(columns: list[str], types: dict = _KEY_TYPES) -> pl.LazyFrame:
+    return pl.LazyFrame(schema={c: types.get(c, pl.Float64) for c in columns})
+
+
+def _window(start: dt.date | None, end: dt.date | None) -> pl.Expr:
+    bounds = []
+    if start is not None:
+        bounds.append(pl.col('date') >= start)
+    if end is not None:
+        bounds.append(pl.col('date') <= end)
+    return pl.all_horizontal(bounds) if bounds else pl.lit(True)
+
+
+def read_manifest(directory: str) -> dict | None:
+    """
+    Manifest of a compact weights directory.
+
+    Args:
+        directory: Weights directory
+
+    Returns:
+        dict | None: The manifest, or None for a directory in the backtester's
+            own format
+    """
+    path = os.path.join(directory, COMPACT_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def barrid_enum(directory: str) -> pl.Enum:
+    """
+    Shared barrid dictionary of a compact weights directory as an Enum.
+
+    Code `i` in the year files is the `i`-th category, so casting the codes
+    to this Enum decodes them without touching a string.
+
+    Args:
+        directory: Compact weights directory
+
+    Returns:
+        pl.Enum: Barrids in code order
+    """
+    return pl.Enum(pl.read_parquet(os.path.join(directory, COMPACT_DICTIONARY))['barrid'])
+
+
+def scan_weights(
+    directory: str,
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    columns: list[str] = WEIGHT_COLUMNS,
+) -> pl.LazyFrame:
+    """
+    Lazily scan the backtest weights between two dates.
+
+    Year files outside the window are never opened, and the date filter and
+    column projection are pushed into the scan, so row groups outside the
+    window and unused columns are skipped too.
+
+    A compact directory (see `compact.py`) is read as integer codes; its
+    `barrid` comes back as an Enum over the shared dictionary, which joins
+    and sorts as the codes, and its weights as stored (Float32 or Float64).
+
+    Args:
+        directory: Directory of `{YYYY}.parquet` weight files
+        start: First date, or None
+        end: Last date, or None
+        columns: Columns to read
+
+    Returns:
+        pl.LazyFrame: The weights in the window, empty if no file overlaps it
+    """
+    files = files_in_window(year_files(directory), start, end)
+    if read_manifest(directory) is None:
+        if not files:
+            return _empty(columns)
+        return pl.scan_parquet(files).filter(_window(start, end)).select(columns)
+
+    barrids = barrid_enum(directory)
+    if not files:
+        return _empty(columns, {**_KEY_TYPES, 'barrid': barrids})
+    return (
+        pl.scan_parquet(files)
+        .filter(_window(start, end))
+        .with_columns(pl.col('code').cast(barrids).alias('barrid'))
+        .select(columns)
+    )
+
+
+def scan_signal(
+    path: str,
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    columns: list[str] = SIGNAL_COLUMNS,
+) -> pl.LazyFrame:
+    """
+    Lazily scan a signal file, or a partitioned signal directory, between two dates.
+
+    Args:
+        path: Signal parquet file or directory of `{YYYY}.parquet` files
+        start: First date, or None
+        end: Last date, or None
+        columns: Columns to read
+
+    Returns:
+        pl.LazyFrame: The signal in the window, empty if no file overlaps it
+    """
+    files = files_in_window(year_files(path), start, end) if os.path.isdir(path) else [path]
+    if not files:
+        return _empty(columns)
+    return pl.scan_parquet(files).filter(_window(start, end)).select(columns)
@@ -0,0 +1,153 @@
+import os
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from concurrent.futures import as_completed
+import polars as pl
+import sf_quant.backtester as sfb
+import sf_quant.optimizer as sfo
+
+from sf_signal.pools import pool_size, process_pool
+
+# Constraint names accepted in CONSTRAINTS, as in the Slurm backend
+CONSTRAINTS = {
+    'FullInvestment': sfo.FullInvestment,
+    'ZeroInvestment': sfo.ZeroInvestment,
+    'LongOnly': sfo.LongOnly,
+    'NoBuyingOnMargin': sfo.NoBuyingOnMargin,
+    'UnitBeta': sfo.UnitBeta,
+    'ZeroBeta': sfo.ZeroBeta,
+}
+
+
+def signal_years(signal_path: str) -> list[int]:
+    """
+    Years present in a signal file or partitioned signal directory.
+
+    Args:
+        signal_path: Signal parquet file or directory of `{YYYY}.parquet` files
+
+    Returns:
+        list[int]: Sorted years
+    """
+    return (
+        pl.scan_parquet(signal_path)
+        .select(pl.col('date').dt.year().unique().sort())
+        .collect()
+        .to_series()
+        .to_list()
+    )
+
+
+def backtest_columns(signal: pl.LazyFrame) -> list[str]:
+    """
+    Signal columns the backtest reads: `date`, `barrid`, `alpha` and, when
+    present, `predicted_beta` for the beta constraints.
+
+    Args:
+        signal: Signal scan
+
+    Returns:
+        list[str]: Column names
+    """
+    names = signal.collect_schema().names()
+    return ['date', 'barrid', 'alpha', *(['predicted_beta'] if 'predicted_beta' in names else [])]
+
+
+def _run_year(
+    year: int,
+    signal_path: str,
+    output_path: str,
+    log_path: str,
+    gamma: float,
+    constraints: list[str],
+) -> tuple[int, int, float]:
+    # Runs in a worker: one year of the signal, everything it prints
+    # (including the backtester's progress bar) goes to the chunk's log
+    start = time.perf_counter()
+    with open(log_path, "w") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            print(f"Backtest {year}: gamma={gamma}, constraints={constraints}")
+            signal = pl.scan_parquet(signal_path)
+            data = signal.filter(pl.col('date').dt.year() == year).select(backtest_columns(signal)).collect()
+            weights = sfb.backtest_sequential(data, [CONSTRAINTS[c]() for c in constraints], gamma)
+            weights.write_parquet(f"{output_path}.tmp")
+            os.replace(f"{output_path}.tmp", output_path)
+            seconds = time.perf_counter() - start
+            print(f"Wrote {weights.height:,} rows to {output_path} in {seconds:.1f}s")
+        except Exception:
+            traceback.print_exc()
+            raise
+    return year, weights.height, seconds
+
+
+def run_local(
+    signal_path: str,
+    output_dir: str,
+    logs_dir: str,
+    gamma: float,
+    constraints: list[str],
+    years: list[int] | None = None,
+    max_workers: int | None = None,
+) -> dict[int, str]:
+    """
+    Run the backtest on this machine, one process per year.
+
+    Each year is the same chunk a Slurm job would run: its signal rows go
+    through `sfb.backtest_sequential` and the weights are written to
+    `{output_dir}/{YYYY}.parquet` (swapped in atomically), with the chunk's
+    output in `{logs_dir}/{YYYY}.log`. Workers are spawned with an equal
+    share of the Polars thread pool. A failed year does not stop the
+    others; all failures are raised together at the end.
+
+    Args:
+        signal_path: Signal parquet file or partitioned signal directory
+        output_dir: Directory for the year weight files
+        logs_dir: Directory for the per-year logs
+        gamma: Risk aversion
+        constraints: Constraint names, keys of `CONSTRAINTS`
+        years: Years to run, every year of the signal by default
+        max_workers: Process count, capped at the number of years and CPUs
+
+    Returns:
+        dict[int, str]: Weight file per year
+    """
+    unknown = sorted(set(constraints) - set(CONSTRAINTS))
+    if unknown:
+        raise KeyError(f"Unknown constraints {unknown}. Available: {', '.join(CONSTRAINTS)}")
+
+    years = signal_years(signal_path) if years is None else years
+    if not years:
+        print("No years to backtest.")
+        return {}
+    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(logs_dir, exist_ok=True)
+    outputs = {year: os.path.join(output_dir, f"{year}.parquet") for year in years}
+    logs = {year: os.path.join(logs_dir, f"{year}.log") for year in years}
+
+    workers = pool_size(len(years), max_workers)
+    print(f"Backtesting {len(years)} years on {workers} local workers")
+
+    failed = {}
+    with process_pool(workers) as pool:
+        futures = {
+            pool.submit(_run_year, year, signal_path, outputs[year], logs[year], gamma, constraints): year
+            for year in years
+        }
+        for future in as_completed(futures):
+            year = futures[future]
+            try:
+                _, rows, seconds = future.result()
+            except Exception as e:
+                failed[year] = e
+                print(f"  {year}  failed: {e!r}  (see {logs[year]})")
+            else:
+                print(f"  {year}  {rows:>12,} rows  {seconds:7.1f}s  -> {outputs[year]}")
+
+    if failed:
+        raise RuntimeError(
+            f"Backtest failed for {sorted(failed)}. Logs: "
+            + ", ".join(logs[year] for year in sorted(failed))
+        )
+    return outputs
+
@@ -6,12 +6,40 @@ app = marimo.App(width="full")
 
 @app.cell
 def _():
+    import os
     import marimo
     import polars as pl
     import plotly.graph_objects as go
+    import sf_quant.data as sfd
     import sf_quant.performance as sfp
     import sf_quant.research as sfr
-    return go, marimo, pl, sfp, sfr
+    from sf_signal import tables
+    import bootstrap
+    import dash_cache
+    import daily
+    import loading
+    import plotting
+    import risk
+    import rolling
+    import runs
+    return (
+        bootstrap,
+        daily,
+        dash_cache,
+        go,
+        loading,
+        marimo,
+        os,
+        pl,
+        plotting,
+        risk,
+        rolling,
+        runs,
+        sfd,
+        sfp,
+        sfr,
+        tables,
+    )
 
 
 @app.cell
@@ -33,28 +61,20 @@ def _(marimo):
 
 
 @app.cell
-def _(data_dir, pl):
-    import glob
-    _files = sorted(glob.glob(f"{data_dir.value}/[0-9][0-9][0-9][0-9].parquet"))
-    weights_raw = pl.read_parquet(_files)
-    return (weights_raw,)
+def _(data_dir, loading):
+    weight_files = loading.year_files(data_dir.value)
+    return (weight_files,)
 
 
 @app.cell
-def _(pl, signal_file):
-    signal_raw = pl.read_parquet(signal_file.value)
-    return (signal_raw,)
-
-
-@app.cell
-def _(marimo, weights_raw):
-    marimo.stop(weights_raw.is_empty(), marimo.md("**⚠️ No year parquet files found in the weights directory**"))
+def _(marimo, weight_files):
+    marimo.stop(not weight_files, marimo.md("**⚠️ No year parquet files found in the weights directory**"))
     return
 
 
 @app.cell
-def _(marimo, signal_raw):
-    marimo.stop(signal_raw.is_empty(), marimo.md("**⚠️ Signal file not found or empty**"))
+def _(marimo, os, signal_file):
+    marimo.stop(not os.path.exists(signal_file.value), marimo.md("**⚠️ Signal file not found or empty**"))
     return
 
 
@@ -72,52 +92,94 @@ def _(marimo):
 
 
 @app.cell
-def _(pl, sample_cutoff, sample_mode, signal_raw, weights_raw):
-    if sample_mode.value == "In Sample":
-        weights = weights_raw.filter(pl.col("date") <= sample_cutoff.value)
-        signal_df = signal_raw.filter(pl.col("date") <= sample_cutoff.value)
-    elif sample_mode.value == "Out of Sample":
-        weights = weights_raw.filter(pl.col("date") > sample_cutoff.value)
-        signal_df = signal_raw.filter(pl.col("date") > sample_cutoff.value)
-    else:
-        weights = weights_raw
-        signal_df = signal_raw
-    return signal_df, weights
+def _(loading, sample_cutoff, sample_mode, weight_files):
+    sample_window = loading.sample_window(sample_mode.value, sample_cutoff.value)
+    # Only the year files that overlap the sample are opened below
+    sample_files = loading.files_in_window(weight_files, *sample_window)
+
+    # The cutoff only matters outside the full sample
+    sample_params = {
+        "sample_mode": sample_mode.value,
+        "sample_cutoff": None if sample_mode.value == "Full Sample" else sample_cutoff.value.isoformat(),
+    }
+    return sample_files, sample_params, sample_window
+
+
+@app.cell
+def _(marimo, sample_files):
+    marimo.stop(not sample_files, marimo.md("**⚠️ No weights in the selected sample period**"))
+    return
+
+
+@app.cell
+def _(
+    daily,
+    dash_cache,
+    data_dir,
+    loading,
+    sample_files,
+    sample_params,
+    sample_window,
+    signal_file,
+    tables,
+):
+    # Scan only the sample's year files and the columns each table needs,
+    # then reduce them to per-date tables; every metric below reads these.
+    # Digests are only computed when the cache is on; portfolio returns
+    # come from the assets table, so its fingerprint is part of the key
+    portfolio = dash_cache.cached(
+        "portfolio_daily",
+        lambda: daily.portfolio_daily(loading.scan_weights(data_dir.value, *sample_window).collect()),
+        lambda: f"{dash_cache.files_digest(sample_files)}|{tables.table_version('ASSETS_TABLE', 'assets')}",
+        **sample_params,
+    )
+    ic_terms = dash_cache.cached(
+        "opt_ic_term_structure",
+        lambda: daily.ic_term_structure(loading.scan_signal(signal_file.value, *sample_window).collect()),
+        lambda: dash_cache.file_digest(signal_file.value),
+        **sample_params,
+    )
+    ics = daily.headline_ics(ic_terms)
+    return ic_terms, ics, portfolio
 
 
 @app.cell
-def _(marimo, weights):
-    _min = weights.select("date").min().item()
-    _max = weights.select("date").max().item()
-    marimo.md(f"**Date range:** {_min} → {_max} &nbsp;&nbsp; **({weights['date'].n_unique()} trading days)**")
+def _(marimo, portfolio):
+    _min = portfolio.select("date").min().item()
+    _max = portfolio.select("date").max().item()
+    marimo.md(f"**Date range:** {_min} → {_max} &nbsp;&nbsp; **({portfolio['date'].n_unique()} trading days)**")
     return
 
 
 @app.cell
-def _(pl, sfp, weights):
-    portfolio_returns = (
-        sfp.generate_returns_from_weights(weights).with_columns(pl.col('return').truediv(100))
+def _(marimo, portfolio):
+    # Plots show this window, thinned to about a thousand points per line;
+    # narrow it to see a shorter stretch at full resolution
+    plot_window = marimo.ui.date_range(
+        start=portfolio["date"].min(),
+        stop=portfolio["date"].max(),
+        value=(portfolio["date"].min(), portfolio["date"].max()),
+        label="Plot window:",
     )
+    plot_window
+    return (plot_window,)
+
+
+@app.cell
+def _(pl, portfolio):
+    portfolio_returns = portfolio.select("date", pl.col('return').truediv(100))
     return (portfolio_returns,)
 
 
 @app.cell
-def _(sfp, weights):
-    leverage = sfp.generate_leverage_from_weights(weights)
+def _(pl, portfolio):
+    leverage = portfolio.select("date", pl.col("gross_leverage").round(2).alias("leverage"))
     return (leverage,)
 
 
 @app.cell
-def _(pl, portfolio_returns):
-    drawdown = (
-        portfolio_returns.sort("date")
-        .with_columns(pl.col("return").log1p().cum_sum().alias("_log_val"))
-        .with_columns(pl.col("_log_val").cum_max().alias("_log_peak"))
-        .with_columns(
-            (pl.col("_log_val") - pl.col("_log_peak")).exp().sub(1).alias("drawdown")
-        )
-        .select("date", "drawdown")
-    )
+def _(daily, portfolio_returns):
+    drawdown = daily.drawdown(portfolio_returns)
     return (drawdown,)
 
 
@@ -160,6 +222,23 @@ def _(leverage, marimo, sfp):
     return
 
 
+@app.cell
+def _(bootstrap, ics, marimo, pl, portfolio_returns):
+    # Stationary block bootstrap of the daily returns and ICs
+    _intervals = pl.concat([
+        bootstrap.return_intervals(portfolio_returns),
+        bootstrap.ic_intervals(ics),
+    ])
+    marimo.md(f"""
+    ### 95% Confidence Intervals
+
+    {_intervals.to_pandas().to_markdown(index=False, floatfmt=".4f")}
+
+    Sharpe and annual return are annualized; 10,000 resamples with a mean block length of 22 days.
+    """)
+    return
+
+
 @app.cell
 def _(marimo):
     marimo.md("""
@@ -169,16 +248,17 @@ def _(marimo):
 
 
 @app.cell
-def _(go, marimo, pl, portfolio_returns):
+def _(go, marimo, pl, plot_window, plotting, portfolio_returns):
     _data = (
         portfolio_returns
         .sort("date")
         .with_columns(pl.col("return").log1p().cum_sum().alias("cum_ret"))
     )
     _fig = go.Figure()
-    _fig.add_trace(go.Scatter(
+    _fig.add_trace(plotting.trace(
         x=_data.select("date").to_numpy().flatten(),
         y=_data.select("cum_ret").to_numpy().flatten() * 100,
+        x_range=plot_window.value,
         mode='lines',
         name='Portfolio',
         line=dict(color='steelblue', width=2),
@@ -206,11 +286,12 @@ def _(marimo):
 
 
 @app.cell
-def _(drawdown, go, marimo):
+def _(drawdown, go, marimo, plot_window, plotting):
     _fig_dd = go.Figure()
-    _fig_dd.add_trace(go.Scatter(
+    _fig_dd.add_trace(plotting.trace(
         x=drawdown.select("date").to_numpy().flatten(),
         y=drawdown.select("drawdown").to_numpy().flatten() * 100,
+        x_range=plot_window.value,
         mode='lines',
         name='Drawdown',
         line=dict(color='crimson', width=2),
@@ -238,16 +319,26 @@ def _(marimo):
 
 
 @app.cell
-def _(go, leverage, marimo):
+def _(go, leverage, marimo, plot_window, plotting, portfolio):
     _fig_lev = go.Figure()
-    _fig_lev.add_trace(go.Scatter(
+    _fig_lev.add_trace(plotting.trace(
         x=leverage.select("date").to_numpy().flatten(),
         y=leverage.select("leverage").to_numpy().flatten(),
+        x_range=plot_window.value,
         mode='lines',
         name='Leverage',
         line=dict(color='steelblue', width=2),
         hovertemplate='Date: %{x|%Y-%m-%d}<br>Leverage: %{y:.2f}<extra></extra>'
     ))
+    _fig_lev.add_trace(plotting.trace(
+        x=portfolio.select("date").to_numpy().flatten(),
+        y=portfolio.select("net_leverage").to_numpy().flatten(),
+        x_range=plot_window.value,
+        mode='lines',
+        name='Net Leverage',
+        line=dict(color='gray', width=1),
+        hovertemplate='Date: %{x|%Y-%m-%d}<br>Net Leverage: %{y:.2f}<extra></extra>'
+    ))
     _fig_lev.update_layout(
         title="Portfolio Leverage",
         xaxis_title="Date",
@@ -260,6 +351,31 @@ def _(go, leverage, marimo):
     return
 
 
+@app.cell
+def _(go, marimo, plot_window, plotting, portfolio):
+    _fig_names = go.Figure()
+    for _column, _name, _color in [("n_long", "Long", "seagreen"), ("n_short", "Short", "crimson")]:
+        _fig_names.add_trace(plotting.trace(
+            x=portfolio.select("date").to_numpy().flatten(),
+            y=portfolio.select(_column).to_numpy().flatten(),
+            x_range=plot_window.value,
+            mode='lines',
+            name=_name,
+            line=dict(color=_color, width=2),
+            hovertemplate='Date: %{x|%Y-%m-%d}<br>Names: %{y:d}<extra></extra>'
+        ))
+    _fig_names.update_layout(
+        title="Names Held",
+        xaxis_title="Date",
+        yaxis_title="Number of Names",
+        hovermode='x unified',
+        height=400,
+        template="plotly_white"
+    )
+    marimo.ui.plotly(_fig_names)
+    return
+
+
 @app.cell
 def _(marimo):
     marimo.md("""
@@ -269,8 +385,8 @@ def _(marimo):
 
 
 @app.cell
-def _(marimo, sfp, weights):
-    _to_stats = sfp.get_turnover_stats(weights)
+def _(daily, marimo, portfolio):
+    _to_stats = daily.turnover_stats(portfolio)
     marimo.md(f"""
     ### Turnover Summary
 
@@ -280,30 +396,18 @@ def _(marimo, sfp, weights):
 
 
 @app.cell
-def _(pl, weights):
-    turnover = (
-        weights
-        .sort("date", "barrid")
-        .with_columns(
-            pl.col("weight")
-            .sub(pl.col("weight").shift(1))
-            .over("barrid")
-            .alias("diff")
-        )
-        .group_by("date")
-        .agg(pl.col("diff").abs().sum().alias("two_sided_turnover"))
-        .sort("date")
-        .with_columns(pl.col("two_sided_turnover").rolling_mean(252))
-    )
+def _(pl, portfolio):
+    turnover = portfolio.select("date", pl.col("two_sided_turnover").rolling_mean(252))
     return (turnover,)
 
 
 @app.cell
-def _(go, marimo, turnover):
+def _(go, marimo, plot_window, plotting, turnover):
     _fig_to = go.Figure()
-    _fig_to.add_trace(go.Scatter(
+    _fig_to.add_trace(plotting.trace(
         x=turnover.select("date").to_numpy().flatten(),
         y=turnover.select("two_sided_turnover").to_numpy().flatten(),
+        x_range=plot_window.value,
         mode='lines',
         name='Turnover',
         line=dict(color='steelblue', width=2),
@@ -324,24 +428,243 @@ def _(go, marimo, turnover):
 @app.cell
 def _(marimo):
     marimo.md("""
-    ## Information Coefficient (IC)
+    ## Rolling Diagnostics
+
+    Portfolio Sharpe, volatility, beta to the benchmark and hit rate, and the IC mean and ICIR, over trailing windows. All windows come from one set of running sums, so adding a window costs almost nothing.
+    """)
+    return
+
+
+@app.cell
+def _(dash_cache, portfolio, sfd):
+    _start, _end = portfolio["date"].min(), portfolio["date"].max()
+    benchmark_returns = dash_cache.cached(
+        "benchmark_returns",
+        lambda: sfd.load_benchmark_returns(_start, _end),
+        f"{_start}:{_end}",
+    )
+    return (benchmark_returns,)
+
+
+@app.cell
+def _(marimo, rolling):
+    rolling_windows = marimo.ui.multiselect(
+        options=[str(_w) for _w in rolling.WINDOW_OPTIONS],
+        value=[str(_w) for _w in rolling.WINDOWS],
+        label="Rolling windows (days):",
+    )
+    rolling_windows
+    return (rolling_windows,)
+
+
+@app.cell
+def _(
+    benchmark_returns,
+    ics,
+    marimo,
+    portfolio,
+    rolling,
+    rolling_windows,
+):
+    marimo.stop(not rolling_windows.value, marimo.md("**Select at least one rolling window**"))
+    _windows = tuple(sorted(int(_w) for _w in rolling_windows.value))
+    rolling_returns = rolling.rolling_returns(
+        portfolio.select("date", "return").join(benchmark_returns, on="date", how="left"),
+        market="bmk_return",
+        windows=_windows,
+    )
+    rolling_ics = rolling.rolling_ics(ics, windows=_windows)
+    return rolling_ics, rolling_returns
+
+
+@app.cell
+def _(go, marimo, pl, plot_window, plotting, rolling_ics, rolling_returns):
+    _panels = [
+        (rolling_returns, "sharpe", "Rolling Portfolio Sharpe (Annualized)"),
+        (rolling_returns, "vol", "Rolling Portfolio Volatility (Annualized)"),
+        (rolling_returns, "beta", "Rolling Portfolio Beta to Benchmark"),
+        (rolling_returns, "hit_rate", "Rolling Portfolio Hit Rate"),
+        (rolling_ics, "ic_mean", "Rolling IC Mean"),
+        (rolling_ics, "icir", "Rolling ICIR"),
+    ]
+    _figs = []
+    for _data, _column, _title in _panels:
+        _fig = go.Figure()
+        for _window in _data["window"].unique().sort():
+            _rows = _data.filter(pl.col("window") == _window)
+            _fig.add_trace(plotting.trace(
+                x=_rows.select("date").to_numpy().flatten(),
+                y=_rows.select(_column).to_numpy().flatten(),
+                x_range=plot_window.value,
+                mode='lines',
+                name=f"{_window}d",
+                hovertemplate=f'{_window}d<br>Date: %{{x|%Y-%m-%d}}<br>%{{y:.3f}}<extra></extra>'
+            ))
+        _fig.update_layout(
+            title=_title,
+            xaxis_title="Date",
+            hovermode='x unified',
+            height=350,
+            template="plotly_white"
+        )
+        _figs.append(marimo.ui.plotly(_fig))
+    marimo.vstack([marimo.hstack(_figs[_i:_i + 2], widths="equal") for _i in range(0, len(_figs), 2)])
+    return
+
+
+@app.cell
+def _(marimo):
+    marimo.md("""
+    ## Risk Attribution
     """)
     return
 
 
 @app.cell
-def _(pl, sfp, signal_df):
-    ics = sfp.generate_alpha_ics(
-        signal_df.select("date", "barrid", "alpha"),
-        signal_df.filter(pl.col("return").is_not_null()).select("date", "barrid", "return"),
+def _(
+    dash_cache,
+    data_dir,
+    loading,
+    marimo,
+    os,
+    portfolio,
+    risk,
+    sample_files,
+    sample_params,
+    sample_window,
+    tables,
+):
+    _tables = ["EXPOSURES_TABLE", "COVARIANCES_TABLE", "FACTORS_TABLE"]
+    marimo.stop(
+        not all(os.getenv(_t) for _t in _tables),
+        marimo.md(f"**⚠️ Set {', '.join(_tables)} in `.env` for the risk attribution**"),
     )
-    return (ics,)
+    # Joining the weights with the exposures table is the only heavy step;
+    # the attribution itself is a few stacked NumPy contractions. The key
+    # covers the weights and both tables the join reads
+    exposures = dash_cache.cached(
+        "portfolio_exposures",
+        lambda: risk.portfolio_exposures(loading.scan_weights(data_dir.value, *sample_window).collect()),
+        lambda: "|".join([
+            dash_cache.files_digest(sample_files),
+            tables.table_version("EXPOSURES_TABLE", "exposures"),
+            tables.table_version("ASSETS_TABLE", "assets"),
+        ]),
+        **sample_params,
+    )
+    factor_returns = risk.factor_returns(portfolio["date"].min(), portfolio["date"].max())
+    attribution = risk.attribution(portfolio, exposures, factor_returns)
+    return attribution, exposures, factor_returns
 
 
 @app.cell
-def _(ics, marimo, pl):
-    _ic_mean = ics.select(pl.col("ic").mean()).item()
-    _ic_ir = ics.select((pl.col("ic").mean() / pl.col("ic").std()).alias("icir")).item()
+def _(attribution, marimo, pl):
+    _summary = attribution.select(
+        pl.col("return").mean().mul(252).alias("Annual Return"),
+        pl.col("factor_return").mean().mul(252).alias("Factor Return"),
+        pl.col("specific_return").mean().mul(252).alias("Specific Return"),
+        pl.col("predicted_vol").mean().alias("Predicted Vol"),
+        pl.col("return").std().mul(252**0.5).alias("Realized Vol"),
+        pl.col("factor_vol").pow(2).truediv(pl.col("predicted_vol").pow(2)).mean().alias("Factor Risk Share"),
+    )
+    marimo.md(f"""
+    {_summary.to_pandas().to_markdown(index=False, floatfmt=".4f")}
+
+    Returns are annualized daily means in decimal; predicted volatility is the risk model's annual ex-ante volatility of each day's weights.
+    """)
+    return
+
+
+@app.cell
+def _(attribution, go, marimo, pl, plot_window, plotting):
+    _data = attribution.select(
+        "date",
+        pl.col("return", "factor_return", "specific_return").fill_null(0).cum_sum().mul(100),
+    )
+    _fig_attr = go.Figure()
+    for _column, _name, _color in [
+        ("return", "Total", "steelblue"),
+        ("factor_return", "Factor", "darkorange"),
+        ("specific_return", "Specific", "seagreen"),
+    ]:
+        _fig_attr.add_trace(plotting.trace(
+            x=_data.select("date").to_numpy().flatten(),
+            y=_data.select(_column).to_numpy().flatten(),
+            x_range=plot_window.value,
+            mode='lines',
+            name=_name,
+            line=dict(color=_color, width=2),
+            hovertemplate='Date: %{x|%Y-%m-%d}<br>Cum Return: %{y:.2f}<extra></extra>'
+        ))
+    _fig_attr.update_layout(
+        title="Cumulative Factor and Specific Return",
+        xaxis_title="Date",
+        yaxis_title="Cumulative Return (%)",
+        hovermode='x unified',
+        height=400,
+        template="plotly_white"
+    )
+    marimo.ui.plotly(_fig_attr)
+    return
+
+
+@app.cell
+def _(attribution, go, marimo, pl, plot_window, plotting):
+    _data = attribution.select(
+        "date",
+        pl.col("predicted_vol").mul(100),
+        pl.col("return").rolling_std(63).mul(252**0.5 * 100).alias("realized_vol"),
+    )
+    _fig_risk = go.Figure()
+    for _column, _name, _color in [
+        ("predicted_vol", "Predicted (ex ante)", "steelblue"),
+        ("realized_vol", "Realized (rolling 63-day)", "gray"),
+    ]:
+        _fig_risk.add_trace(plotting.trace(
+            x=_data.select("date").to_numpy().flatten(),
+            y=_data.select(_column).to_numpy().flatten(),
+            x_range=plot_window.value,
+            mode='lines',
+            name=_name,
+            line=dict(color=_color, width=2),
+            hovertemplate='Date: %{x|%Y-%m-%d}<br>Volatility: %{y:.2f}<extra></extra>'
+        ))
+    _fig_risk.update_layout(
+        title="Predicted vs Realized Volatility",
+        xaxis_title="Date",
+        yaxis_title="Annual Volatility (%)",
+        hovermode='x unified',
+        height=400,
+        template="plotly_white"
+    )
+    marimo.ui.plotly(_fig_risk)
+    return
+
+
+@app.cell
+def _(exposures, factor_returns, marimo, risk):
+    _contributions = risk.factor_contributions(exposures, factor_returns).head(10)
+    marimo.md(f"""
+    ### Largest Factor Contributions
+
+    {_contributions.to_pandas().to_markdown(index=False, floatfmt=".4f")}
+    """)
+    return
+
+
+@app.cell
+def _(marimo):
+    marimo.md("""
+    ## Information Coefficient (IC)
+    """)
+    return
+
+
+@app.cell
+def _(daily, ics, marimo):
+    _ic = daily.ic_summary(ics)
+    _ic_mean = _ic["ic_mean"]
+    _ic_ir = _ic["icir"]
     marimo.md(f"""
     | Metric | Value |
     |--------|-------|
@@ -352,16 +675,17 @@ def _(ics, marimo, pl):
 
 
 @app.cell
-def _(go, ics, marimo, pl):
+def _(go, ics, marimo, pl, plot_window, plotting):
     _data = (
         ics
         .sort("date")
         .with_columns(pl.col("ic").fill_null(0).cum_sum().alias("cumulative_ic"))
     )
     _fig_ic = go.Figure()
-    _fig_ic.add_trace(go.Scatter(
+    _fig_ic.add_trace(plotting.trace(
         x=_data.select("date").to_numpy().flatten(),
         y=_data.select("cumulative_ic").to_numpy().flatten(),
+        x_range=plot_window.value,
         mode='lines',
         name='Cumulative IC',
         line=dict(color='steelblue', width=2),
@@ -380,6 +704,49 @@ def _(go, ics, marimo, pl):
     return
 
 
+@app.cell
+def _(daily, go, ic_terms, marimo):
+    _decay = daily.ic_decay(ic_terms)
+    _half_life = daily.half_life(_decay)
+
+    _fig_decay = go.Figure()
+    _fig_decay.add_trace(go.Scatter(
+        x=_decay["horizon"],
+        y=_decay["ic_mean"],
+        mode='lines+markers',
+        name='Cumulative return IC',
+        line=dict(color='steelblue', width=2),
+        hovertemplate='Horizon: %{x}<br>IC: %{y:.4f}<extra></extra>'
+    ))
+    _fig_decay.add_trace(go.Scatter(
+        x=_decay["horizon"],
+        y=_decay["lag_ic_mean"],
+        mode='lines+markers',
+        name='Lagged return IC',
+        line=dict(color='darkorange', width=2),
+        hovertemplate='Horizon: %{x}<br>IC: %{y:.4f}<extra></extra>'
+    ))
+    _fig_decay.add_hline(y=0, line_dash="dash", line_color="red", opacity=0.3)
+    _fig_decay.update_layout(
+        title="Mean Rank IC by Horizon",
+        xaxis_title="Horizon (days)",
+        yaxis_title="Mean Rank IC",
+        height=400,
+        template="plotly_white"
+    )
+
+    _half_life_text = f"{_half_life:.1f} days" if _half_life is not None else "not reached"
+    marimo.vstack([
+        marimo.ui.plotly(_fig_decay),
+        marimo.md(f"""
+    **Half-life of the lagged IC:** {_half_life_text}
+
+    {_decay.to_pandas().to_markdown(index=False, floatfmt=".4f")}
+    """),
+    ])
+    return
+
+
 @app.cell
 def _(marimo):
     marimo.md("""
@@ -398,5 +765,106 @@ def _(marimo, pl, portfolio_returns, sfr):
     return
 
 
+@app.cell
+def _(marimo):
+    marimo.md("""
+    ## Run Comparison
+
+    Overlay other backtests of the same signal, e.g. a `GAMMA` or `CONSTRAINTS` sweep, on this one over the selected sample.
+    """)
+    return
+
+
+@app.cell
+def _(marimo):
+    compare_dirs = marimo.ui.text(
+        value="",
+        label="Compare with (comma-separated weights directories):",
+        full_width=True,
+    )
+    compare_dirs
+    return (compare_dirs,)
+
+
+@app.cell
+def _(
+    compare_dirs,
+    dash_cache,
+    data_dir,
+    loading,
+    marimo,
+    runs,
+    sample_params,
+    sample_window,
+    tables,
+):
+    _others = [_d.strip() for _d in compare_dirs.value.split(",") if _d.strip()]
+    marimo.stop(not _others)
+    run_dirs = [data_dir.value, *_others]
+    _missing = [_d for _d in _others if not loading.year_files(_d)]
+    marimo.stop(_missing, marimo.md(f"**⚠️ No year parquet files found in:** {', '.join(_missing)}"))
+
+    # All runs load in a thread pool and share one load of asset returns,
+    # so the key covers every run's year files and the assets table
+    _files = [_f for _d in run_dirs for _f in loading.files_in_window(loading.year_files(_d), *sample_window)]
+    comparison = dash_cache.cached(
+        "run_comparison",
+        lambda: runs.load_runs(run_dirs, *sample_window),
+        lambda: f"{dash_cache.files_digest(_files)}|{tables.table_version('ASSETS_TABLE', 'assets')}",
+        runs=runs.run_names(run_dirs),
+        **sample_params,
+    )
+    return (comparison,)
+
+
+@app.cell
+def _(comparison, marimo, runs):
+    marimo.md(f"""
+    {runs.run_summary(comparison).to_pandas().to_markdown(index=False)}
+    """)
+    return
+
+
+@app.cell
+def _(comparison, daily, go, marimo, pl, plot_window, plotting):
+    _panels = {
+        "Cumulative Log Returns": "Cumulative Log Return (%)",
+        "Drawdown": "Drawdown (%)",
+        "Leverage": "Leverage",
+        "Two-Sided Turnover (Rolling 252-Day Mean)": "Two-Sided Turnover",
+    }
+    _figs = {_title: go.Figure() for _title in _panels}
+    for _run in comparison["run"].unique(maintain_order=True):
+        _p = comparison.filter(pl.col("run") == _run).sort("date")
+        _returns = _p.select("date", pl.col("return").truediv(100))
+        _series = {
+            "Cumulative Log Returns": _returns["return"].log1p().cum_sum() * 100,
+            "Drawdown": daily.drawdown(_returns)["drawdown"] * 100,
+            "Leverage": _p["gross_leverage"],
+            "Two-Sided Turnover (Rolling 252-Day Mean)": _p["two_sided_turnover"].rolling_mean(252),
+        }
+        for _title, _y in _series.items():
+            _figs[_title].add_trace(plotting.trace(
+                x=_p["date"].to_numpy(),
+                y=_y.to_numpy(),
+                x_range=plot_window.value,
+                mode='lines',
+                name=_run,
+                line=dict(width=2),
+                hovertemplate=f'{_run}<br>Date: %{{x|%Y-%m-%d}}<br>%{{y:.2f}}<extra></extra>'
+            ))
+    for _title, _fig in _figs.items():
+        _fig.update_layout(
+            title=_title,
+            xaxis_title="Date",
+            yaxis_title=_panels[_title],
+            hovermode='x unified',
+            height=400,
+            template="plotly_white"
+        )
+    marimo.vstack([marimo.ui.plotly(_fig) for _fig in _figs.values()])
+    return
+
+
 if __name__ == "__main__":
     app.run()
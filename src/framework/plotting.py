@@ -0,0 +1,97 @@
+import datetime as dt
+import numpy as np
+import plotly.graph_objects as go
+
+# Points drawn per trace: a minimum and a maximum for each of 500 buckets,
+# a few pixels wide each on a full-width plot
+MAX_POINTS = 1000
+# Traces with more points than this are drawn with WebGL
+GL_THRESHOLD = 500
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Positions of the smallest and largest value in each of `n_buckets` equal runs.
+
+    Keeping both extremes of every bucket preserves the envelope of a line,
+    so spikes and drawdown troughs survive downsampling. The first and last
+    points are always kept.
+
+    Args:
+        y: Values, NaN allowed
+        n_buckets: Number of buckets to split `y` into
+
+    Returns:
+        np.ndarray: Sorted unique positions into `y`
+    """
+    n = len(y)
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(n_buckets, size)
+
+    offsets = np.arange(n_buckets) * size
+    lows = offsets + np.argmin(np.where(np.isnan(padded), np.inf, padded), axis=1)
+    highs = offsets + np.argmax(np.where(np.isnan(padded), -np.inf, padded), axis=1)
+    keep = np.concatenate([[0, n - 1], lows, highs])
+    return np.unique(keep[keep < n])
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    x_range: tuple[dt.date, dt.date] | None = None,
+    max_points: int | None = MAX_POINTS,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Restrict a series to `x_range` and thin it to about `max_points` points.
+
+    A range narrower than `max_points` observations is returned at full
+    resolution, so zooming in with a narrower range shows every point.
+
+    Args:
+        x: Sorted dates
+        y: Values
+        x_range: Inclusive (start, end) window, or None for everything
+        max_points: Point budget, or None to keep every point
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The kept `x` and `y`
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if x_range is not None:
+        start, end = (np.datetime64(d) for d in x_range)
+        mask = (x >= start) & (x <= end)
+        x, y = x[mask], y[mask]
+    if max_points is not None and len(y) > max_points:
+        keep = minmax_indices(y, max_points // 2)
+        x, y = x[keep], y[keep]
+    return x, y
+
+
+def trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    x_range: tuple[dt.date, dt.date] | None = None,
+    max_points: int | None = MAX_POINTS,
+    **kwargs,
+) -> go.Scatter | go.Scattergl:
+    """
+    Line trace of a downsampled series, drawn with WebGL when it is still large.
+
+    Drop-in for `go.Scatter(x=x, y=y, **kwargs)` in the dashboards.
+
+    Args:
+        x: Sorted dates
+        y: Values
+        x_range: Inclusive (start, end) window, or None for everything
+        max_points: Point budget, or None to keep every point
+        **kwargs: Passed to the trace, e.g. `name`, `line`, `hovertemplate`
+
+    Returns:
+        go.Scatter | go.Scattergl: The trace
+    """
+    x, y = downsample(x, y, x_range, max_points)
+    scatter = go.Scattergl if len(y) > GL_THRESHOLD else go.Scatter
+    return scatter(x=x, y=y, **kwargs)
@@ -0,0 +1,168 @@
+import numpy as np
+import polars as pl
+import sf_quant.research as sfr
+
+# Bin counts offered by the ew_dash quantile slider
+BIN_COUNTS = range(2, 11)
+
+
+def _bin(n: int) -> pl.Expr:
+    # Bin of each row among n quantiles, from its 0-based min-rank within the
+    # date. `qcut(n)` on a date with m values puts the k-th break at sorted
+    # position (m - 1) * (k / n), so a row sits above break k exactly when
+    # its rank exceeds the floor of that position, ties included. The
+    # position is computed in floating point the same way `qcut` does; the
+    # only rows that can still differ are ones where `qcut`'s interpolated
+    # break rounds onto the next value, a last-bit effect.
+    return (
+        pl.sum_horizontal(
+            (pl.col('_last') * (k / n)).floor() < pl.col('_rank')
+            for k in range(1, n)
+        )
+        .add(1)
+        .cast(pl.Int8)
+        .alias(f"q_{n}")
+    )
+
+
+def bin_returns(
+    signal: pl.DataFrame,
+    signal_col: str = 'alpha',
+    bin_counts: range = BIN_COUNTS,
+) -> pl.DataFrame:
+    """
+    Equal-weight quantile returns per date for several bin counts at once.
+
+    The signal is ranked once per date and rows are grouped by their bins
+    under every bin count in one pass over the panel, leaving a few dozen
+    cells per date. Each bin count is then a small aggregation of those
+    cells. Bins match `qcut` over the date, as used by
+    `sfr.generate_quantile_ports`.
+
+    Args:
+        signal: Frame with `date`, `return` and `signal_col`
+        signal_col: Column to rank
+        bin_counts: Bin counts to compute
+
+    Returns:
+        pl.DataFrame: `date`, `num_bins`, `bin` (1 is the lowest signal) and
+            `ew_return`, null where a bin has no returns
+    """
+    bins = [f"q_{n}" for n in bin_counts]
+    cells = (
+        signal
+        .lazy()
+        .filter(pl.col(signal_col).is_not_null())
+        .select(
+            'date',
+            'return',
+            pl.col(signal_col).rank('min').over('date').sub(1).cast(pl.Float64).alias('_rank'),
+            pl.len().over('date').sub(1).cast(pl.Float64).alias('_last'),
+        )
+        .with_columns(_bin(n) for n in bin_counts)
+        .group_by('date', *bins)
+        .agg(
+            pl.col('return').sum().alias('sum'),
+            pl.col('return').count().alias('count'),
+        )
+        .collect()
+    )
+
+    return (
+        pl.concat([
+            cells
+            .group_by('date', pl.col(f"q_{n}").alias('bin'))
+            .agg(pl.col('sum', 'count').sum())
+            .with_columns(pl.lit(n, dtype=pl.Int8).alias('num_bins'))
+            for n in bin_counts
+        ])
+        .with_columns(
+            pl.when(pl.col('count') > 0)
+            .then(pl.col('sum') / pl.col('count'))
+            .alias('ew_return')
+        )
+        .select('date', 'num_bins', 'bin', 'ew_return')
+        .sort('num_bins', 'date', 'bin')
+    )
+
+
+def quantile_ports(
+    returns: pl.DataFrame,
+    num_bins: int,
+    benchmark: pl.DataFrame,
+) -> pl.DataFrame:
+    """
+    Quantile portfolios in the `sfr.generate_quantile_ports` layout from `bin_returns` output.
+
+    Applies the same beta and volatility scaling, so the result matches
+    `sfr.generate_quantile_ports(signal, num_bins, signal_col)` on the same
+    dates without re-ranking the signal.
+
+    Args:
+        returns: Output of `bin_returns`, already restricted to the sample dates
+        num_bins: Number of quantiles
+        benchmark: `date` and `bmk_return`, e.g. from `sfd.load_benchmark_returns`
+
+    Returns:
+        pl.DataFrame: `date`, `p_1` ... `p_{num_bins}`, `spread` and `bmk_return`
+    """
+    labels = [f"p_{i}" for i in range(1, num_bins + 1)]
+    ports = (
+        returns
+        .filter(pl.col('num_bins') == num_bins)
+        .with_columns(pl.format("p_{}", 'bin').alias('bin'))
+        .pivot(index='date', on='bin', values='ew_return')
+        .sort('date')
+        .select('date', *labels)
+        .with_columns((pl.col(f"p_{num_bins}") - pl.col('p_1')).alias('spread'))
+        .join(benchmark.select('date', 'bmk_return'), on='date', how='left')
+    )
+    ports = sfr.beta_scale_ports(ports, market_col='bmk_return')
+    return sfr.vol_scale_ports(ports)
+
+
+def port_metrics(ports: pl.DataFrame) -> pl.DataFrame:
+    """
+    Performance of each quantile portfolio and the spread, as shown in ew_dash.
+
+    Args:
+        ports: Output of `quantile_ports`
+
+    Returns:
+        pl.DataFrame: `quantile`, `annual_return`, `annual_vol`,
+            `sharpe_ratio` (annualized, like `annual_return` and
+            `annual_vol` and the bootstrap intervals), `total_return` and `n_obs`
+    """
+    return (
+        ports
+        .unpivot(index="date", variable_name="quantile", value_name="return")
+        .filter(
+            pl.col("return").is_not_null() &
+            (pl.col("quantile") != "bmk_return")
+        )
+        .with_columns([
+            pl.col("return").log1p().alias("log_return")
+        ])
+        .group_by("quantile")
+        .agg([
+            pl.col("return").mean().alias("mean_return"),
+            pl.col("return").std().alias("std_return"),
+            pl.col("log_return").sum().alias("cum_log_return"),
+            pl.col("return").count().alias("n_obs"),
+        ])
+        .with_columns([
+            (pl.col("cum_log_return").exp() - 1).alias("total_return"),
+            (pl.col("mean_return") / pl.col("std_return") * np.sqrt(252)).alias("sharpe_ratio"),
+            (pl.col("mean_return") * 252).alias("annual_return"),  # Assuming daily data
+            (pl.col("std_return") * np.sqrt(252)).alias("annual_vol"),
+        ])
+        .select([
+            "quantile",
+            "annual_return",
+            "annual_vol",
+            "sharpe_ratio",
+            "total_return",
+            "n_obs"
+        ])
+        .sort("quantile")
+    )
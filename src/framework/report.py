@@ -0,0 +1,320 @@
+import os
+import glob
+import html
+import json
+import time
+import argparse
+import datetime as dt
+from concurrent.futures import as_completed
+import polars as pl
+import plotly.graph_objects as go
+import sf_quant.data as sfd
+import sf_quant.performance as sfp
+import sf_quant.research as sfr
+from dotenv import load_dotenv
+
+import bootstrap
+import daily
+import loading
+import plotting
+import quantiles
+from sf_signal.pools import pool_size, process_pool
+
+# Leaderboard columns, taken from each report's headline numbers
+HEADLINE = [
+    "sharpe",
+    "sharpe_lower",
+    "sharpe_upper",
+    "annual_return",
+    "max_drawdown",
+    "ic_mean",
+    "icir",
+    "ic_half_life",
+]
+
+_STYLE = """
+body { font-family: sans-serif; margin: 2em; color: #222; }
+table { border-collapse: collapse; margin-bottom: 1.5em; }
+th, td { padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+"""
+
+
+def _table_html(df: pl.DataFrame) -> str:
+    return df.to_pandas().to_html(index=False, float_format=lambda x: f"{x:.4f}", border=0)
+
+
+def _page(title: str, body: list[str]) -> str:
+    return (
+        f"<!DOCTYPE html>\n<html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+        f"<style>{_STYLE}</style></head><body>\n<h1>{html.escape(title)}</h1>\n"
+        + "\n".join(body)
+        + "\n</body></html>\n"
+    )
+
+
+def _headline(intervals: pl.DataFrame, ic_intervals: pl.DataFrame, decay: pl.DataFrame) -> dict:
+    row = {r["metric"]: r for r in pl.concat([intervals, ic_intervals]).iter_rows(named=True)}
+    return {
+        "sharpe": row["Sharpe"]["estimate"],
+        "sharpe_lower": row["Sharpe"]["lower"],
+        "sharpe_upper": row["Sharpe"]["upper"],
+        "annual_return": row["Annual Return"]["estimate"],
+        "max_drawdown": row["Max Drawdown"]["estimate"],
+        "ic_mean": row["IC Mean"]["estimate"],
+        "icir": row["ICIR"]["estimate"],
+        "ic_half_life": daily.half_life(decay),
+    }
+
+
+def _decay_figure(decay: pl.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=decay["horizon"], y=decay["ic_mean"], mode='lines+markers', name='Cumulative return IC'))
+    fig.add_trace(go.Scatter(x=decay["horizon"], y=decay["lag_ic_mean"], mode='lines+markers', name='Lagged return IC'))
+    fig.update_layout(
+        title="Mean Rank IC by Horizon",
+        xaxis_title="Horizon (days)",
+        yaxis_title="Mean Rank IC",
+        height=400,
+        template="plotly_white",
+    )
+    return fig
+
+
+def signal_report(path: str, num_bins: int = 5) -> tuple[dict, dict[str, pl.DataFrame], list[go.Figure]]:
+    """
+    The ew_dash analytics for one signal file over its full sample.
+
+    Args:
+        path: Signal parquet file with `date`, `barrid`, `alpha` and `return`
+        num_bins: Number of quantile portfolios
+
+    Returns:
+        tuple: Headline numbers, named tables and figures
+    """
+    signal = pl.read_parquet(path).filter(pl.col('alpha').is_not_null())
+    benchmark = sfd.load_benchmark_returns(signal['date'].min(), signal['date'].max())
+    ports = quantiles.quantile_ports(
+        quantiles.bin_returns(signal, bin_counts=range(num_bins, num_bins + 1)),
+        num_bins=num_bins,
+        benchmark=benchmark,
+    ).drop_nulls()
+    spread = ports.select("date", pl.col("spread").alias("return"))
+
+    ics = daily.ic_term_structure(signal)
+    decay = daily.ic_decay(ics)
+    return_intervals = bootstrap.return_intervals(spread)
+    ic_intervals = bootstrap.ic_intervals(daily.headline_ics(ics))
+
+    tables = {
+        "Quantile Portfolios": quantiles.port_metrics(ports),
+        "Spread Drawdown": sfp.generate_drawdown_summary_table(daily.drawdown(spread)),
+        "IC Term Structure": decay,
+        "95% Confidence Intervals": pl.concat([return_intervals, ic_intervals]),
+        "Fama-French Regression": sfr.run_quantile_ff_regression(ports),
+    }
+
+    cumulative = go.Figure()
+    for column in [f"p_{i}" for i in range(1, num_bins + 1)] + ["spread"]:
+        _data = ports.select("date", pl.col(column).log1p().cum_sum().mul(100))
+        cumulative.add_trace(plotting.trace(
+            x=_data["date"].to_numpy(),
+            y=_data[column].to_numpy(),
+            mode='lines',
+            name=column,
+        ))
+    cumulative.update_layout(
+        title="Quantile Portfolio Cumulative Log Returns",
+        yaxis_title="Cumulative Log Return (%)",
+        height=500,
+        template="plotly_white",
+    )
+
+    headline = _headline(return_intervals, ic_intervals, decay)
+    return headline, tables, [cumulative, _decay_figure(decay)]
+
+
+def weights_report(weights_dir: str, signal_file: str) -> tuple[dict, dict[str, pl.DataFrame], list[go.Figure]]:
+    """
+    The opt_dash analytics for one backtest over its full sample.
+
+    Args:
+        weights_dir: Directory of `{YYYY}.parquet` weight files, in either
+            the backtester's or the compact format
+        signal_file: Signal the backtest was run on, for the ICs
+
+    Returns:
+        tuple: Headline numbers, named tables and figures
+    """
+    if not loading.year_files(weights_dir):
+        raise FileNotFoundError(f"No year parquet files found in {weights_dir}")
+    portfolio = daily.portfolio_daily(loading.scan_weights(weights_dir).collect())
+    portfolio_returns = portfolio.select("date", pl.col('return').truediv(100))
+    drawdown = daily.drawdown(portfolio_returns)
+
+    ics = daily.ic_term_structure(pl.read_parquet(signal_file))
+    decay = daily.ic_decay(ics)
+    return_intervals = bootstrap.return_intervals(portfolio_returns)
+    ic_intervals = bootstrap.ic_intervals(daily.headline_ics(ics))
+
+    tables = {
+        "Performance Summary": sfp.generate_returns_summary_table(portfolio_returns),
+        "Drawdown Summary": sfp.generate_drawdown_summary_table(drawdown),
+        "Leverage Summary": sfp.generate_leverage_summary_table(
+            portfolio.select("date", pl.col("gross_leverage").round(2).alias("leverage"))
+        ),
+        "Turnover Summary": daily.turnover_stats(portfolio),
+        "IC Term Structure": decay,
+        "95% Confidence Intervals": pl.concat([return_intervals, ic_intervals]),
+        "Fama-French Regression": sfr.run_ff_regression(portfolio_returns).with_columns(pl.col('coefficient').mul(252)),
+    }
+
+    cumulative = go.Figure()
+    _data = portfolio_returns.select("date", pl.col("return").log1p().cum_sum().mul(100))
+    cumulative.add_trace(plotting.trace(x=_data["date"].to_numpy(), y=_data["return"].to_numpy(), mode='lines', name='Portfolio'))
+    cumulative.add_trace(plotting.trace(
+        x=drawdown["date"].to_numpy(),
+        y=drawdown["drawdown"].to_numpy() * 100,
+        mode='lines',
+        name='Drawdown',
+    ))
+    cumulative.update_layout(
+        title="Portfolio Cumulative Log Returns and Drawdown",
+        yaxis_title="%",
+        height=500,
+        template="plotly_white",
+    )
+
+    headline = _headline(return_intervals, ic_intervals, decay)
+    return headline, tables, [cumulative, _decay_figure(decay)]
+
+
+def _run_one(kind: str, name: str, source: str, output_dir: str, num_bins: int, signal_file: str) -> dict:
+    # Runs in a worker and writes its own report, so only the headline
+    # numbers travel back to the parent
+    start = time.perf_counter()
+    if kind == "signal":
+        headline, tables, figures = signal_report(source, num_bins)
+    else:
+        headline, tables, figures = weights_report(source, signal_file)
+
+    report_dir = os.path.join(output_dir, name)
+    os.makedirs(report_dir, exist_ok=True)
+    payload = {
+        "name": name,
+        "kind": kind,
+        "source": source,
+        "generated": dt.datetime.now().isoformat(timespec="seconds"),
+        "headline": headline,
+        "tables": {title: table.to_dicts() for title, table in tables.items()},
+    }
+    with open(os.path.join(report_dir, "report.json"), "w") as f:
+        json.dump(payload, f, indent=2, default=str)
+
+    body = [f"<p>{html.escape(kind)}: <code>{html.escape(source)}</code></p>"]
+    body += [figure.to_html(full_html=False, include_plotlyjs="cdn") for figure in figures]
+    body += [f"<h2>{html.escape(title)}</h2>\n{_table_html(table)}" for title, table in tables.items()]
+    with open(os.path.join(report_dir, "report.html"), "w") as f:
+        f.write(_page(name, body))
+
+    return {"name": name, "kind": kind, **headline, "seconds": time.perf_counter() - start}
+
+
+def _inputs(signal_patterns: list[str], weight_patterns: list[str]) -> list[tuple[str, str, str]]:
+    # (kind, report name, source) for every matched file or directory, with
+    # names made unique across inputs sharing a stem
+    found = [("signal", p) for pattern in signal_patterns for p in sorted(glob.glob(pattern)) if os.path.isfile(p)]
+    found += [("weights", p) for pattern in weight_patterns for p in sorted(glob.glob(pattern)) if os.path.isdir(p)]
+
+    inputs, seen = [], {}
+    for kind, source in found:
+        stem = f"{kind}-{os.path.splitext(os.path.basename(os.path.normpath(source)))[0]}"
+        seen[stem] = seen.get(stem, 0) + 1
+        inputs.append((kind, stem if seen[stem] == 1 else f"{stem}-{seen[stem]}", source))
+    return inputs
+
+
+def run_reports(
+    signal_patterns: list[str],
+    weight_patterns: list[str] | None = None,
+    signal_file: str = "data/signal.parquet",
+    output_dir: str = "reports",
+    num_bins: int = 5,
+    max_workers: int | None = None,
+) -> pl.DataFrame:
+    """
+    Write a JSON and static HTML report per signal file and weights directory, and a leaderboard.
+
+    Inputs are spread over a process pool, each worker with an equal share
+    of the Polars thread pool. An input that fails is reported and left off
+    the leaderboard; the rest still run.
+
+    Args:
+        signal_patterns: Globs of signal parquet files
+        weight_patterns: Globs of backtest weight directories
+        signal_file: Signal used for the ICs of every weights report
+        output_dir: Directory for `{name}/report.{json,html}` and the leaderboard
+        num_bins: Number of quantile portfolios in signal reports
+        max_workers: Process count, capped at the number of inputs and CPUs
+
+    Returns:
+        pl.DataFrame: The leaderboard, best Sharpe first
+    """
+    inputs = _inputs(signal_patterns, weight_patterns or [])
+    if not inputs:
+        raise FileNotFoundError("No signal files or weight directories matched")
+
+    workers = pool_size(len(inputs), max_workers)
+    os.makedirs(output_dir, exist_ok=True)
+    print(f"Reporting on {len(inputs)} inputs with {workers} workers")
+
+    rows = []
+    with process_pool(workers) as pool:
+        futures = {
+            pool.submit(_run_one, kind, name, source, output_dir, num_bins, signal_file): name
+            for kind, name, source in inputs
+        }
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"  {futures[future]:<30} failed: {e}")
+                continue
+            rows.append(row)
+            print(f"  {row['name']:<30} Sharpe {row['sharpe']:6.2f}  IC {row['ic_mean']:7.4f}  {row['seconds']:6.1f}s")
+
+    if not rows:
+        return pl.DataFrame()
+
+    leaderboard = (
+        pl.DataFrame(rows)
+        .select("name", "kind", *HEADLINE)
+        .sort("sharpe", descending=True, nulls_last=True)
+    )
+    leaderboard.write_csv(os.path.join(output_dir, "leaderboard.csv"))
+    linked = leaderboard.with_columns(
+        pl.format("<a href='{}/report.html'>{}</a>", "name", "name").alias("name")
+    )
+    with open(os.path.join(output_dir, "leaderboard.html"), "w") as f:
+        f.write(_page("Leaderboard", [linked.to_pandas().to_html(
+            index=False, escape=False, float_format=lambda x: f"{x:.4f}", border=0, na_rep="",
+        )]))
+    return leaderboard
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Write dashboard reports for many signals and backtests without marimo.")
+    parser.add_argument("--signals", nargs="*", default=[], help="Globs of signal parquet files.")
+    parser.add_argument("--weights", nargs="*", default=[], help="Globs of backtest weight directories.")
+    parser.add_argument("--signal-file", default=os.getenv("SIGNAL_PATH", "data/signal.parquet"),
+                        help="Signal for the ICs of weights reports (default: SIGNAL_PATH).")
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--quantiles", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    leaderboard = run_reports(args.signals, args.weights, args.signal_file, args.output_dir, args.quantiles, args.workers)
+    with pl.Config(tbl_rows=-1):
+        print(leaderboard)
@@ -0,0 +1,194 @@
+import datetime as dt
+import numpy as np
+import polars as pl
+import sf_quant.data as sfd
+
+import dash_cache
+from sf_signal import tables
+
+# Barra factors in the order of `sfd.construct_covariance_matrix`
+FACTORS = sfd.get_factor_names()
+
+
+def _factor_columns(scan: pl.LazyFrame) -> list[pl.Expr]:
+    # Factors missing from a year's file have zero exposure, like missing
+    # values in sfd
+    present = set(scan.collect_schema().names())
+    return [pl.col(f) if f in present else pl.lit(None, pl.Float64).alias(f) for f in FACTORS]
+
+
+def portfolio_exposures(weights: pl.DataFrame) -> pl.DataFrame:
+    """
+    Portfolio factor exposures and specific variance for every date.
+
+    Weights are joined with the exposures table and the assets table's
+    specific risk one year at a time and summed per date, so no per-date
+    matrix is ever built. Names without exposures or specific risk count as
+    zero, like `sfd.construct_covariance_matrix`.
+
+    Args:
+        weights: Frame with `date`, `barrid` and `weight`
+
+    Returns:
+        pl.DataFrame: `date`, one exposure column per factor in `FACTORS`
+            and `specific_var`, the sum of squared weight times squared
+            specific risk (%^2)
+    """
+    weights = weights.select('date', pl.col('barrid').cast(pl.String), pl.col('weight').cast(pl.Float64))
+    frames = []
+    for year in weights['date'].dt.year().unique().sort():
+        exposures = pl.scan_parquet(tables.table_path("EXPOSURES_TABLE", "exposures", year))
+        specific = pl.scan_parquet(tables.table_path("ASSETS_TABLE", "assets", year)).select('date', 'barrid', 'specific_risk')
+        frames.append(
+            weights.lazy()
+            .filter(pl.col('date').dt.year() == year)
+            .join(exposures.select('date', 'barrid', *_factor_columns(exposures)), on=['date', 'barrid'], how='left')
+            .join(specific, on=['date', 'barrid'], how='left')
+            .group_by('date')
+            .agg(
+                *(pl.col(f).fill_nan(0).fill_null(0).mul('weight').sum() for f in FACTORS),
+                (pl.col('weight') * pl.col('specific_risk').fill_null(0)).pow(2).sum().alias('specific_var'),
+            )
+            .collect()
+        )
+    return pl.concat(frames).sort('date')
+
+
+def _covariance_year(year: int) -> pl.DataFrame:
+    # One year of factor covariance rows, cached on the file's contents
+    path = tables.table_path("COVARIANCES_TABLE", "covariances", year)
+    return dash_cache.cached(
+        "factor_covariances",
+        lambda: (
+            pl.scan_parquet(path)
+            .filter(pl.col('factor_1').is_in(FACTORS))
+            .select('date', 'factor_1', *_factor_columns(pl.scan_parquet(path)))
+            .collect()
+        ),
+        lambda: dash_cache.file_digest(path),
+    )
+
+
+def factor_covariances(dates: pl.Series) -> np.ndarray:
+    """
+    Stacked factor covariance matrices for a series of dates.
+
+    The table stores the upper triangle of each matrix; every year is read
+    once (and cached), aligned to a (date, factor) grid in one join and
+    reshaped, then mirrored for all dates at once.
+
+    Args:
+        dates: Sorted dates
+
+    Returns:
+        np.ndarray: (dates, factors, factors) covariances in %^2, NaN for
+            dates the table has no matrix for
+    """
+    k = len(FACTORS)
+    covariances = pl.concat([_covariance_year(year) for year in dates.dt.year().unique().sort()])
+    grid = (
+        pl.DataFrame({'date': dates})
+        .with_row_index('_t')
+        .join(pl.DataFrame({'factor_1': FACTORS}).with_row_index('_k'), how='cross')
+        .join(covariances, on=['date', 'factor_1'], how='left')
+        .sort('_t', '_k')
+    )
+    upper = grid.select(FACTORS).to_numpy().reshape(len(dates), k, k)
+    full = np.where(np.isnan(upper), upper.transpose(0, 2, 1), upper)
+    present = ~np.isnan(upper).all(axis=(1, 2))
+    full[present] = np.nan_to_num(full[present])
+    return full
+
+
+def ex_ante_variance(exposures: np.ndarray, covariances: np.ndarray) -> np.ndarray:
+    """
+    Factor variance x' F x of every date in one batched contraction.
+
+    Args:
+        exposures: (dates, factors) portfolio exposures
+        covariances: (dates, factors, factors) factor covariances
+
+    Returns:
+        np.ndarray: (dates,) factor variances
+    """
+    return np.einsum('tk,tkl,tl->t', exposures, covariances, exposures, optimize=True)
+
+
+def factor_returns(start: dt.date, end: dt.date) -> pl.DataFrame:
+    """
+    Daily Barra factor returns in decimal.
+
+    Args:
+        start: First date
+        end: Last date
+
+    Returns:
+        pl.DataFrame: `date` and one column per factor in `FACTORS`
+    """
+    return sfd.load_factors(start, end, FACTORS).with_columns(pl.col(FACTORS).truediv(100))
+
+
+def attribution(portfolio: pl.DataFrame, exposures: pl.DataFrame, returns: pl.DataFrame) -> pl.DataFrame:
+    """
+    Daily factor versus specific return and ex-ante risk of a portfolio.
+
+    The factor return is the portfolio's exposures times the factor returns
+    of the same date; the specific return is the rest of the portfolio
+    return. Predicted volatility combines x' F x with the specific variance.
+
+    Args:
+        portfolio: `daily.portfolio_daily` table
+        exposures: `portfolio_exposures` of the same weights
+        returns: `factor_returns` over the same dates
+
+    Returns:
+        pl.DataFrame: `date`, decimal daily `return`, `factor_return` and
+            `specific_return`, and annualized decimal `predicted_vol`,
+            `factor_vol` and `specific_vol`
+    """
+    frame = (
+        portfolio.select('date', 'return')
+        .join(exposures, on='date', how='inner')
+        .join(returns.rename({f: f"_r_{f}" for f in FACTORS}), on='date', how='left')
+        .sort('date')
+    )
+    x = frame.select(FACTORS).to_numpy()
+    r = frame.select(f"_r_{f}" for f in FACTORS).to_numpy()
+    factor_var = ex_ante_variance(x, factor_covariances(frame['date'])) / 100**2
+    specific_var = frame['specific_var'].to_numpy() / 100**2
+    factor_return = np.einsum('tk,tk->t', x, r)
+    return pl.DataFrame({
+        'date': frame['date'],
+        'return': frame['return'],
+        'factor_return': factor_return,
+        'specific_return': frame['return'].to_numpy() - factor_return,
+        'predicted_vol': np.sqrt(factor_var + specific_var),
+        'factor_vol': np.sqrt(factor_var),
+        'specific_vol': np.sqrt(specific_var),
+    }).fill_nan(None)
+
+
+def factor_contributions(exposures: pl.DataFrame, returns: pl.DataFrame) -> pl.DataFrame:
+    """
+    Mean exposure and annualized return contribution of each factor.
+
+    Args:
+        exposures: `portfolio_exposures` table
+        returns: `factor_returns` over the same dates
+
+    Returns:
+        pl.DataFrame: `factor`, `mean_exposure` and `annual_contribution`
+            (mean daily exposure times factor return, times 252), largest
+            absolute contribution first
+    """
+    frame = exposures.join(returns.rename({f: f"_r_{f}" for f in FACTORS}), on='date', how='inner')
+    x = frame.select(FACTORS).to_numpy()
+    r = frame.select(f"_r_{f}" for f in FACTORS).to_numpy()
+    return (
+        pl.DataFrame({
+            'factor': FACTORS,
+            'mean_exposure': np.nanmean(x, axis=0),
+            'annual_contribution': np.nanmean(x * r, axis=0) * 252,
+        })
+        .sort(pl.col('annual_contribution').abs(), descending=True)
+    )
@@ -0,0 +1,107 @@
+import numpy as np
+import polars as pl
+
+# Rolling windows in trading days offered by the dashboards, and the ones
+# selected by default: a quarter, half a year and a year
+WINDOW_OPTIONS = (21, 63, 126, 252, 504)
+WINDOWS = (63, 126, 252)
+
+
+def _prefix(x: np.ndarray) -> np.ndarray:
+    return np.concatenate([[0.0], np.cumsum(x)])
+
+
+def _window_sum(prefix: np.ndarray, window: int) -> np.ndarray:
+    # Sum over the `window` observations ending at each position, NaN until
+    # the first full window
+    out = np.full(len(prefix) - 1, np.nan)
+    out[window - 1:] = prefix[window:] - prefix[:len(prefix) - window]
+    return out
+
+
+def _long(dates: pl.Series, columns: dict[int, dict[str, np.ndarray]]) -> pl.DataFrame:
+    # One block of rows per window, without the partial windows at the start
+    return pl.concat([
+        pl.DataFrame({'date': dates, 'window': pl.Series([window] * len(dates), dtype=pl.Int16), **values})
+        .fill_nan(None)
+        .filter(pl.Series(np.arange(len(dates)) >= window - 1))
+        for window, values in columns.items()
+    ]).sort('window', 'date')
+
+
+def rolling_returns(
+    returns: pl.DataFrame,
+    column: str = 'return',
+    market: str | None = None,
+    windows: tuple[int, ...] = WINDOWS,
+) -> pl.DataFrame:
+    """
+    Rolling Sharpe, volatility, hit rate and market beta of a daily return series.
+
+    Every statistic comes from prefix sums of the returns, their squares and
+    their products with the market, built once; each window is then one
+    subtraction of shifted prefix sums, so the cost is O(n) whatever the
+    window lengths and nearly flat in their number. Returns are centred
+    before summing so the variance does not lose precision.
+
+    Args:
+        returns: Frame with `date` and `column`, decimal daily returns
+        column: Return column
+        market: Market return column for the beta, e.g. `bmk_return`, or None
+        windows: Window lengths in observations
+
+    Returns:
+        pl.DataFrame: `date`, `window`, annualized `sharpe` and `vol`,
+            `hit_rate` (share of positive days) and, with a market, `beta`
+    """
+    frame = returns.select('date', column, *([market] if market else [])).drop_nulls().sort('date')
+    r = frame[column].to_numpy().astype(np.float64)
+    centre = r.mean() if len(r) else 0.0
+    dr = r - centre
+    sums = {'r': _prefix(dr), 'rr': _prefix(dr * dr), 'hit': _prefix((r > 0).astype(np.float64))}
+    if market:
+        m = frame[market].to_numpy().astype(np.float64)
+        dm = m - (m.mean() if len(m) else 0.0)
+        sums |= {'m': _prefix(dm), 'mm': _prefix(dm * dm), 'rm': _prefix(dr * dm)}
+
+    columns = {}
+    for window in windows:
+        s = {name: _window_sum(prefix, window) for name, prefix in sums.items()}
+        mean = s['r'] / window + centre
+        std = np.sqrt(np.maximum(s['rr'] - s['r'] ** 2 / window, 0) / (window - 1))
+        columns[window] = {
+            'sharpe': mean / std * np.sqrt(252),
+            'vol': std * np.sqrt(252),
+            'hit_rate': s['hit'] / window,
+        }
+        if market:
+            cov = s['rm'] - s['r'] * s['m'] / window
+            columns[window]['beta'] = cov / (s['mm'] - s['m'] ** 2 / window)
+    return _long(frame['date'], columns)
+
+
+def rolling_ics(ics: pl.DataFrame, windows: tuple[int, ...] = WINDOWS) -> pl.DataFrame:
+    """
+    Rolling mean and IR of daily ICs, from one pair of prefix sums.
+
+    Both are unannualized, like `daily.ic_summary`.
+
+    Args:
+        ics: Frame with `date` and `ic`
+        windows: Window lengths in observations
+
+    Returns:
+        pl.DataFrame: `date`, `window`, `ic_mean` and `icir`
+    """
+    frame = ics.select('date', 'ic').drop_nulls().drop_nans().sort('date')
+    ic = frame['ic'].to_numpy().astype(np.float64)
+    centre = ic.mean() if len(ic) else 0.0
+    s1, s2 = _prefix(ic - centre), _prefix((ic - centre) ** 2)
+
+    columns = {}
+    for window in windows:
+        w1, w2 = _window_sum(s1, window), _window_sum(s2, window)
+        mean = w1 / window + centre
+        std = np.sqrt(np.maximum(w2 - w1 ** 2 / window, 0) / (window - 1))
+        columns[window] = {'ic_mean': mean, 'icir': mean / std}
+    return _long(frame['date'], columns)
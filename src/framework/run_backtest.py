@@ -1,9 +1,37 @@
 import os
 import json
+import argparse
+import polars as pl
 from dotenv import load_dotenv
 from sf_backtester import BacktestConfig, BacktestRunner, SlurmConfig
 
-def run_backtest():
+import backtest_manifest
+import local_backtest
+
+
+class YearsRunner(BacktestRunner):
+    """
+    Runner that submits the given years instead of every year in the signal.
+
+    Each job reads its own year out of `data_path`, so the full signal
+    serves any subset of years and no copy of the stale years is written.
+    The jobs read it when they start, so it must stay in place until they
+    finish either way.
+
+    Args:
+        config: Backtest configuration
+        years: Years to submit
+    """
+
+    def __init__(self, config: BacktestConfig, years: list[int]):
+        super().__init__(config)
+        self.years = years
+
+    def get_years(self, data: pl.DataFrame) -> list[int]:
+        return self.years
+
+
+def run_backtest(full: bool = False):
     # Load environment variables from .env file
     load_dotenv()
 
@@ -43,6 +71,33 @@ def run_backtest():
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(logs_dir, exist_ok=True)
 
+    # Only submit years whose signal rows, gamma or constraints changed since
+    # their weights were written, or whose weights are missing
+    digests = backtest_manifest.year_digests(signal_path)
+    years = list(digests) if full else backtest_manifest.stale_years(digests, output_dir, gamma, constraints)
+    if not years:
+        print(f"All {len(digests)} years in {output_dir} are up to date.")
+        return
+    print(f"Submitting {len(years)} of {len(digests)} years: {', '.join(map(str, years))}")
+    backtest_manifest.record_submission(digests, years, output_dir, gamma, constraints)
+
+    # Run the same per-year chunks in local processes instead of Slurm jobs
+    backend = os.getenv("BACKTEST_BACKEND", "slurm").strip().lower()
+    if backend == "local":
+        max_workers = os.getenv("LOCAL_MAX_WORKERS", "").strip()
+        local_backtest.run_local(
+            signal_path=signal_path,
+            output_dir=output_dir,
+            logs_dir=logs_dir,
+            gamma=gamma,
+            constraints=constraints,
+            years=years,
+            max_workers=int(max_workers) if max_workers else None,
+        )
+        return
+    if backend != "slurm":
+        raise ValueError(f"Unknown BACKTEST_BACKEND '{backend}'. Use 'slurm' or 'local'.")
+
     # Define Slurm Configuration from environment variables
     slurm_config = SlurmConfig(
         n_cpus=int(os.getenv("SLURM_N_CPUS", "8")),
@@ -65,8 +120,16 @@ def run_backtest():
         logs_dir=logs_dir
     )
 
-    runner = BacktestRunner(config)
+    runner = YearsRunner(config, years)
     runner.submit(dry_run=False)
 
 if __name__ == "__main__":
-    run_backtest()
+    parser = argparse.ArgumentParser(description="Submit the backtest of the signal in SIGNAL_PATH.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Submit every year, even those whose weights are up to date.",
+    )
+    args = parser.parse_args()
+
+    run_backtest(full=args.full)
@@ -0,0 +1,98 @@
+import os
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+import polars as pl
+import sf_quant.performance as sfp
+
+import daily
+import loading
+
+
+def run_names(directories: list[str]) -> list[str]:
+    """
+    Short, unique labels for weight directories, from their base names.
+
+    Args:
+        directories: Weight directories
+
+    Returns:
+        list[str]: One label per directory, suffixed `-2`, `-3`... on clashes
+    """
+    names, seen = [], {}
+    for directory in directories:
+        stem = os.path.basename(os.path.normpath(directory))
+        seen[stem] = seen.get(stem, 0) + 1
+        names.append(stem if seen[stem] == 1 else f"{stem}-{seen[stem]}")
+    return names
+
+
+def load_runs(
+    directories: list[str],
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+    max_workers: int | None = None,
+) -> pl.DataFrame:
+    """
+    `daily.portfolio_daily` for several backtests, loaded side by side.
+
+    The weight directories are scanned in a thread pool (Polars releases the
+    GIL while reading and aggregating), asset returns are loaded once over
+    the union of their dates and shared by every run, and the per-run
+    reductions run in the pool again. Runs with no weights in the window
+    are left out.
+
+    Args:
+        directories: Weight directories, in either weights format
+        start: First date, or None
+        end: Last date, or None
+        max_workers: Threads, one per directory by default
+
+    Returns:
+        pl.DataFrame: `run` followed by the `portfolio_daily` columns, in
+            the order of `directories`
+    """
+    names = run_names(directories)
+    with ThreadPoolExecutor(max_workers or len(directories)) as pool:
+        weights = list(pool.map(lambda d: loading.scan_weights(d, start, end).collect(), directories))
+        loaded = [(name, w) for name, w in zip(names, weights) if not w.is_empty()]
+        if not loaded:
+            return pl.DataFrame(schema={'run': pl.String, 'date': pl.Date})
+
+        returns = daily.asset_returns(
+            min(w['date'].min() for _, w in loaded),
+            max(w['date'].max() for _, w in loaded),
+        )
+        portfolios = list(pool.map(lambda item: daily.portfolio_daily(item[1], returns), loaded))
+
+    return pl.concat([
+        portfolio.select(pl.lit(name).alias('run'), pl.all())
+        for (name, _), portfolio in zip(loaded, portfolios)
+    ], how='vertical_relaxed')
+
+
+def run_summary(runs: pl.DataFrame) -> pl.DataFrame:
+    """
+    One row of opt_dash headline numbers per run.
+
+    Args:
+        runs: Output of `load_runs`
+
+    Returns:
+        pl.DataFrame: `Run`, the `sfp.generate_returns_summary_table`
+            columns, `Max Drawdown (%)`, `Mean Leverage` and
+            `Mean Turnover` (daily two-sided)
+    """
+    rows = []
+    for name in runs['run'].unique(maintain_order=True):
+        portfolio = runs.filter(pl.col('run') == name)
+        returns = portfolio.select('date', pl.col('return').truediv(100))
+        rows.append(
+            sfp.generate_returns_summary_table(returns)
+            .with_columns(
+                pl.lit(daily.drawdown(returns)['drawdown'].min() * 100).round(2).alias('Max Drawdown (%)'),
+                pl.lit(portfolio['gross_leverage'].mean()).round(2).alias('Mean Leverage'),
+                pl.lit(portfolio['two_sided_turnover'].mean()).round(4).alias('Mean Turnover'),
+            )
+            .select(pl.lit(name).alias('Run'), pl.all())
+        )
+    return pl.concat(rows)
@@ -0,0 +1,192 @@
+import numpy as np
+import polars as pl
+
+# Quantiles shown next to the signal distribution
+TAIL_QUANTILES = [0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999]
+
+
+class TDigest:
+    """
+    Mergeable approximate-quantile sketch.
+
+    Values are summarized by at most about `compression` weighted centroids,
+    sized by the t-digest arcsine scale so centroids near the tails hold few
+    points and tail quantiles stay accurate. Memory does not depend on the
+    number of values. Batches are clustered in one sorted NumPy pass rather
+    than point by point.
+    """
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def n(self) -> float:
+        return float(self.weights.sum())
+
+    def _cluster(self, means: np.ndarray, weights: np.ndarray):
+        # `means` and `weights` must be sorted by mean
+        total = weights.sum()
+
+        # Each point joins the centroid whose scale interval its left edge
+        # falls in; the arcsine scale makes those intervals narrow at the tails
+        q = (np.cumsum(weights) - weights) / total
+        k = self.compression / np.pi * np.arcsin(2 * q - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.concatenate([[True], cluster[1:] != cluster[:-1]]))
+
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def update(self, values: np.ndarray) -> "TDigest":
+        """
+        Add a batch of values, ignoring NaN.
+
+        Args:
+            values: Values to add
+
+        Returns:
+            TDigest: self
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        values = np.sort(values)
+        self.min = min(self.min, values[0])
+        self.max = max(self.max, values[-1])
+
+        # Slot the existing centroids into the sorted batch instead of
+        # re-sorting everything
+        at = np.searchsorted(values, self.means)
+        means = np.insert(values, at, self.means)
+        weights = np.insert(np.ones(len(values)), at, self.weights)
+        self._cluster(means, weights)
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """
+        Fold another digest into this one, e.g. one built on another year.
+
+        Args:
+            other: Digest to merge
+
+        Returns:
+            TDigest: self
+        """
+        if len(other.weights) == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        means = np.concatenate([self.means, other.means])
+        order = np.argsort(means, kind='stable')
+        self._cluster(means[order], np.concatenate([self.weights, other.weights])[order])
+        return self
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Approximate quantiles, interpolating between centroid midpoints.
+
+        Args:
+            q: Probability or array of probabilities in [0, 1]
+
+        Returns:
+            np.ndarray: Quantile estimates, NaN for an empty digest
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if len(self.weights) == 0:
+            return np.full(q.shape, np.nan)
+        centers = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.concatenate([[0.0], centers, [self.n]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q * self.n, ranks, values)
+
+
+class Histogram:
+    """
+    Fixed-bin histogram that can be filled batch by batch and merged.
+
+    Values outside the edges are counted as underflow and overflow.
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values: np.ndarray) -> "Histogram":
+        """
+        Add a batch of values, ignoring NaN.
+
+        Args:
+            values: Values to add
+
+        Returns:
+            Histogram: self
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.counts += np.histogram(values, bins=self.edges)[0]
+        self.underflow += int((values < self.edges[0]).sum())
+        self.overflow += int((values > self.edges[-1]).sum())
+        return self
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """
+        Add another histogram with the same edges.
+
+        Args:
+            other: Histogram to merge
+
+        Returns:
+            Histogram: self
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms must share the same bin edges to be merged")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+
+def _batches(df: pl.DataFrame, column: str):
+    # One batch per calendar year, so each batch matches a partition file
+    for _, part in df.select('date', column).group_by(pl.col('date').dt.year(), maintain_order=True):
+        yield part[column].cast(pl.Float64).fill_null(np.nan).to_numpy()
+
+
+def column_sketch(
+    df: pl.DataFrame,
+    column: str,
+    bins: int = 50,
+    compression: int = 200,
+) -> tuple[TDigest, Histogram]:
+    """
+    Quantile digest and histogram of one column, built a year at a time.
+
+    A first pass merges one digest per year; its exact min and max set the
+    histogram edges, which the second pass fills year by year, the same bins
+    `plt.hist(values, bins)` would use.
+
+    Args:
+        df: Frame with `date` and `column`
+        column: Column to summarize
+        bins: Number of histogram bins
+        compression: Digest size parameter
+
+    Returns:
+        tuple[TDigest, Histogram]: The merged digest and histogram
+    """
+    digest = TDigest(compression)
+    for values in _batches(df, column):
+        digest.merge(TDigest(compression).update(values))
+
+    lo, hi = (digest.min, digest.max) if digest.n > 0 else (0.0, 1.0)
+    histogram = Histogram(np.linspace(lo, hi if hi > lo else lo + 1.0, bins + 1))
+    for values in _batches(df, column):
+        histogram.update(values)
+    return digest, histogram
@@ -0,0 +1 @@
+"""Helpers shared by the scripts in `src/signal` and `src/framework`."""
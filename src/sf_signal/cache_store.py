@@ -0,0 +1,164 @@
+import os
+import glob
+import json
+import hashlib
+import argparse
+import datetime as dt
+from typing import Callable
+import polars as pl
+
+
+def hash_params(params: dict) -> str:
+    """
+    Stable key for a cache entry from everything that produced it.
+
+    Args:
+        params: JSON-serializable description of the computation and its inputs
+
+    Returns:
+        str: Hex digest identifying the entry
+    """
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+class ArrowCache:
+    """
+    Directory of Polars frames kept as uncompressed Arrow IPC files.
+
+    Each entry is `{key}.arrow`, memory-mapped on a hit, with its parameters
+    in `{key}.json`. Reading an entry touches it, so eviction drops the
+    least recently used entries first. A cache without a directory computes
+    every frame and stores nothing.
+
+    Args:
+        root: Cache directory, or None when caching is off
+        max_bytes: Size the cache is trimmed back under after every write
+    """
+
+    def __init__(self, root: str | None, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def get(self, key: str, compute: Callable[[], pl.DataFrame], meta: dict) -> pl.DataFrame:
+        """
+        Return the entry for `key`, computing and storing it on a miss.
+
+        Args:
+            key: Entry key, from `hash_params`
+            compute: Builds the frame from scratch
+            meta: Parameters recorded next to the entry for `info`
+
+        Returns:
+            pl.DataFrame: The cached or freshly computed frame
+        """
+        if self.root is None:
+            return compute()
+
+        path = os.path.join(self.root, f"{key}.arrow")
+        if os.path.exists(path):
+            # Touch on read so eviction is least-recently-used, not least-recently-written
+            os.utime(path)
+            return pl.read_ipc(path, memory_map=True)
+
+        df = compute()
+
+        os.makedirs(self.root, exist_ok=True)
+        df.write_ipc(f"{path}.tmp", compression="uncompressed")
+        os.replace(f"{path}.tmp", path)
+        with open(os.path.join(self.root, f"{key}.json"), "w") as f:
+            json.dump({**meta, "rows": df.height}, f, default=str)
+
+        self.evict(self.max_bytes)
+        return df
+
+    def info(self, describe: Callable[[dict], dict]) -> pl.DataFrame:
+        """
+        List entries, most recently used first.
+
+        Args:
+            describe: Turns an entry's recorded parameters into display columns
+
+        Returns:
+            pl.DataFrame: One row per entry with its `key`, the `describe`
+                columns, `size_mb` and `last_used`
+        """
+        rows = []
+        for path in glob.glob(os.path.join(self.root or "", "*.arrow")):
+            key = os.path.basename(path).removesuffix(".arrow")
+            meta_path = os.path.join(self.root, f"{key}.json")
+            meta = {}
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            rows.append({
+                "key": key,
+                **describe(meta),
+                "size_mb": round(os.path.getsize(path) / 1024**2, 2),
+                "last_used": dt.datetime.fromtimestamp(os.path.getmtime(path)),
+            })
+        if not rows:
+            return pl.DataFrame()
+        return pl.DataFrame(rows).sort("last_used", descending=True)
+
+    def evict(self, max_bytes: int) -> list[str]:
+        """
+        Delete least recently used entries until the cache fits in `max_bytes`.
+
+        Args:
+            max_bytes: Size budget for the cache directory
+
+        Returns:
+            list[str]: Keys that were evicted
+        """
+        if self.root is None:
+            return []
+
+        entries = sorted(glob.glob(os.path.join(self.root, "*.arrow")), key=os.path.getmtime)
+        total = sum(os.path.getsize(p) for p in entries)
+        evicted = []
+        for path in entries:
+            if total <= max_bytes:
+                break
+            total -= os.path.getsize(path)
+            key = os.path.basename(path).removesuffix(".arrow")
+            for stale in (path, os.path.join(self.root, f"{key}.json")):
+                if os.path.exists(stale):
+                    os.remove(stale)
+            evicted.append(key)
+        return evicted
+
+
+def main(
+    description: str,
+    env_var: str,
+    root: Callable[[], str | None],
+    info: Callable[[], pl.DataFrame],
+    clear: Callable[[], int],
+    hidden: list[str],
+):
+    """
+    `info` / `clear` command line shared by the caches.
+
+    Args:
+        description: Parser description
+        env_var: Variable that sets the cache directory
+        root: Returns the cache directory, or None when caching is off
+        info: Lists the entries
+        clear: Empties the cache and returns the number of entries removed
+        hidden: `info` columns left out of the printed table
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("command", choices=["info", "clear"])
+    args = parser.parse_args()
+
+    if root() is None:
+        print(f"{env_var} is not set, caching is disabled.")
+    elif args.command == "info":
+        entries = info()
+        total = entries["size_mb"].sum() if not entries.is_empty() else 0
+        print(f"{entries.height} entries, {total:.1f} MB in {root()}")
+        if not entries.is_empty():
+            with pl.Config(tbl_rows=-1, fmt_str_lengths=60):
+                print(entries.drop(hidden))
+    else:
+        print(f"Removed {clear()} entries from {root()}")
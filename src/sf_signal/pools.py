@@ -0,0 +1,53 @@
+import os
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+
+def pool_size(tasks: int, max_workers: int | None = None) -> int:
+    """
+    Number of worker processes for a batch of independent tasks.
+
+    Args:
+        tasks: Number of tasks
+        max_workers: Requested process count, all CPUs by default
+
+    Returns:
+        int: Process count, capped at the number of tasks and CPUs
+    """
+    cpus = os.cpu_count() or 1
+    return max(1, min(tasks, max_workers or cpus, cpus))
+
+
+@contextmanager
+def process_pool(workers: int) -> Iterator[ProcessPoolExecutor]:
+    """
+    Process pool whose workers split the Polars thread pool equally.
+
+    Workers are spawned, not forked, so none inherits a copy of the parent's
+    Polars threads, and each is started with `POLARS_MAX_THREADS` set to its
+    share of the CPUs so the pool never oversubscribes the machine. The
+    parent's setting is restored when the pool shuts down.
+
+    Args:
+        workers: Process count, from `pool_size`
+
+    Yields:
+        ProcessPoolExecutor: The pool
+    """
+    cpus = os.cpu_count() or 1
+    # Spawned workers read POLARS_MAX_THREADS at import, before any work
+    previous = os.environ.get("POLARS_MAX_THREADS")
+    os.environ["POLARS_MAX_THREADS"] = str(max(1, cpus // workers))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            yield pool
+    finally:
+        if previous is None:
+            os.environ.pop("POLARS_MAX_THREADS", None)
+        else:
+            os.environ["POLARS_MAX_THREADS"] = previous
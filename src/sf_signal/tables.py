@@ -0,0 +1,86 @@
+import os
+import glob
+import datetime as dt
+import polars as pl
+
+# Every direct read of the research tables goes through this module. The
+# layout and the universe filter mirror sf_quant 0.1.23
+# (`sf_quant.data._tables.Table` and `sf_quant.data.load_assets`): one
+# `{name}_{YYYY}.parquet` file per year in the directory named by the
+# table's environment variable. Update them together when sf_quant changes.
+
+
+def table_root(env_var: str) -> str:
+    """
+    Directory of a research table.
+
+    Args:
+        env_var: Variable holding the directory, e.g. `ASSETS_TABLE`
+
+    Returns:
+        str: The directory
+    """
+    root = os.getenv(env_var)
+    if not root:
+        raise EnvironmentError(f"{env_var} is not set. Copy .env.example to .env first.")
+    return root
+
+
+def table_path(env_var: str, name: str, year: int | None = None) -> str:
+    """
+    Path of one year file of a research table, or a glob of all of them.
+
+    Args:
+        env_var: Variable holding the table directory, e.g. `ASSETS_TABLE`
+        name: File stem, e.g. `assets`
+        year: Year to read, all years by default
+
+    Returns:
+        str: `{root}/{name}_{year}.parquet`, or `{root}/{name}_*.parquet`
+    """
+    return f"{table_root(env_var)}/{name}_{'*' if year is None else year}.parquet"
+
+
+def table_version(env_var: str, name: str) -> str:
+    """
+    Fingerprint of a research table's files.
+
+    The file count and newest modification time, so a rebuilt or newly
+    appended year changes it without reading any data.
+
+    Args:
+        env_var: Variable holding the table directory, e.g. `ASSETS_TABLE`
+        name: File stem, e.g. `assets`
+
+    Returns:
+        str: `{count}:{newest mtime}`
+    """
+    files = glob.glob(table_path(env_var, name))
+    if not files:
+        raise FileNotFoundError(f"No {name}_*.parquet files in {table_root(env_var)}.")
+    return f"{len(files)}:{max(os.path.getmtime(f) for f in files)}"
+
+
+def scan_assets(start: dt.date, end: dt.date, columns: list[str]) -> pl.LazyFrame:
+    """
+    Lazily scan the in-universe rows `sfd.load_assets(in_universe=True)` returns.
+
+    The date and universe predicates and the column projection are pushed
+    into the parquet scan. Unlike `load_assets` the rows are not sorted.
+
+    Args:
+        start: Start date (inclusive)
+        end: End date (inclusive)
+        columns: Columns to read
+
+    Returns:
+        pl.LazyFrame: Unordered assets rows
+    """
+    return (
+        pl.scan_parquet(table_path("ASSETS_TABLE", "assets"))
+        .filter(
+            pl.col('date').is_between(start, end),
+            pl.col('in_universe')
+        )
+        .select(columns)
+    )
@@ -0,0 +1,142 @@
+import os
+import datetime as dt
+import polars as pl
+import sf_quant.data as sfd
+from dotenv import load_dotenv
+
+from sf_signal import cache_store, tables
+
+
+def cache_dir() -> str | None:
+    """
+    Directory holding cached asset panels, or None when caching is off.
+
+    Returns:
+        str | None: Value of `ASSET_CACHE_DIR`
+    """
+    return os.getenv("ASSET_CACHE_DIR") or None
+
+
+def _max_bytes() -> int:
+    return int(float(os.getenv("ASSET_CACHE_MAX_GB", "20")) * 1024**3)
+
+
+def _source_version() -> str:
+    # Fingerprint of the assets table, so a rebuilt or newly appended year
+    # invalidates every entry built from the old files. Without it a stale
+    # entry could never be told apart, so a missing table raises instead.
+    return tables.table_version("ASSETS_TABLE", "assets")
+
+
+def cache_key(
+    start: dt.date,
+    end: dt.date,
+    columns: list[str],
+    in_universe: bool | None,
+) -> str:
+    """
+    Hash a `load_assets` call together with the current source table version.
+
+    Args:
+        start: Start date (inclusive)
+        end: End date (inclusive)
+        columns: Columns requested
+        in_universe: Universe filter passed to `load_assets`
+
+    Returns:
+        str: Hex digest identifying the cached panel
+    """
+    return cache_store.hash_params({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "columns": columns,
+        "in_universe": in_universe,
+        "source": _source_version(),
+    })
+
+
+def _store() -> cache_store.ArrowCache:
+    return cache_store.ArrowCache(cache_dir(), _max_bytes())
+
+
+def load_assets(
+    start: dt.date,
+    end: dt.date,
+    columns: list[str],
+    in_universe: bool | None = None,
+) -> pl.DataFrame:
+    """
+    Drop-in replacement for `sfd.load_assets` backed by a local cache.
+
+    Hits are memory-mapped from an uncompressed Arrow IPC file, so repeat
+    loads of the same panel skip the shared database entirely. Misses are
+    loaded from the database, written to the cache and trimmed back under
+    `ASSET_CACHE_MAX_GB` by evicting the least recently used entries.
+
+    Args:
+        start: Start date (inclusive)
+        end: End date (inclusive)
+        columns: Columns to load
+        in_universe: Restrict to assets in the universe
+
+    Returns:
+        pl.DataFrame: Same frame `sfd.load_assets` would return
+    """
+    def load():
+        return sfd.load_assets(start=start, end=end, in_universe=in_universe, columns=columns)
+
+    if cache_dir() is None:
+        return load()
+    meta = {"start": start.isoformat(), "end": end.isoformat(), "columns": columns, "in_universe": in_universe}
+    return _store().get(cache_key(start, end, columns, in_universe), load, meta)
+
+
+def cache_info() -> pl.DataFrame:
+    """
+    List cached panels, most recently used first.
+
+    Returns:
+        pl.DataFrame: One row per entry with its parameters, size and last use
+    """
+    return _store().info(lambda meta: {
+        "start": meta.get("start"),
+        "end": meta.get("end"),
+        "in_universe": meta.get("in_universe"),
+        "columns": ", ".join(meta.get("columns", [])),
+        "rows": meta.get("rows"),
+    })
+
+
+def evict(max_bytes: int) -> list[str]:
+    """
+    Delete least recently used entries until the cache fits in `max_bytes`.
+
+    Args:
+        max_bytes: Size budget for the cache directory
+
+    Returns:
+        list[str]: Keys that were evicted
+    """
+    return _store().evict(max_bytes)
+
+
+def clear_cache() -> int:
+    """
+    Remove every cached panel.
+
+    Returns:
+        int: Number of entries removed
+    """
+    return len(evict(0))
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    cache_store.main(
+        "Inspect or clear the local assets cache.",
+        "ASSET_CACHE_DIR",
+        cache_dir,
+        cache_info,
+        clear_cache,
+        hidden=["key"],
+    )
@@ -0,0 +1,108 @@
+import os
+import time
+import argparse
+import tempfile
+from typing import Callable
+from concurrent.futures import as_completed
+import polars as pl
+from dotenv import load_dotenv
+
+from create_signal import compute_signal, load_data
+from sf_signal.pools import pool_size, process_pool
+
+SignalFn = Callable[[pl.DataFrame], pl.DataFrame]
+
+SIGNALS: dict[str, SignalFn] = {}
+
+
+def register(name: str) -> Callable[[SignalFn], SignalFn]:
+    """
+    Add a signal function to the batch registry.
+
+    The function takes the `load_data()` frame and returns a frame with at
+    least `date`, `barrid` and `alpha`. It must be defined at module level
+    so worker processes can find it by name. To add a variant, decorate a
+    function below `momentum` with `@register("name")`; `make build-signals`
+    then writes it to `{output_dir}/name.parquet` with the others.
+
+    Args:
+        name: Output file stem, `{output_dir}/{name}.parquet`
+
+    Returns:
+        Callable: Decorator that registers and returns the function
+    """
+    def decorator(fn: SignalFn) -> SignalFn:
+        if name in SIGNALS:
+            raise ValueError(f"Signal '{name}' is already registered")
+        SIGNALS[name] = fn
+        return fn
+    return decorator
+
+
+@register("momentum")
+def momentum(df: pl.DataFrame) -> pl.DataFrame:
+    return compute_signal(df)
+
+
+def _build_one(name: str, data_path: str, output_path: str) -> tuple[str, int, float]:
+    # Runs in a worker: the shared panel is memory-mapped, not unpickled
+    start = time.perf_counter()
+    df = pl.read_ipc(data_path, memory_map=True)
+    signal = SIGNALS[name](df)
+    signal.write_parquet(output_path)
+    return name, signal.height, time.perf_counter() - start
+
+
+def build_signals(
+    names: list[str] | None = None,
+    output_dir: str = "data/signals",
+    max_workers: int | None = None,
+) -> dict[str, str]:
+    """
+    Compute several registered signals from a single `load_data()` call.
+
+    The panel is written once to an uncompressed Arrow IPC file that every
+    worker memory-maps, so the data is loaded once and never pickled. Each
+    worker gets an equal share of the Polars thread pool.
+
+    Args:
+        names: Registered signals to build, all of them by default
+        output_dir: Directory for the `{name}.parquet` outputs
+        max_workers: Process count, capped at the number of signals and CPUs
+
+    Returns:
+        dict[str, str]: Output path per signal
+    """
+    names = names or list(SIGNALS)
+    unknown = sorted(set(names) - set(SIGNALS))
+    if unknown:
+        raise KeyError(f"Unknown signals {unknown}. Available: {', '.join(SIGNALS)}")
+
+    workers = pool_size(len(names), max_workers)
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = {name: os.path.join(output_dir, f"{name}.parquet") for name in names}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "assets.arrow")
+        load_data().write_ipc(data_path, compression="uncompressed")
+        print(f"Building {len(names)} signals on {workers} workers")
+
+        with process_pool(workers) as pool:
+            futures = [pool.submit(_build_one, name, data_path, outputs[name]) for name in names]
+            for future in as_completed(futures):
+                name, rows, seconds = future.result()
+                print(f"  {name:<20} {rows:>12,} rows  {seconds:6.1f}s  -> {outputs[name]}")
+
+    return outputs
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Build several registered signals from one data load.")
+    parser.add_argument("names", nargs="*", help=f"Signals to build (default: all of {', '.join(SIGNALS)}).")
+    parser.add_argument("--output-dir", default="data/signals")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    build_signals(args.names, args.output_dir, args.workers)
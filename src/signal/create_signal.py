@@ -1,82 +1,677 @@
+import os
+import glob
+import argparse
+import tempfile
 import polars as pl
 import datetime as dt
-import sf_quant.data as sfd
+import asset_cache
+from dense import compute_signal_dense
+from profiling import StageProfiler, profiler_from_env
+from dotenv import load_dotenv
+from sf_signal import tables
 
+START = dt.date(1996, 1, 1)
+END = dt.date(2024, 12, 31)
 
-def load_data() -> pl.DataFrame:
+COLUMNS = [
+    'date',
+    'barrid',
+    'ticker',
+    'price',
+    'return',
+    'specific_risk',
+    'predicted_beta'
+]
+
+# Momentum lookback and skip, in trading days per asset
+LOOKBACK = 230
+SKIP = 22
+
+# Observations of each asset's history carried into a later slice of the
+# panel (the next year in stream_signal, the new dates in refresh_signal):
+# the momentum window and skip of the slice's first row, and the columns
+# that window reads
+CARRY = LOOKBACK + SKIP - 1
+CARRY_COLUMNS = ['barrid', 'date', 'return']
+
+# Rows per parquet row group in the partitioned layout, roughly one month of
+# the ~4,000-name universe, so date filters can skip whole row groups.
+ROW_GROUP_SIZE = 100_000
+
+
+def load_data(start: dt.date = START, end: dt.date = END) -> pl.DataFrame:
     """
     Load and prepare market data for signal creation.
-    
+
+    Args:
+        start: First date to load, defaults to `START`
+        end: Last date to load, defaults to `END`
+
     Returns:
         pl.DataFrame: Market data with required columns
     """
     # TODO: Load data from source (API, file, database)
-    start = dt.date(1996, 1, 1)
-    end = dt.date(2024, 12, 31)
-
-    columns = [
-        'date',
-        'barrid',
-        'ticker',
-        'price',
-        'return',
-        'specific_risk',
-        'predicted_beta'
-    ]
-
-    return sfd.load_assets(
+    # asset_cache.load_assets wraps sfd.load_assets with a local cache when
+    # ASSET_CACHE_DIR is set
+    return asset_cache.load_assets(
         start=start,
         end=end,
         in_universe=True,
-        columns=columns
+        columns=COLUMNS
     ).filter(
         (pl.col('price')
         .shift(1)
         .gt(5))
     )
-    
+
     # TODO: Filter data as needed (date range, symbols, quality checks)
 
-def create_signal(output_path: str = "data/signal.parquet"):
+
+def scan_data(start: dt.date = START, end: dt.date = END) -> pl.LazyFrame:
     """
-    Loads data, creates a simple signal, and saves it to parquet.
+    Lazily scan the in-universe rows `load_data` starts from.
+
+    Streams from the assets table through `sf_signal.tables` rather than the
+    `ASSET_CACHE_DIR` cache, which holds whole panels. Rows are unordered and
+    `load_data`'s price filter is not applied: it needs the (barrid, date)
+    order, which `stream_signal` establishes one year at a time instead of
+    sorting the whole panel.
+
+    Args:
+        start: First date to scan
+        end: Last date to scan
+
+    Returns:
+        pl.LazyFrame: Market data with required columns
     """
-    # TODO: Load Data
-    df = load_data()
+    return tables.scan_assets(start, end, COLUMNS)
 
-    # TODO: Add your signal logic here
-    signal =  (
-        df
-        .with_columns(
-            pl.col('return', 'specific_risk').truediv(100)
-        )
-        .with_columns(
-            pl.col('return').log1p().alias('log_return')
+
+def filter_prices(raw: pl.DataFrame, prev_price: pl.DataFrame) -> pl.DataFrame:
+    """
+    Apply `load_data`'s price filter to a slice of the (barrid, date)-sorted panel.
+
+    `load_data` keeps rows whose previous row's price is above 5, shifting
+    across the whole sorted panel. Within the slice that is the row above;
+    each asset's first row in the slice is compared with `prev_price`
+    instead: the asset's last price before the slice, or for its first row
+    ever, the last price of the barrid sorted before it.
+
+    Args:
+        raw: Scanned rows sorted by (barrid, date)
+        prev_price: `barrid` and `_prev_price` of every barrid in `raw`
+
+    Returns:
+        pl.DataFrame: Rows `load_data` would keep, in the same order
+    """
+    first = pl.col('barrid').ne_missing(pl.col('barrid').shift(1))
+    return (
+        raw
+        .join(prev_price, on='barrid', how='left', maintain_order='left')
+        .filter(
+            pl.when(first)
+            .then(pl.col('_prev_price'))
+            .otherwise(pl.col('price').shift(1))
+            .gt(5)
         )
-        .sort('barrid', 'date')
-        .with_columns(
-            pl.col('log_return').rolling_sum(window_size=230).over('barrid').alias('signal')
+        .drop('_prev_price')
+    )
+
+
+def _ends(source: pl.LazyFrame) -> pl.DataFrame:
+    # Each barrid's first raw row (`_first_date`, `_first_return`) and last
+    # raw price and date (`_prev_price`, `_last_date`), sorted by barrid
+    return (
+        source
+        .group_by('barrid')
+        .agg(
+            pl.col('date').min().alias('_first_date'),
+            pl.col('return').sort_by('date').first().alias('_first_return'),
+            pl.col('price').sort_by('date').last().alias('_prev_price'),
+            pl.col('date').max().alias('_last_date'),
         )
-        .with_columns(
-            pl.col('signal').shift(22).over('barrid')
+        .sort('barrid')
+        .collect(engine="streaming")
+    )
+
+
+def _first_prices(ends: pl.DataFrame) -> pl.DataFrame:
+    # The price load_data compares each asset's first row with: its sort
+    # order neighbour's last price. Callers replace it with the asset's own
+    # last price once they have seen its earlier rows.
+    return ends.select('barrid', pl.col('_prev_price').shift(1))
+
+
+def _last_prices(prev_price: pl.DataFrame, raw: pl.DataFrame) -> pl.DataFrame:
+    # prev_price once the (barrid, date)-sorted rows of raw have been seen
+    return prev_price.update(
+        raw.group_by('barrid').agg(pl.col('price').last().alias('_prev_price')),
+        on='barrid',
+        include_nulls=True,
+    )
+
+
+def _carry(panel: pl.DataFrame, schema: pl.Schema) -> pl.DataFrame:
+    # Each asset's last CARRY rows of a filtered, (barrid, date)-sorted
+    # panel, with only the columns the momentum window reads
+    return (
+        panel
+        .group_by('barrid', maintain_order=True)
+        .tail(CARRY)
+        .select(
+            pl.col(c) if c in CARRY_COLUMNS else pl.lit(None, schema[c]).alias(c)
+            for c in schema
         )
-        .drop('log_return')
-        .with_columns(
-            pl.col('signal')
-            .sub(pl.col('signal').mean())
-            .truediv(pl.col('signal').std())
-            .over('date')
-            .alias('score')
+    )
+
+
+def state_path(output_path: str) -> str:
+    """
+    Where `refresh_signal` keeps its starting point for a signal.
+
+    Args:
+        output_path: Signal file or partitioned directory
+
+    Returns:
+        str: `{output_path without .parquet}.state.arrow`, next to the signal
+    """
+    return f"{output_path.rstrip('/').removesuffix('.parquet')}.state.arrow"
+
+
+def write_state(output_path: str, carry: pl.DataFrame, ends: pl.DataFrame):
+    """
+    Save what `refresh_signal` needs to extend the signal.
+
+    One row per barrid: its first raw row and last raw price, for the price
+    filter, and the dates and returns of its last `CARRY` filtered rows,
+    which hold the momentum window of its next rows. A few MB for the whole
+    universe.
+
+    Args:
+        output_path: Signal the state belongs to
+        carry: `_carry` of the filtered panel the signal was built from
+        ends: `_ends` of the same panel
+    """
+    path = state_path(output_path)
+    (
+        ends
+        .select('barrid', '_first_date', '_first_return', '_prev_price')
+        .join(
+            carry.group_by('barrid', maintain_order=True).agg(c for c in CARRY_COLUMNS if c != 'barrid'),
+            on='barrid',
+            how='left',
+            maintain_order='left',
         )
-        .with_columns(
-            pl.lit(0.05).mul('score').mul('specific_risk').alias('alpha')
+        .with_columns(pl.lit(ends['_last_date'].max()).alias('through'))
+        .write_ipc(f"{path}.tmp")
+    )
+    os.replace(f"{path}.tmp", path)
+
+
+def _read_state(
+    output_path: str,
+    through: dt.date,
+    schema: pl.Schema,
+) -> tuple[pl.DataFrame, pl.DataFrame] | None:
+    # carry and ends saved by write_state, or None when there is no state
+    # for a signal ending on `through`
+    path = state_path(output_path)
+    if not os.path.exists(path):
+        return None
+    state = pl.read_ipc(path)
+    if state.is_empty() or state['through'][0] != through:
+        return None
+    carry = (
+        state
+        .select(CARRY_COLUMNS)
+        .explode([c for c in CARRY_COLUMNS if c != 'barrid'])
+        .drop_nulls('date')
+    )
+    ends = state.select(
+        'barrid', '_first_date', '_first_return', '_prev_price', pl.col('through').alias('_last_date')
+    )
+    return _carry(carry, schema), ends
+
+
+def _history_state(source: pl.LazyFrame, schema: pl.Schema) -> tuple[pl.DataFrame, pl.DataFrame]:
+    # carry and ends from a scan of the columns the window and price filter
+    # read, for a signal built before states were saved
+    ends = _ends(source)
+    history = (
+        source
+        .select('barrid', 'date', 'price', *(c for c in CARRY_COLUMNS if c not in ('barrid', 'date')))
+        .collect()
+        .sort('barrid', 'date')
+    )
+    return _carry(filter_prices(history, _first_prices(ends)), schema), ends
+
+
+def _recheck_first_rows(carry: pl.DataFrame, before: pl.DataFrame, after: pl.DataFrame) -> pl.DataFrame:
+    # The price filter judges an asset's first row by its sort order
+    # neighbour's last price, which moves as the panel grows. Drop or restore
+    # the carried first rows whose verdict changed between the `_ends`
+    # `before` and `after` new dates. A first row is only in the window while
+    # the asset has fewer than CARRY later rows, so restoring one never
+    # pushes the window past CARRY.
+    def kept(ends: pl.DataFrame, name: str) -> pl.DataFrame:
+        return _first_prices(ends).select('barrid', pl.col('_prev_price').gt(5).fill_null(False).alias(name))
+
+    changed = (
+        before
+        .select('barrid', pl.col('_first_date').alias('date'), pl.col('_first_return').alias('return'))
+        .join(kept(before, '_was'), on='barrid')
+        .join(kept(after, '_now'), on='barrid')
+        .filter(pl.col('_was') != pl.col('_now'))
+    )
+    if changed.is_empty():
+        return carry
+
+    restored = (
+        changed
+        .filter('_now')
+        .join(carry.group_by('barrid').len(), on='barrid', how='left')
+        .filter(pl.col('len').fill_null(0) < CARRY)
+        .select(CARRY_COLUMNS)
+    )
+    return (
+        pl.concat([
+            carry.join(changed.filter('_was').select('barrid', 'date'), on=['barrid', 'date'], how='anti'),
+            _carry(restored, carry.schema),
+        ])
+        .sort('barrid', 'date')
+    )
+
+
+def compute_signal(
+    df: pl.DataFrame | pl.LazyFrame,
+    profiler: StageProfiler | None = None,
+    presorted: bool = False,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Apply the signal logic to market data.
+
+    Works on both eager and lazy frames, on the whole panel or on the year
+    slices of `stream_signal`. Each step is a named stage so
+    `SIGNAL_PROFILE` can report on it.
+
+    Args:
+        df: Market data from `load_data`
+        profiler: Records each stage when profiling is on
+        presorted: `df` is already sorted by (barrid, date), so the sort
+            stage is skipped
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Input columns plus `signal`, `score` and `alpha`
+    """
+    # TODO: Add your signal logic here
+    stages = [
+        ('returns', lambda df: (
+            df
+            .with_columns(
+                pl.col('return', 'specific_risk').truediv(100)
+            )
+            .with_columns(
+                pl.col('return').log1p().alias('log_return')
+            )
+        )),
+        ('sort', lambda df: df if presorted else df.sort('barrid', 'date')),
+        ('momentum', lambda df: (
+            df
+            .with_columns(
+                pl.col('log_return').rolling_sum(window_size=LOOKBACK).over('barrid').alias('signal')
+            )
+            .with_columns(
+                pl.col('signal').shift(SKIP).over('barrid')
+            )
+            .drop('log_return')
+        )),
+        ('score', lambda df: (
+            df
+            .with_columns(
+                pl.col('signal')
+                .sub(pl.col('signal').mean())
+                .truediv(pl.col('signal').std())
+                .over('date')
+                .alias('score')
+            )
+        )),
+        ('alpha', lambda df: (
+            df
+            .with_columns(
+                pl.lit(0.05).mul('score').mul('specific_risk').alias('alpha')
+            )
+            .filter(
+                pl.col('alpha').is_not_null()
+            )
+        )),
+    ]
+
+    for name, stage in stages:
+        df = profiler.run(name, stage, df) if profiler else stage(df)
+    return df
+
+
+def refresh_signal(
+    output_path: str = "data/signal.parquet",
+    partitioned: bool = False,
+    end: dt.date | None = None,
+):
+    """
+    Append signal rows for dates after the last date already in `output_path`.
+
+    Only the new dates are read from the assets table. The momentum window
+    of their first rows and the prices the price filter compares them with
+    come from the state `write_state` saved with the signal, so the new rows
+    match a full rebuild however long an asset has been out of the universe.
+    A signal without a current state (built before states were saved, or
+    by another tool) has it rebuilt once from a scan of the history.
+    Existing rows are copied through unchanged and the file is replaced
+    atomically, so readers never see a partially written signal.
+
+    Args:
+        output_path: Existing signal file or partitioned directory to extend
+        partitioned: Layout to use if `output_path` does not exist yet
+        end: Last date to compute, defaults to today
+    """
+    end = end or dt.date.today()
+    if not os.path.exists(output_path):
+        print(f"No signal found at {output_path}, building the full history.")
+        create_signal(output_path, partitioned=partitioned, end=end)
+        return
+
+    last_date = pl.scan_parquet(output_path).select(pl.col('date').max()).collect().item()
+    if last_date >= end:
+        print(f"Signal is up to date through {last_date}.")
+        return
+
+    source = scan_data(end=end)
+    schema = source.collect_schema()
+    state = _read_state(output_path, last_date, schema)
+    if state is None:
+        print(f"No refresh state for {last_date}, reading the history once.")
+        state = _history_state(source.filter(pl.col('date') <= last_date), schema)
+    carry, known = state
+
+    raw = source.filter(pl.col('date') > last_date).collect().sort('barrid', 'date')
+    new_ends = raw.group_by('barrid', maintain_order=True).agg(
+        pl.col('date').first().alias('_first_date'),
+        pl.col('return').first().alias('_first_return'),
+        pl.col('price').last().alias('_prev_price'),
+        pl.col('date').last().alias('_last_date'),
+    )
+    ends = pl.concat([
+        known.update(new_ends.select('barrid', '_prev_price', '_last_date'), on='barrid', include_nulls=True),
+        new_ends.join(known, on='barrid', how='anti'),
+    ]).sort('barrid')
+    # New barrids compare their first row with their sort order neighbour's
+    # last price through `end`, the others with their own last price
+    prev_price = _first_prices(ends).update(
+        known.select('barrid', '_prev_price'),
+        on='barrid',
+        include_nulls=True,
+    )
+    carry = _recheck_first_rows(carry, known, ends)
+
+    frame = carry.merge_sorted(filter_prices(raw, prev_price), key='barrid')
+    new_rows = compute_signal(frame, presorted=True).filter(pl.col('date') > last_date)
+    if new_rows.is_empty():
+        print(f"No new dates after {last_date}.")
+        return
+
+    if os.path.isdir(output_path):
+        # Partitioned layout: only the year files that gained dates are
+        # rewritten, each from its own scan so no scan outlives its file
+        for (year,), rows in new_rows.group_by(pl.col('date').dt.year()):
+            path = f"{output_path}/{year}.parquet"
+            existing = [pl.scan_parquet(path)] if os.path.exists(path) else []
+            write_partitioned(pl.concat([*existing, rows.lazy()]), output_path)
+    else:
+        existing = pl.read_parquet(output_path)
+        tmp_path = f"{output_path}.tmp"
+        pl.concat([existing, new_rows]).write_parquet(tmp_path)
+        os.replace(tmp_path, output_path)
+    write_state(output_path, _carry(frame, schema), ends)
+    print(f"Appended {new_rows.height} rows for {new_rows['date'].n_unique()} new dates.")
+
+
+def write_partitioned(signal: pl.LazyFrame, output_dir: str) -> list[int]:
+    """
+    Write the signal as one parquet file per year, like the backtest weights.
+
+    Each `{output_dir}/{YYYY}.parquet` is sorted by (date, barrid) and written
+    in `ROW_GROUP_SIZE` row groups with min/max statistics, so readers can
+    skip both files and row groups outside a date window. Files are swapped
+    in atomically. Other year files in `output_dir` are left alone, see
+    `remove_stale_years`.
+
+    Args:
+        signal: Signal rows to write
+        output_dir: Directory that holds the year files
+
+    Returns:
+        list[int]: Years written
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    years = signal.select(pl.col('date').dt.year().unique().sort()).collect().to_series().to_list()
+    for year in years:
+        path = f"{output_dir}/{year}.parquet"
+        (
+            signal
+            .filter(pl.col('date').dt.year() == year)
+            .sort('date', 'barrid')
+            .sink_parquet(f"{path}.tmp", row_group_size=ROW_GROUP_SIZE, statistics=True)
         )
-        .filter(
-            pl.col('alpha').is_not_null()
+        os.replace(f"{path}.tmp", path)
+    return years
+
+
+def remove_stale_years(output_dir: str, years: list[int]) -> list[int]:
+    """
+    Delete year files a full build of a partitioned signal did not write.
+
+    A rebuild with an earlier `--end` or a later `START` would otherwise
+    leave the old build's year files in place for readers to pick up.
+
+    Args:
+        output_dir: Directory that holds the year files
+        years: Years the build wrote
+
+    Returns:
+        list[int]: Years removed
+    """
+    stale = [
+        int(os.path.basename(path).removesuffix(".parquet"))
+        for path in glob.glob(f"{output_dir}/[0-9][0-9][0-9][0-9].parquet")
+    ]
+    stale = sorted(set(stale) - set(years))
+    for year in stale:
+        os.remove(f"{output_dir}/{year}.parquet")
+    return stale
+
+
+def stream_signal(
+    output_path: str,
+    partitioned: bool = False,
+    end: dt.date = END,
+    profiler: StageProfiler | None = None,
+):
+    """
+    Build the signal one calendar year at a time with a bounded memory footprint.
+
+    Each year is scanned from the assets table with predicate and projection
+    pushdown and sorted once by (barrid, date). Two small pieces of state tie
+    it to the years before, so the rows match `create_signal` exactly: every
+    barrid's last raw price, for the price filter, and each asset's last
+    `CARRY` observations, which hold the momentum window of its first rows in
+    the new year however long its universe gaps. Peak memory is one year of
+    the panel plus that state instead of the whole history.
+
+    Years are written as they finish, to `{output_path}/{YYYY}.parquet` when
+    partitioned, otherwise to a scratch directory streamed into `output_path`
+    at the end. Rows are ordered by (date, barrid). The state left after the
+    last year is saved with `write_state` for `refresh_signal`.
+
+    Args:
+        output_path: Signal file, or directory of year files when `partitioned`
+        partitioned: Write `{YYYY}.parquet` files instead of a single file
+        end: Last date to compute, defaults to `END`
+        profiler: Records one stage per year when profiling is on
+    """
+    source = scan_data(end=end)
+    schema = source.collect_schema()
+
+    ends = _ends(source)
+    prev_price = _first_prices(ends)
+    carry = pl.DataFrame(schema=schema)
+
+    def build_year(year: int) -> pl.DataFrame:
+        nonlocal carry, prev_price
+        raw = (
+            source
+            .filter(pl.col('date').is_between(dt.date(year, 1, 1), dt.date(year, 12, 31)))
+            .collect()
+            .sort('barrid', 'date')
         )
-    )
+        frame = carry.merge_sorted(filter_prices(raw, prev_price), key='barrid')
+        prev_price = _last_prices(prev_price, raw)
+        carry = _carry(frame, schema)
+        return compute_signal(frame, presorted=True).filter(pl.col('date').dt.year() == year)
+
+    years = range(START.year, end.year + 1)
+    signals = (profiler.run(f"year_{y}", build_year, y) if profiler else build_year(y) for y in years)
+    if partitioned:
+        written = []
+        for signal in signals:
+            if not signal.is_empty():
+                written += write_partitioned(signal.lazy(), output_path)
+        remove_stale_years(output_path, written)
+    else:
+        # Year files go to a scratch directory next to the output and are
+        # streamed into one file at the end
+        parent = os.path.dirname(os.path.abspath(output_path))
+        with tempfile.TemporaryDirectory(dir=parent) as tmp:
+            for year, signal in zip(years, signals):
+                if not signal.is_empty():
+                    signal.sort('date', 'barrid').write_parquet(
+                        f"{tmp}/{year}.parquet", row_group_size=ROW_GROUP_SIZE, statistics=True
+                    )
+            if os.listdir(tmp):
+                pl.scan_parquet(f"{tmp}/*.parquet").sink_parquet(f"{output_path}.tmp", row_group_size=ROW_GROUP_SIZE)
+                os.replace(f"{output_path}.tmp", output_path)
+
+    if os.path.exists(output_path):
+        write_state(output_path, carry, ends)
+
+
+def create_signal(
+    output_path: str = "data/signal.parquet",
+    lazy: bool = False,
+    partitioned: bool = False,
+    dense: bool = False,
+    mmap_dir: str | None = None,
+    end: dt.date = END,
+    profiler: StageProfiler | None = None,
+):
+    """
+    Loads data, creates a simple signal, and saves it to parquet.
+
+    The state `refresh_signal` starts from is saved next to the signal
+    (`state_path`), so later refreshes only read the new dates.
+
+    Args:
+        output_path: Where to write the signal. A directory of year files
+            when `partitioned` is set
+        lazy: Build the signal a year at a time from the assets table
+            (`stream_signal`) instead of materializing the whole panel.
+            Rows come out ordered by (date, barrid) instead of the eager
+            build's (barrid, date); the values are the same
+        partitioned: Write `{YYYY}.parquet` files sorted by (date, barrid)
+            instead of a single file
+        dense: Compute the momentum signal with the dense NumPy backend
+            in `dense.py` instead of Polars window expressions
+        mmap_dir: With `dense`, memory-map the working arrays in this directory
+        end: Last date to compute, defaults to `END`
+        profiler: Records each stage when profiling is on
+    """
+    def run(stage, fn, *args):
+        return profiler.run(stage, fn, *args) if profiler else fn(*args)
+
+    if lazy:
+        stream_signal(output_path, partitioned=partitioned, end=end, profiler=profiler)
+        return
+
+    # TODO: Load Data
+    df = run('load', load_data, START, end)
+
+    if dense:
+        signal = run('dense', lambda df: compute_signal_dense(df, LOOKBACK, SKIP, mmap_dir=mmap_dir), df)
+    else:
+        signal = compute_signal(df, profiler)
+
     # TODO: Save to data/signal.parquet
-    signal.write_parquet(output_path)
+    if partitioned:
+        run('write', lambda df: remove_stale_years(output_path, write_partitioned(df.lazy(), output_path)), signal)
+    else:
+        run('write', lambda df: df.write_parquet(output_path), signal)
+
+    def save_state(df):
+        write_state(output_path, _carry(df, df.schema), _ends(scan_data(end=end)))
+
+    run('state', save_state, df)
+
 
 if __name__ == "__main__":
-    create_signal()
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Create the signal parquet file.")
+    engine = parser.add_mutually_exclusive_group()
+    engine.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Build the signal a year at a time with bounded memory.",
+    )
+    engine.add_argument(
+        "--dense",
+        action="store_true",
+        help="Compute the signal on dense NumPy arrays.",
+    )
+    parser.add_argument(
+        "--mmap-dir",
+        default=None,
+        help="With --dense, memory-map the working arrays in this directory.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only compute dates after the last one in the existing signal.",
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Write SIGNAL_PATH as a directory of {YYYY}.parquet files.",
+    )
+    parser.add_argument(
+        "--end",
+        type=dt.date.fromisoformat,
+        default=None,
+        help=f"Last date to compute (YYYY-MM-DD), defaults to {END} for a full build and today with --incremental.",
+    )
+    args = parser.parse_args()
+
+    output_path = os.getenv("SIGNAL_PATH", "data/signal.parquet")
+    profiler = profiler_from_env("create_signal")
+    if args.incremental:
+        refresh_signal(output_path, partitioned=args.partitioned, end=args.end)
+    else:
+        create_signal(
+            output_path=output_path,
+            lazy=args.lazy,
+            partitioned=args.partitioned,
+            dense=args.dense,
+            mmap_dir=args.mmap_dir,
+            end=args.end or END,
+            profiler=profiler,
+        )
+
+    if profiler:
+        profiler.write(os.getenv("LOG_DIR", "logs"))
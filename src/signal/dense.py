@@ -0,0 +1,193 @@
+import os
+import numpy as np
+import polars as pl
+
+# Assets per block for the per-asset window math. Keeps the float64
+# accumulators small enough to stay in cache and bounds peak memory.
+BLOCK_SIZE = 256
+
+
+def panel_index(df: pl.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Locate every row of a (barrid, date)-sorted long frame in the dense layout.
+
+    Time-series math runs on an (assets x observations) layout, where cell
+    `(i, k)` is asset `i`'s `k`-th observation, so windows and lags count the
+    asset's own history exactly like `.over('barrid')` on the long frame.
+    Because the frame is sorted the same way, scattering into the layout and
+    gathering back are sequential passes over memory.
+
+    Args:
+        df: Long frame with `date` and `barrid`. Codes are only meaningful
+            when it is sorted by (barrid, date)
+
+    Returns:
+        tuple: `(asset_idx, obs_idx, date_idx)`, each row's asset, its
+            position in the asset's history, and its date as a day offset
+            from the first date
+    """
+    asset_idx = df['barrid'].rle_id().to_numpy().astype(np.int64)
+    starts = np.flatnonzero(np.concatenate([[True], asset_idx[1:] != asset_idx[:-1]]))
+    run_lengths = np.diff(np.append(starts, len(asset_idx)))
+    obs_idx = np.arange(len(asset_idx)) - np.repeat(starts, run_lengths)
+    days = df['date'].to_physical().to_numpy().astype(np.int64)
+    return asset_idx, obs_idx, days - days.min()
+
+
+def _is_panel_order(df: pl.DataFrame, obs_idx: np.ndarray, date_idx: np.ndarray) -> bool:
+    # load_data output is already grouped by asset in date order, which is
+    # checked in two linear passes; anything else is sorted first
+    later = obs_idx[1:] > 0
+    return df['barrid'].is_sorted() and bool(np.all(date_idx[1:][later] > date_idx[:-1][later]))
+
+
+def to_dense(
+    values: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    shape: tuple[int, int],
+    dtype=np.float32,
+    mmap_path: str | None = None,
+) -> np.ndarray:
+    """
+    Scatter long values into a dense array, NaN where there is no row.
+
+    Args:
+        values: One value per long row, NaN for nulls
+        rows: Row coordinate of each value
+        cols: Column coordinate of each value
+        shape: Shape of the dense array
+        dtype: Array dtype, float32 by default to halve memory traffic
+        mmap_path: If set, back the array with a `.npy` memory map at this
+            path instead of RAM
+
+    Returns:
+        np.ndarray: Dense array whose non-NaN cells are the validity mask
+    """
+    if mmap_path is None:
+        out = np.full(shape, np.nan, dtype=dtype)
+    else:
+        os.makedirs(os.path.dirname(mmap_path) or ".", exist_ok=True)
+        out = np.lib.format.open_memmap(mmap_path, mode="w+", dtype=dtype, shape=shape)
+        out[:] = np.nan
+    out[rows, cols] = values
+    return out
+
+
+def rolling_lagged_sum(values: np.ndarray, window: int, lag: int) -> np.ndarray:
+    """
+    Trailing sum over `window` observations, lagged by `lag`, along each row.
+
+    Runs on the (assets x observations) layout, so it matches
+    `rolling_sum(window).shift(lag).over('barrid')` on the long frame. Each
+    block of assets is summed through a float64 cumulative sum along its
+    contiguous rows; a window containing a NaN is NaN.
+
+    Args:
+        values: (assets x observations) array
+        window: Observations per window
+        lag: Observations to lag the window sum by
+
+    Returns:
+        np.ndarray: Array of the same shape and dtype
+    """
+    n_assets, n_obs = values.shape
+    out = np.full(values.shape, np.nan, dtype=values.dtype)
+    if window + lag > n_obs:
+        return out
+
+    for start in range(0, n_assets, BLOCK_SIZE):
+        block = values[start:start + BLOCK_SIZE]
+        valid = ~np.isnan(block)
+
+        cum = np.zeros((block.shape[0], n_obs + 1))
+        np.cumsum(np.where(valid, block, 0.0), axis=1, out=cum[:, 1:])
+        count = np.zeros((block.shape[0], n_obs + 1), dtype=np.int32)
+        np.cumsum(valid, axis=1, out=count[:, 1:])
+
+        sums = cum[:, window:] - cum[:, :-window]
+        sums[(count[:, window:] - count[:, :-window]) != window] = np.nan
+        out[start:start + BLOCK_SIZE, window - 1 + lag:] = sums[:, :n_obs - window + 1 - lag]
+    return out
+
+
+def cross_sectional_zscore(values: np.ndarray, date_idx: np.ndarray) -> np.ndarray:
+    """
+    Standardize values within each date, ignoring NaN.
+
+    Per-date counts, means and variances are segment sums (`np.bincount`)
+    over the long rows, so no (dates x assets) array is built. Uses the
+    sample standard deviation, like `pl.col(...).std()`, and returns NaN for
+    dates with fewer than two observations.
+
+    Args:
+        values: One value per long row
+        date_idx: Date code of each row, from `panel_index`
+
+    Returns:
+        np.ndarray: float64 scores, one per row
+    """
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        n = np.bincount(date_idx, valid)
+        dev = values - (np.bincount(date_idx, np.where(valid, values, 0.0)) / n)[date_idx]
+        var = np.bincount(date_idx, np.where(valid, dev * dev, 0.0)) / (n - 1)
+        return dev / np.sqrt(var)[date_idx]
+
+
+def compute_signal_dense(
+    df: pl.DataFrame,
+    lookback: int,
+    skip: int,
+    dtype=np.float32,
+    mmap_dir: str | None = None,
+) -> pl.DataFrame:
+    """
+    Dense-array backend for the momentum logic in `compute_signal`.
+
+    Scatters log returns once into (assets x observations) for the rolling
+    sum and skip, gathers the signal back onto the long rows, standardizes
+    it per date with segment sums, and filters the rows without an alpha
+    with one mask. Mirrors the template's momentum signal; if you change
+    `compute_signal`, change this too or stick to the Polars backend.
+
+    Args:
+        df: Market data from `load_data`
+        lookback: Momentum window in observations per asset
+        skip: Observations to skip before the window
+        dtype: Working dtype of the dense array
+        mmap_dir: Directory for the memory-mapped array, or None to stay in RAM
+
+    Returns:
+        pl.DataFrame: Same columns and rows as `compute_signal(df)`, equal up
+            to `dtype` precision, sorted by (barrid, date)
+    """
+    asset_idx, obs_idx, date_idx = panel_index(df)
+    if not _is_panel_order(df, obs_idx, date_idx):
+        df = df.sort('barrid', 'date')
+        asset_idx, obs_idx, date_idx = panel_index(df)
+
+    log_return = np.log1p(df['return'].cast(pl.Float64).fill_null(np.nan).to_numpy() / 100)
+    panel = to_dense(
+        log_return,
+        asset_idx,
+        obs_idx,
+        (asset_idx[-1] + 1, obs_idx.max() + 1),
+        dtype,
+        None if mmap_dir is None else os.path.join(mmap_dir, "log_return.npy"),
+    )
+    signal = rolling_lagged_sum(panel, lookback, skip)[asset_idx, obs_idx].astype(np.float64)
+    score = cross_sectional_zscore(signal, date_idx)
+    alpha = 0.05 * score * (df['specific_risk'].cast(pl.Float64).fill_null(np.nan).to_numpy() / 100)
+    keep = ~np.isnan(alpha)
+
+    return (
+        df
+        .filter(pl.Series(keep))
+        .with_columns(
+            pl.col('return', 'specific_risk').truediv(100),
+            pl.Series('signal', signal[keep]),
+            pl.Series('score', score[keep]),
+            pl.Series('alpha', alpha[keep]),
+        )
+    )
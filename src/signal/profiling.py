@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import resource
+import datetime as dt
+from typing import Any, Callable
+import polars as pl
+
+
+def _rss_mb() -> float:
+    # Current resident set size from /proc, falling back to the peak where
+    # /proc is unavailable (macOS)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024**2
+    except OSError:
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _rows(frame: Any) -> int | None:
+    return frame.height if isinstance(frame, pl.DataFrame) else None
+
+
+class StageProfiler:
+    """
+    Records wall time, memory, row counts and query plans per pipeline stage.
+
+    Stages run through `run`. Eager stages record the optimized plan of the
+    same step applied to a lazy frame; lazy stages record their own plan,
+    and their time is only the time to build it, so lazy pipelines should be
+    profiled around the final `collect` or `sink`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = dt.datetime.now()
+        self.stages: list[dict] = []
+
+    def run(self, stage: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `fn(*args)` as a named stage and record it.
+
+        Args:
+            stage: Stage name
+            fn: Step to run
+            *args: Input frame, or nothing for stages without one (loading)
+
+        Returns:
+            Any: Whatever `fn` returns
+        """
+        frame = args[0] if args else None
+        peak_before = _peak_rss_mb()
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        result = fn(*args)
+        seconds = time.perf_counter() - start
+
+        if isinstance(result, pl.LazyFrame):
+            plan = result.explain()
+        elif isinstance(frame, pl.LazyFrame):
+            # Sinks and collects return no frame; the input holds the plan they ran
+            plan = frame.explain(engine="streaming")
+        elif isinstance(frame, pl.DataFrame) and isinstance(result, pl.DataFrame):
+            try:
+                plan = fn(frame.lazy()).explain()
+            except (AttributeError, TypeError, pl.exceptions.PolarsError):
+                plan = None
+        else:
+            plan = None
+
+        self.stages.append({
+            "stage": stage,
+            "seconds": round(seconds, 4),
+            "rss_mb": round(_rss_mb(), 1),
+            "rss_delta_mb": round(_rss_mb() - rss_before, 1),
+            "peak_rss_delta_mb": round(_peak_rss_mb() - peak_before, 1),
+            "rows_in": _rows(frame),
+            "rows_out": _rows(result),
+            "plan": plan,
+        })
+        return result
+
+    def report(self) -> dict:
+        """
+        Returns:
+            dict: Run metadata, per-stage records and the process peak RSS
+        """
+        return {
+            "pipeline": self.name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "total_seconds": round(sum(s["seconds"] for s in self.stages), 4),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "stages": self.stages,
+        }
+
+    def write(self, log_dir: str) -> str:
+        """
+        Write the JSON report to `log_dir` and print a summary to stderr.
+
+        Args:
+            log_dir: Directory for the report, usually `LOG_DIR`
+
+        Returns:
+            str: Path of the JSON report
+        """
+        os.makedirs(log_dir, exist_ok=True)
+        path = os.path.join(log_dir, f"{self.name}_{self.started:%Y%m%d_%H%M%S}.json")
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"{self.name}: {report['total_seconds']:.2f}s, peak RSS {report['peak_rss_mb']:.0f} MB", file=sys.stderr)
+        for s in self.stages:
+            rows = f"{s['rows_in'] or '-':>12} -> {s['rows_out'] or '-':<12}"
+            print(
+                f"  {s['stage']:<12} {s['seconds']:8.2f}s  {rows}  peak +{s['peak_rss_delta_mb']:.0f} MB",
+                file=sys.stderr,
+            )
+        print(f"  report: {path}", file=sys.stderr)
+        return path
+
+
+def profiler_from_env(name: str) -> StageProfiler | None:
+    """
+    Build a profiler when `SIGNAL_PROFILE` is truthy in the environment.
+
+    Args:
+        name: Pipeline name used in the report file name
+
+    Returns:
+        StageProfiler | None: None when profiling is off
+    """
+    if os.getenv("SIGNAL_PROFILE", "false").strip().lower() in {"1", "true", "yes", "on"}:
+        return StageProfiler(name)
+    return None
@@ -0,0 +1,124 @@
+import os
+import argparse
+import polars as pl
+from dotenv import load_dotenv
+
+from create_signal import load_data
+
+
+def _variant_name(lookback: int, skip: int) -> str:
+    return f"score_{lookback}_{skip}"
+
+
+def sweep_momentum(df: pl.DataFrame, lookbacks: list[int], skips: list[int]) -> pl.DataFrame:
+    """
+    Compute momentum scores for every (lookback, skip) pair in one pass.
+
+    Each asset's log returns are accumulated once. The trailing `lookback`
+    sum ending `skip` rows ago is then the difference of two shifted
+    cumulative values, so adding a variant costs two shifts instead of
+    another `rolling_sum` over the panel. Matches `compute_signal`'s
+    `rolling_sum(lookback).shift(skip)` up to floating point rounding,
+    including returning null when the window has fewer than `lookback`
+    non-null returns.
+
+    Args:
+        df: Market data from `load_data`, with `return` in percent
+        lookbacks: Window lengths in trading days
+        skips: Skip lengths in trading days
+
+    Returns:
+        pl.DataFrame: `date`, `barrid`, `return`, `specific_risk` and one
+            cross-sectionally standardized `score_{lookback}_{skip}` column
+            per variant, in decimal units. Rows with no valid variant are
+            dropped.
+    """
+    panel = (
+        df
+        .select('date', 'barrid', pl.col('return', 'specific_risk').truediv(100))
+        .sort('barrid', 'date')
+        .with_columns(
+            pl.col('return').log1p().fill_null(0).cum_sum().over('barrid').alias('_cum'),
+            pl.col('return').is_not_null().cum_sum().over('barrid').alias('_n'),
+            pl.int_range(pl.len()).over('barrid').alias('_row'),
+        )
+    )
+
+    # The panel is sorted by barrid, so a plain shift is a per-asset lag as
+    # long as it does not reach back past the asset's first row.
+    def lagged(col: str, periods: int) -> pl.Expr:
+        return (
+            pl.when(pl.col('_row') >= periods)
+            .then(pl.col(col).shift(periods))
+            .otherwise(pl.lit(0, dtype=panel.schema[col]))
+        )
+
+    names = []
+    variants = []
+    for lookback in lookbacks:
+        for skip in skips:
+            window_sum = lagged('_cum', skip) - lagged('_cum', skip + lookback)
+            window_n = lagged('_n', skip) - lagged('_n', skip + lookback)
+            name = _variant_name(lookback, skip)
+            names.append(name)
+            variants.append(
+                pl.when((pl.col('_row') >= skip + lookback - 1) & (window_n == lookback))
+                .then(window_sum)
+                .alias(name)
+            )
+
+    return (
+        panel
+        .with_columns(variants)
+        .with_columns(
+            pl.col(names)
+            .sub(pl.col(names).mean())
+            .truediv(pl.col(names).std())
+            .over('date')
+        )
+        .drop('_cum', '_n', '_row')
+        .filter(pl.any_horizontal(pl.col(names).is_not_null()))
+        .sort('date', 'barrid')
+    )
+
+
+def to_long(scores: pl.DataFrame) -> pl.DataFrame:
+    """
+    Reshape `sweep_momentum` output to one row per (date, barrid, variant).
+
+    Args:
+        scores: Wide output of `sweep_momentum`
+
+    Returns:
+        pl.DataFrame: `date`, `barrid`, `return`, `specific_risk`,
+            `lookback`, `skip` and `score`
+    """
+    return (
+        scores
+        .unpivot(
+            index=['date', 'barrid', 'return', 'specific_risk'],
+            variable_name='variant',
+            value_name='score',
+        )
+        .drop_nulls('score')
+        .with_columns(
+            pl.col('variant').str.split('_').list.get(1).cast(pl.Int32).alias('lookback'),
+            pl.col('variant').str.split('_').list.get(2).cast(pl.Int32).alias('skip'),
+        )
+        .drop('variant')
+    )
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Sweep momentum lookback and skip lengths.")
+    parser.add_argument("--lookbacks", type=int, nargs="+", default=[63, 126, 189, 230, 252])
+    parser.add_argument("--skips", type=int, nargs="+", default=[0, 5, 10, 21, 22])
+    parser.add_argument("--output", default="data/sweep.parquet")
+    args = parser.parse_args()
+
+    scores = sweep_momentum(load_data(), args.lookbacks, args.skips)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    scores.write_parquet(args.output)
+    print(f"Wrote {len(args.lookbacks) * len(args.skips)} variants to {args.output}")
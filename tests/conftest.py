@@ -0,0 +1,22 @@
+import pytest
+import polars as pl
+
+from synthetic import make_assets, make_signal
+
+
+@pytest.fixture(scope="session")
+def assets() -> pl.DataFrame:
+    """A small panel with churn and null returns, shaped like `load_data()`."""
+    return make_assets(n_assets=60, n_days=320, churn=0.5, null_rate=0.02, seed=1)
+
+
+@pytest.fixture(scope="session")
+def clean_assets() -> pl.DataFrame:
+    """A small panel with churn and no null returns, long enough for the full momentum window."""
+    return make_assets(n_assets=60, n_days=320, churn=0.5, seed=2)
+
+
+@pytest.fixture(scope="session")
+def signal(assets) -> pl.DataFrame:
+    """A random signal over `assets`, shaped like a `create_signal` output file."""
+    return make_signal(assets, seed=3)
@@ -0,0 +1,109 @@
+import json
+import os
+import polars as pl
+import pytest
+
+from backtest_manifest import MANIFEST, read_manifest, record_submission, stale_years, year_digests
+
+GAMMA = 50.0
+CONSTRAINTS = ['ZeroBeta', 'ZeroInvestment']
+
+
+@pytest.fixture
+def signal_path(signal, tmp_path) -> str:
+    path = str(tmp_path / "signal.parquet")
+    signal.write_parquet(path)
+    return path
+
+
+def _write_weights(output_dir: str, years: list[int]):
+    # As a job would, some time after its submission was recorded
+    submitted = read_manifest(output_dir)
+    for year in years:
+        path = os.path.join(output_dir, f"{year}.parquet")
+        pl.DataFrame({'weight': [0.0]}).write_parquet(path)
+        written = submitted[str(year)]['submitted'] + 60
+        os.utime(path, (written, written))
+
+
+def test_year_digests_ignore_row_order_and_extra_columns(signal, signal_path, tmp_path):
+    digests = year_digests(signal_path)
+
+    assert list(digests) == [2000, 2001]
+    assert {year: entry['rows'] for year, entry in digests.items()} == {
+        year: part.height for (year,), part in signal.group_by(pl.col('date').dt.year())
+    }
+    shuffled = tmp_path / "shuffled.parquet"
+    signal.sample(fraction=1.0, shuffle=True, seed=12).with_columns(pl.lit(1.0).alias('research')).write_parquet(shuffled)
+    assert year_digests(str(shuffled)) == digests
+
+    partitioned = tmp_path / "partitioned"
+    partitioned.mkdir()
+    for (year,), part in signal.group_by(pl.col('date').dt.year()):
+        part.write_parquet(partitioned / f"{year}.parquet")
+    assert year_digests(str(partitioned)) == digests
+
+
+@pytest.mark.parametrize("column", ['alpha', 'predicted_beta', 'barrid'])
+def test_year_digests_change_with_the_backtest_inputs(signal, signal_path, tmp_path, column):
+    changed = tmp_path / "changed.parquet"
+    first = (pl.col('date') == pl.col('date').max()) & (pl.col('barrid') == pl.col('barrid').min())
+    replacement = pl.lit('USAZZZZ') if column == 'barrid' else pl.col(column) + 1e-9
+    signal.with_columns(pl.when(first).then(replacement).otherwise(pl.col(column)).alias(column)).write_parquet(changed)
+
+    before, after = year_digests(signal_path), year_digests(str(changed))
+    assert after[2000] == before[2000]
+    assert after[2001]['signal'] != before[2001]['signal']
+
+
+def test_year_digests_without_predicted_beta(signal, tmp_path):
+    path = tmp_path / "no_beta.parquet"
+    signal.drop('predicted_beta').write_parquet(path)
+
+    assert year_digests(str(path)).keys() == {2000, 2001}
+
+
+def test_stale_years_follow_the_recorded_inputs(signal_path, tmp_path):
+    output_dir = str(tmp_path / "weights")
+    digests = year_digests(signal_path)
+    assert stale_years(digests, output_dir, GAMMA, CONSTRAINTS) == [2000, 2001]
+
+    record_submission(digests, [2000, 2001], output_dir, GAMMA, CONSTRAINTS)
+    # Submitted but the jobs have not written anything yet
+    assert stale_years(digests, output_dir, GAMMA, CONSTRAINTS) == [2000, 2001]
+
+    _write_weights(output_dir, [2000, 2001])
+    assert stale_years(digests, output_dir, GAMMA, CONSTRAINTS) == []
+    assert stale_years(digests, output_dir, GAMMA + 1, CONSTRAINTS) == [2000, 2001]
+    assert stale_years(digests, output_dir, GAMMA, CONSTRAINTS[:1]) == [2000, 2001]
+
+    changed = {**digests, 2001: {**digests[2001], 'signal': '0' * 32}}
+    assert stale_years(changed, output_dir, GAMMA, CONSTRAINTS) == [2001]
+
+    # A weight file older than its submission comes from an earlier run
+    submitted = read_manifest(output_dir)['2000']['submitted']
+    os.utime(os.path.join(output_dir, "2000.parquet"), (submitted - 60, submitted - 60))
+    assert stale_years(digests, output_dir, GAMMA, CONSTRAINTS) == [2000]
+
+
+def test_record_submission_keeps_other_years(signal_path, tmp_path):
+    output_dir = str(tmp_path / "weights")
+    digests = year_digests(signal_path)
+    first = record_submission(digests, [2000, 2001], output_dir, GAMMA, CONSTRAINTS)
+    later = {**digests, 2001: {**digests[2001], 'signal': '0' * 32}}
+    manifest = record_submission(later, [2001], output_dir, GAMMA, CONSTRAINTS)
+
+    assert manifest['years']['2000'] == first['years']['2000']
+    assert manifest['years']['2001']['signal'] == '0' * 32
+    with open(os.path.join(output_dir, MANIFEST)) as f:
+        assert json.load(f) == manifest
+
+    # Years that left the signal are dropped
+    assert list(record_submission({2001: later[2001]}, [], output_dir, GAMMA, CONSTRAINTS)['years']) == ['2001']
+
+
+def test_read_manifest_ignores_other_formats(tmp_path):
+    assert read_manifest(str(tmp_path)) == {}
+    with open(tmp_path / MANIFEST, "w") as f:
+        json.dump({"format": 0, "years": {"2000": {}}}, f)
+    assert read_manifest(str(tmp_path)) == {}
@@ -0,0 +1,88 @@
+import datetime as dt
+import numpy as np
+import polars as pl
+import pytest
+
+import bootstrap
+from bootstrap import ic_intervals, return_intervals, stationary_blocks
+from daily import drawdown, ic_summary
+
+
+def _expand(starts: np.ndarray, lengths: np.ndarray, n: int) -> np.ndarray:
+    # Index of every observation of one resample, block by block
+    return np.concatenate([(start + np.arange(length)) % n for start, length in zip(starts, lengths)])
+
+
+@pytest.fixture(scope="module")
+def returns() -> pl.DataFrame:
+    rng = np.random.default_rng(7)
+    n = 600
+    return pl.DataFrame({
+        'date': pl.date_range(dt.date(2020, 1, 1), dt.date(2020, 1, 1) + dt.timedelta(days=n - 1), eager=True),
+        'return': rng.normal(0.0004, 0.01, n),
+    }).sample(fraction=1.0, shuffle=True, seed=1)
+
+
+def test_stationary_blocks_cover_each_resample_exactly():
+    starts, lengths = stationary_blocks(300, 2_000, 22, np.random.default_rng(0))
+
+    assert starts.shape == lengths.shape
+    assert (lengths.sum(axis=1) == 300).all()
+    assert ((starts >= 0) & (starts < 300)).all()
+    # First blocks are almost never cut at the end, so they show the geometric lengths
+    assert lengths[:, 0].mean() == pytest.approx(22, rel=0.05)
+    with pytest.raises(ValueError):
+        stationary_blocks(1, 10, 22, np.random.default_rng(0))
+
+
+def test_moments_and_drawdowns_match_expanded_resamples(returns):
+    values = returns.sort('date')['return'].to_numpy()
+    n = len(values)
+    starts, lengths = stationary_blocks(n, 20, 22, np.random.default_rng(1))
+    mean, std = bootstrap._moments(values, starts, lengths)
+    drawdowns = bootstrap._max_drawdowns(values, starts, lengths)
+
+    for i in range(len(starts)):
+        path = values[_expand(starts[i], lengths[i], n)]
+        assert mean[i] == pytest.approx(path.mean(), rel=1e-9)
+        assert std[i] == pytest.approx(path.std(ddof=1), rel=1e-9)
+        log_value = np.log1p(path).cumsum()
+        assert drawdowns[i] == pytest.approx(np.expm1((log_value - np.maximum.accumulate(log_value)).min()), rel=1e-4)
+
+
+def test_return_intervals_point_estimates(returns):
+    intervals = {row['metric']: row for row in return_intervals(returns, n_resamples=1_000).iter_rows(named=True)}
+    values = returns['return']
+
+    assert intervals['Sharpe']['estimate'] == pytest.approx(values.mean() / values.std() * np.sqrt(252))
+    assert intervals['Annual Return']['estimate'] == pytest.approx(values.mean() * 252)
+    assert intervals['Max Drawdown']['estimate'] == pytest.approx(drawdown(returns)['drawdown'].min(), rel=1e-4)
+    for row in intervals.values():
+        assert row['lower'] <= row['estimate'] <= row['upper']
+
+
+def test_ic_intervals_point_estimates(returns):
+    ics = returns.select('date', pl.col('return').mul(10).alias('ic'))
+    ics = ics.with_columns(pl.when(pl.int_range(pl.len()) % 50 == 0).then(None).otherwise(pl.col('ic')).alias('ic'))
+    intervals = {row['metric']: row for row in ic_intervals(ics, n_resamples=1_000).iter_rows(named=True)}
+    summary = ic_summary(ics)
+
+    assert intervals['IC Mean']['estimate'] == pytest.approx(summary['ic_mean'])
+    assert intervals['ICIR']['estimate'] == pytest.approx(summary['icir'])
+    for row in intervals.values():
+        assert row['lower'] <= row['estimate'] <= row['upper']
+
+
+def test_intervals_are_seeded(returns):
+    assert return_intervals(returns, n_resamples=500, seed=3).equals(return_intervals(returns, n_resamples=500, seed=3))
+    assert not return_intervals(returns, n_resamples=500, seed=3).equals(return_intervals(returns, n_resamples=500, seed=4))
+
+
+def test_short_samples_are_undefined(returns):
+    short = return_intervals(returns.head(1))
+    assert short['metric'].to_list() == ["Sharpe", "Annual Return", "Max Drawdown"]
+    assert short.select(pl.col('estimate', 'lower', 'upper').is_nan().all()).row(0) == (True, True, True)
+
+    empty = ic_intervals(pl.DataFrame({'date': [dt.date(2020, 1, 1)], 'ic': [None]}, schema={'date': pl.Date, 'ic': pl.Float64}))
+    assert empty['metric'].to_list() == ["IC Mean", "ICIR"]
+    assert empty['estimate'].is_nan().all()
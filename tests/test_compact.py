@@ -0,0 +1,101 @@
+import json
+import os
+import numpy as np
+import polars as pl
+import pytest
+
+import compact
+from daily import portfolio_daily
+from loading import read_manifest, scan_weights, year_files
+from synthetic import make_weights, write_weights
+
+
+def _read(directory: str) -> pl.DataFrame:
+    return pl.read_parquet(list(year_files(directory).values())).sort('date', 'barrid')
+
+
+@pytest.fixture(scope="module")
+def weights(assets) -> pl.DataFrame:
+    return make_weights(assets, seed=10)
+
+
+@pytest.fixture(scope="module")
+def source(weights, tmp_path_factory) -> str:
+    directory = str(tmp_path_factory.mktemp("weights"))
+    write_weights(weights, directory)
+    return directory
+
+
+def test_pack_unpack_round_trips_float64(weights, source, tmp_path):
+    manifest = compact.pack(source, str(tmp_path / "compact"))
+    assert compact.unpack(str(tmp_path / "compact"), str(tmp_path / "unpacked")) == 2
+
+    assert _read(str(tmp_path / "unpacked")).equals(_read(source))
+    assert manifest['weight_type'] == "Float64"
+    assert manifest['max_weight_error'] == 0.0
+    assert manifest['n_barrids'] == weights['barrid'].n_unique()
+    assert {year: entry['rows'] for year, entry in manifest['years'].items()} == {
+        str(year): part.height for (year,), part in weights.group_by(pl.col('date').dt.year())
+    }
+    with open(tmp_path / "compact" / "manifest.json") as f:
+        assert json.load(f) == manifest
+
+
+def test_pack_float32_records_its_error(source, tmp_path):
+    manifest = compact.pack(source, str(tmp_path / "compact"), float32=True)
+    compact.unpack(str(tmp_path / "compact"), str(tmp_path / "unpacked"))
+    original, unpacked = _read(source), _read(str(tmp_path / "unpacked"))
+
+    assert unpacked.select('date', 'barrid').equals(original.select('date', 'barrid'))
+    error = (unpacked['weight'] - original['weight']).abs().max()
+    assert manifest['weight_type'] == "Float32"
+    assert manifest['max_weight_error'] == pytest.approx(error)
+    np.testing.assert_allclose(unpacked['weight'].to_numpy(), original['weight'].to_numpy(), rtol=1e-6)
+
+
+def test_compact_year_files_hold_sorted_codes(source, tmp_path):
+    compact.pack(source, str(tmp_path / "compact"))
+    for path in year_files(str(tmp_path / "compact")).values():
+        part = pl.read_parquet(path)
+        assert part.columns == ['date', 'code', 'weight']
+        assert part.schema['code'] == pl.UInt32
+        assert part.select('date', 'code').equals(part.select('date', 'code').sort('date', 'code'))
+
+
+def test_scans_and_analytics_read_compact_weights(weights, source, tmp_path):
+    compact.pack(source, str(tmp_path / "compact"))
+    scanned = scan_weights(str(tmp_path / "compact")).collect()
+    returns = weights.select('date', 'barrid', pl.lit(0.001).alias('return'))
+
+    assert isinstance(scanned.schema['barrid'], pl.Enum)
+    assert scanned.with_columns(pl.col('barrid').cast(pl.String)).sort('date', 'barrid').equals(_read(source))
+    expected = portfolio_daily(_read(source), returns)
+    result = portfolio_daily(scanned, returns)
+    assert result.select('date', 'n_names', 'n_long', 'n_short').equals(expected.select('date', 'n_names', 'n_long', 'n_short'))
+    np.testing.assert_allclose(
+        result['two_sided_turnover'].to_numpy(), expected['two_sided_turnover'].to_numpy(), rtol=1e-12, equal_nan=True
+    )
+
+
+def test_pack_replaces_stale_years_and_refuses_compact_sources(weights, source, tmp_path):
+    target = tmp_path / "compact"
+    target.mkdir()
+    weights.head(10).with_columns(pl.col('date').dt.offset_by('-5y')).write_parquet(target / "1995.parquet")
+    compact.pack(source, str(target))
+
+    assert list(year_files(str(target))) == [2000, 2001]
+    with pytest.raises(ValueError):
+        compact.pack(str(target), str(tmp_path / "again"))
+    with pytest.raises(ValueError):
+        compact.unpack(source, str(tmp_path / "unpacked"))
+    assert read_manifest(source) is None
+
+
+def test_info_reports_each_year(source, tmp_path):
+    compact.pack(source, str(tmp_path / "compact"))
+    sizes = compact.info(str(tmp_path / "compact"))
+
+    assert sizes['year'].to_list() == [2000, 2001]
+    assert sizes['rows'].sum() == _read(source).height
+    sizes_mb = [round(os.path.getsize(path) / 1024**2, 2) for path in year_files(str(tmp_path / "compact")).values()]
+    assert sizes['size_mb'].to_list() == sizes_mb
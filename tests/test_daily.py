@@ -0,0 +1,73 @@
+import datetime as dt
+import numpy as np
+import polars as pl
+import pytest
+
+from daily import ic_summary, ic_term_structure, sample_filter, sample_ics, turnover_stats
+
+
+@pytest.fixture(scope="module")
+def cutoff(signal) -> dt.date:
+    dates = signal['date'].unique().sort()
+    return dates[dates.len() // 2]
+
+
+@pytest.fixture(scope="module")
+def ics(signal) -> pl.DataFrame:
+    return ic_term_structure(signal, horizons=[1, 5, 22])
+
+
+def test_sample_filter_splits_at_the_cutoff(signal, cutoff):
+    full = signal.filter(sample_filter("Full Sample", cutoff))
+    inside = signal.filter(sample_filter("In Sample", cutoff))
+    outside = signal.filter(sample_filter("Out of Sample", cutoff))
+
+    assert full.height == signal.height
+    assert inside.height + outside.height == signal.height
+    assert inside['date'].max() == cutoff
+    assert outside['date'].min() > cutoff
+
+
+@pytest.mark.parametrize("mode", ["Full Sample", "In Sample", "Out of Sample"])
+def test_sample_ics_match_ics_of_the_sample(signal, ics, cutoff, mode):
+    expected = ic_term_structure(signal.filter(sample_filter(mode, cutoff)), horizons=[1, 5, 22]).drop('window_end')
+    result = sample_ics(ics, signal, mode, cutoff)
+
+    assert result.select('date', 'horizon', 'n').equals(expected.select('date', 'horizon', 'n'))
+    for col in ['ic', 'lag_ic']:
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-12, equal_nan=True)
+
+
+def test_in_sample_ics_recompute_windows_crossing_the_cutoff(ics, cutoff):
+    # The in-sample comparison above only exercises the recomputation if
+    # some forward windows run past the cutoff
+    crossing = ics.filter((pl.col('date') <= cutoff) & (pl.col('window_end') > cutoff))
+
+    assert crossing['horizon'].unique().sort().to_list() == [5, 22]
+    assert crossing.filter(pl.col('horizon') == 22)['date'].n_unique() >= 21
+
+
+def test_ic_summary(ics):
+    headline = ics.filter(pl.col('horizon') == 22)
+    summary = ic_summary(headline)
+
+    assert summary['ic_mean'] == pytest.approx(headline['ic'].mean())
+    assert summary['icir'] == pytest.approx(headline['ic'].mean() / headline['ic'].std())
+
+
+def test_turnover_stats_match_rolling_mean():
+    rng = np.random.default_rng(5)
+    turnover = rng.uniform(0.0, 0.2, 400)
+    turnover[0] = np.nan
+    daily = pl.DataFrame({
+        'date': pl.date_range(dt.date(2020, 1, 1), dt.date(2020, 1, 1) + dt.timedelta(days=399), eager=True),
+        'two_sided_turnover': turnover,
+    }).with_columns(pl.col('two_sided_turnover').fill_nan(None)).reverse()
+
+    # The first date has no turnover, so the first full window starts on the second
+    means = np.array([turnover[i - 251:i + 1].mean() for i in range(252, 400)])
+    stats = turnover_stats(daily).row(0, named=True)
+
+    assert stats['Mean Turnover'] == pytest.approx(round(means.mean(), 4))
+    assert stats['Min Turnover'] == pytest.approx(round(means.min(), 4))
+    assert stats['Max Turnover'] == pytest.approx(round(means.max(), 4))
@@ -0,0 +1,97 @@
+import numpy as np
+import polars as pl
+
+import create_signal
+import dense
+from create_signal import LOOKBACK, SKIP, compute_signal
+from dense import compute_signal_dense, cross_sectional_zscore, panel_index, rolling_lagged_sum
+
+
+def _naive_rolling_lagged_sum(values: np.ndarray, window: int, lag: int) -> np.ndarray:
+    out = np.full(values.shape, np.nan)
+    for i in range(values.shape[0]):
+        for k in range(window - 1 + lag, values.shape[1]):
+            out[i, k] = values[i, k - lag - window + 1:k - lag + 1].sum()
+    return out
+
+
+def test_rolling_lagged_sum_matches_naive_window(monkeypatch):
+    monkeypatch.setattr(dense, "BLOCK_SIZE", 3)
+    rng = np.random.default_rng(0)
+    values = rng.normal(0.0, 0.02, (10, 40))
+    values[rng.random(values.shape) < 0.05] = np.nan
+
+    for window, lag in [(1, 0), (5, 0), (5, 3), (12, 7), (30, 10)]:
+        np.testing.assert_allclose(
+            rolling_lagged_sum(values, window, lag),
+            _naive_rolling_lagged_sum(values, window, lag),
+            rtol=1e-12,
+            atol=1e-12,
+            equal_nan=True,
+        )
+
+
+def test_rolling_lagged_sum_window_longer_than_history():
+    assert np.isnan(rolling_lagged_sum(np.ones((2, 5)), 4, 2)).all()
+
+
+def test_cross_sectional_zscore_matches_polars():
+    rng = np.random.default_rng(1)
+    date_idx = np.sort(rng.integers(0, 8, 200))
+    values = rng.normal(size=200)
+    values[rng.random(200) < 0.1] = np.nan
+    # A date with a single observation has no standard deviation
+    values[date_idx == 5] = np.nan
+    values[np.flatnonzero(date_idx == 5)[0]] = 1.0
+
+    expected = (
+        pl.DataFrame({'date': date_idx, 'value': values})
+        .with_columns(pl.col('value').fill_nan(None))
+        .select(pl.col('value').sub(pl.col('value').mean()).truediv(pl.col('value').std()).over('date'))
+        ['value'].fill_null(np.nan).to_numpy()
+    )
+    np.testing.assert_allclose(cross_sectional_zscore(values, date_idx), expected, rtol=1e-12, equal_nan=True)
+
+
+def test_panel_index_counts_each_assets_history(assets):
+    asset_idx, obs_idx, date_idx = panel_index(assets)
+
+    expected = assets.select(
+        pl.col('barrid').rle_id().alias('asset'),
+        pl.int_range(pl.len()).over('barrid').alias('obs'),
+    )
+    np.testing.assert_array_equal(asset_idx, expected['asset'].to_numpy())
+    np.testing.assert_array_equal(obs_idx, expected['obs'].to_numpy())
+    assert date_idx.min() == 0
+    assert (np.diff(date_idx)[np.diff(asset_idx) == 0] > 0).all()
+
+
+def _assert_matches_polars(df: pl.DataFrame, result: pl.DataFrame, rtol: float):
+    expected = compute_signal(df)
+    assert expected.height > 0
+    assert result.columns == expected.columns
+    assert result.select('date', 'barrid').equals(expected.select('date', 'barrid'))
+    for col in ['return', 'specific_risk']:
+        assert result[col].equals(expected[col])
+    for col in ['signal', 'score', 'alpha']:
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=rtol, atol=rtol)
+
+
+def test_dense_matches_polars_backend(clean_assets):
+    _assert_matches_polars(clean_assets, compute_signal_dense(clean_assets, LOOKBACK, SKIP, np.float64), 1e-9)
+    _assert_matches_polars(clean_assets, compute_signal_dense(clean_assets, LOOKBACK, SKIP), 1e-4)
+
+
+def test_dense_matches_polars_backend_with_nulls(assets, monkeypatch):
+    # Short windows so assets with null returns still get scores
+    monkeypatch.setattr(create_signal, "LOOKBACK", 21)
+    monkeypatch.setattr(create_signal, "SKIP", 5)
+    _assert_matches_polars(assets, compute_signal_dense(assets, 21, 5, np.float64), 1e-9)
+
+
+def test_dense_sorts_unordered_input_and_memory_maps(clean_assets, tmp_path):
+    shuffled = clean_assets.sample(fraction=1.0, shuffle=True, seed=3)
+    result = compute_signal_dense(shuffled, LOOKBACK, SKIP, np.float64, mmap_dir=str(tmp_path))
+
+    _assert_matches_polars(clean_assets, result, 1e-9)
+    assert (tmp_path / "log_return.npy").exists()
@@ -0,0 +1,102 @@
+import numpy as np
+import polars as pl
+import pytest
+import sf_quant.performance as sfp
+
+import daily
+from daily import IC_WINDOW, half_life, headline_ics, ic_decay, ic_term_structure
+from synthetic import make_signal
+
+HORIZONS = [1, 2, 5, 13, 22]
+
+
+def _naive_ics(signal: pl.DataFrame, h: int) -> pl.DataFrame:
+    # One horizon at a time: per-asset rolling sums and shifts, then a rank
+    # correlation within each date
+    return (
+        signal
+        .filter(pl.col('return').is_not_null())
+        .sort('barrid', 'date')
+        .with_columns(
+            pl.col('return').log1p().rolling_sum(h).shift(-(h - 1)).over('barrid').alias('forward'),
+            pl.col('return').shift(-(h - 1)).over('barrid').alias('lagged'),
+            pl.col('date').shift(-(h - 1)).over('barrid').alias('end'),
+        )
+        .filter(pl.col('alpha').is_finite(), pl.col('forward').is_not_null())
+        .group_by('date')
+        .agg(
+            pl.corr(pl.col('alpha').rank(), pl.col('forward').rank()).alias('ic'),
+            pl.corr(pl.col('alpha').rank(), pl.col('lagged').rank()).alias('lag_ic'),
+            pl.len().cast(pl.UInt32).alias('n'),
+            pl.col('end').max().alias('window_end'),
+        )
+        .sort('date')
+    )
+
+
+@pytest.fixture(scope="module")
+def tied_signal(signal) -> pl.DataFrame:
+    return signal.with_columns(
+        pl.when(pl.col('barrid').str.ends_with('7'))
+        .then(pl.col('alpha').round(3))
+        .otherwise(pl.col('alpha'))
+    )
+
+
+def test_ic_term_structure_matches_naive_rank_ic(tied_signal):
+    ics = ic_term_structure(tied_signal, HORIZONS)
+
+    assert ics['horizon'].unique().sort().to_list() == HORIZONS
+    for h in HORIZONS:
+        expected = _naive_ics(tied_signal, h)
+        result = ics.filter(pl.col('horizon') == h)
+        assert result.select('date', 'n', 'window_end').equals(expected.select('date', 'n', 'window_end'))
+        for col in ['ic', 'lag_ic']:
+            np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+def test_ic_term_structure_matches_generate_alpha_ics(clean_assets):
+    signal = make_signal(clean_assets, seed=6)
+    ics = ic_term_structure(signal, [1, IC_WINDOW])
+
+    for h in [1, IC_WINDOW]:
+        expected = (
+            sfp.generate_alpha_ics(signal.select('date', 'barrid', 'alpha'), signal.select('date', 'barrid', 'return'), window=h)
+            .filter(pl.col('n') > 0)
+            .sort('date')
+        )
+        result = ics.filter(pl.col('horizon') == h)
+        assert result['date'].equals(expected['date'])
+        assert (result['n'].cast(pl.Int64) == expected['n'].cast(pl.Int64)).all()
+        np.testing.assert_allclose(result['ic'].to_numpy(), expected['ic'].to_numpy(), rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+def test_ic_term_structure_chunks_horizons(signal, monkeypatch):
+    expected = ic_term_structure(signal, HORIZONS)
+    monkeypatch.setattr(daily, "HORIZON_CHUNK", 2)
+
+    assert ic_term_structure(signal, HORIZONS).equals(expected)
+
+
+def test_headline_ics_and_decay(signal):
+    ics = ic_term_structure(signal, HORIZONS)
+    decay = ic_decay(ics)
+
+    assert headline_ics(ics).equals(ics.filter(pl.col('horizon') == IC_WINDOW).select('date', 'ic', 'n'))
+    assert decay['horizon'].to_list() == HORIZONS
+    row = decay.filter(pl.col('horizon') == 5).row(0, named=True)
+    five = ics.filter(pl.col('horizon') == 5)
+    assert row['ic_mean'] == pytest.approx(five['ic'].mean())
+    assert row['lag_icir'] == pytest.approx(five['lag_ic'].mean() / five['lag_ic'].std())
+    assert row['n_dates'] == five['ic'].count()
+
+
+def test_half_life_interpolates_the_halving():
+    decay = pl.DataFrame({'horizon': [1, 2, 3, 4, 5], 'lag_ic_mean': [0.02, 0.04, 0.03, 0.01, 0.0]})
+    assert half_life(decay) == pytest.approx(1.5)
+
+    negative = decay.with_columns(pl.col('lag_ic_mean').neg())
+    assert half_life(negative) == pytest.approx(1.5)
+
+    assert half_life(decay.head(3)) is None
+    assert half_life(decay.with_columns(pl.lit(None, dtype=pl.Float64).alias('lag_ic_mean'))) is None
@@ -0,0 +1,87 @@
+import datetime as dt
+import polars as pl
+import pytest
+
+from daily import sample_filter
+from loading import date_range, files_in_window, sample_window, scan_signal, scan_weights, year_files
+from synthetic import make_weights, write_weights
+
+WINDOWS = [
+    (None, None),
+    (dt.date(2000, 6, 1), None),
+    (None, dt.date(2000, 6, 1)),
+    (dt.date(2000, 3, 15), dt.date(2000, 11, 30)),
+    (dt.date(2001, 2, 1), dt.date(2001, 2, 28)),
+    (dt.date(1999, 1, 1), dt.date(1999, 12, 31)),
+]
+
+
+def _eager(frame: pl.DataFrame, start: dt.date | None, end: dt.date | None) -> pl.DataFrame:
+    if start is not None:
+        frame = frame.filter(pl.col('date') >= start)
+    if end is not None:
+        frame = frame.filter(pl.col('date') <= end)
+    return frame
+
+
+@pytest.fixture(scope="module")
+def weights(assets) -> pl.DataFrame:
+    return make_weights(assets, seed=8)
+
+
+@pytest.fixture(scope="module")
+def weight_dir(weights, tmp_path_factory) -> str:
+    directory = tmp_path_factory.mktemp("weights")
+    write_weights(weights, str(directory))
+    (directory / "notes.parquet").write_bytes(b"")
+    return str(directory)
+
+
+@pytest.mark.parametrize("mode", ["Full Sample", "In Sample", "Out of Sample"])
+def test_sample_window_matches_sample_filter(signal, mode):
+    cutoff = dt.date(2000, 6, 30)
+    start, end = sample_window(mode, cutoff)
+
+    assert _eager(signal, start, end).equals(signal.filter(sample_filter(mode, cutoff)))
+
+
+def test_year_files_and_date_ranges(weights, weight_dir):
+    files = year_files(weight_dir)
+
+    assert list(files) == [2000, 2001]
+    for year, path in files.items():
+        part = weights.filter(pl.col('date').dt.year() == year)
+        assert date_range(path) == (part['date'].min(), part['date'].max())
+
+
+def test_files_in_window_uses_names_and_statistics(weight_dir):
+    files = year_files(weight_dir)
+    last = date_range(files[2001])[1]
+
+    assert files_in_window(files, None, None) == [files[2000], files[2001]]
+    assert files_in_window(files, None, dt.date(2000, 12, 31)) == [files[2000]]
+    # Named 2001, but its statistics end before the window starts
+    assert files_in_window(files, last + dt.timedelta(days=1), None) == []
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+def test_scan_weights_matches_eager_filter(weights, weight_dir, start, end):
+    result = scan_weights(weight_dir, start, end).collect().sort('date', 'barrid')
+
+    assert result.columns == ['date', 'barrid', 'weight']
+    assert result.equals(_eager(weights, start, end).sort('date', 'barrid'))
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+def test_scan_signal_matches_eager_filter(signal, tmp_path, start, end):
+    path = tmp_path / "signal.parquet"
+    signal.write_parquet(path)
+    partitioned = tmp_path / "signal"
+    partitioned.mkdir()
+    for (year,), part in signal.group_by(pl.col('date').dt.year()):
+        part.write_parquet(partitioned / f"{year}.parquet")
+
+    expected = _eager(signal, start, end).select('date', 'barrid', 'alpha', 'return').sort('date', 'barrid')
+    assert scan_signal(str(path), start, end).collect().sort('date', 'barrid').equals(expected)
+    assert scan_signal(str(partitioned), start, end).collect().sort('date', 'barrid').equals(expected)
+    assert scan_signal(str(path), start, end, columns=['date', 'alpha']).collect_schema().names() == ['date', 'alpha']
@@ -0,0 +1,84 @@
+import numpy as np
+import polars as pl
+import pytest
+import sf_quant.data as sfd
+import sf_quant.performance as sfp
+import sf_quant.performance.returns as performance_returns
+
+from daily import portfolio_daily
+from synthetic import make_weights
+
+
+@pytest.fixture(scope="module")
+def weights(assets) -> pl.DataFrame:
+    # Drop a few positions so names leave and re-enter the book
+    return make_weights(assets, seed=9).filter(pl.int_range(pl.len()) % 37 != 0)
+
+
+@pytest.fixture(scope="module")
+def returns(assets) -> pl.DataFrame:
+    return assets.select('date', 'barrid', pl.col('return').truediv(100))
+
+
+def _naive_turnover(weights: pl.DataFrame) -> pl.DataFrame:
+    # Every (date, barrid) pair of the backtest, zero where a name is not held
+    grid = (
+        weights.select('date').unique()
+        .join(weights.select('barrid').unique(), how='cross')
+        .join(weights, on=['date', 'barrid'], how='left')
+        .with_columns(pl.col('weight').fill_null(0))
+        .sort('barrid', 'date')
+        .with_columns(pl.col('weight').diff().abs().over('barrid').alias('trade'))
+    )
+    return grid.group_by('date').agg(pl.col('trade').sum()).sort('date').with_columns(
+        pl.when(pl.int_range(pl.len()) > 0).then(pl.col('trade')).alias('trade')
+    )
+
+
+def test_portfolio_daily_matches_sfp(weights, returns, assets, monkeypatch):
+    def load_assets(start, end, columns, in_universe=None):
+        return assets.filter(pl.col('date').is_between(start, end)).select(columns)
+
+    monkeypatch.setattr(performance_returns, "load_assets", load_assets)
+    monkeypatch.setattr(sfd, "load_assets", load_assets)
+    daily = portfolio_daily(weights, returns)
+    expected = sfp.generate_returns_from_weights(weights)
+
+    assert daily['date'].equals(expected['date'])
+    np.testing.assert_allclose(daily['return'].to_numpy(), expected['return'].to_numpy(), rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(
+        daily['gross_leverage'].round(2).to_numpy(),
+        sfp.generate_leverage_from_weights(weights)['leverage'].to_numpy(),
+    )
+    # Without returns the same returns are loaded for the weights' dates
+    assert portfolio_daily(weights).equals(daily)
+
+
+def test_portfolio_daily_matches_naive_per_date_tables(weights, returns):
+    daily = portfolio_daily(weights, returns)
+    expected = weights.group_by('date').agg(
+        pl.col('weight').sum().alias('net_leverage'),
+        pl.len().alias('n_names'),
+        (pl.col('weight') > 0).sum().alias('n_long'),
+        (pl.col('weight') < 0).sum().alias('n_short'),
+    ).sort('date')
+
+    np.testing.assert_allclose(daily['net_leverage'].to_numpy(), expected['net_leverage'].to_numpy(), atol=1e-12)
+    for col in ['n_names', 'n_long', 'n_short']:
+        assert (daily[col].cast(pl.Int64) == expected[col].cast(pl.Int64)).all()
+
+    turnover = _naive_turnover(weights)
+    assert daily['two_sided_turnover'][0] is None
+    np.testing.assert_allclose(
+        daily['two_sided_turnover'].to_numpy()[1:], turnover['trade'].to_numpy()[1:], rtol=1e-9, atol=1e-12
+    )
+
+
+def test_portfolio_daily_on_enum_barrids(weights, returns):
+    codes = pl.Enum(weights['barrid'].unique().sort())
+    expected = portfolio_daily(weights, returns)
+    result = portfolio_daily(weights.with_columns(pl.col('barrid').cast(codes)), returns)
+
+    assert result.select(pl.exclude('return', 'two_sided_turnover')).equals(expected.select(pl.exclude('return', 'two_sided_turnover')))
+    for col in ['return', 'two_sided_turnover']:
+        np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-12, atol=1e-15, equal_nan=True)
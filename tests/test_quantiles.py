@@ -0,0 +1,86 @@
+import numpy as np
+import polars as pl
+import pytest
+import sf_quant.research as sfr
+import sf_quant.research.quantile_portfolios as quantile_portfolios
+
+from quantiles import BIN_COUNTS, bin_returns, port_metrics, quantile_ports
+
+
+@pytest.fixture(scope="module")
+def tied_signal(signal) -> pl.DataFrame:
+    # Round some alphas so dates have ties, which qcut breaks by value
+    return signal.with_columns(
+        pl.when(pl.col('barrid').str.ends_with('7'))
+        .then(pl.col('alpha').round(3))
+        .otherwise(pl.col('alpha'))
+    )
+
+
+@pytest.fixture(scope="module")
+def benchmark(tied_signal) -> pl.DataFrame:
+    return tied_signal.group_by('date').agg(pl.col('return').mean().alias('bmk_return')).sort('date')
+
+
+def _qcut_returns(signal: pl.DataFrame, num_bins: int) -> pl.DataFrame:
+    return (
+        signal
+        .with_columns(pl.col('alpha').qcut(num_bins, labels=[str(i) for i in range(1, num_bins + 1)]).over('date').alias('bin'))
+        .group_by('date', pl.col('bin').cast(pl.String).cast(pl.Int8))
+        .agg(pl.col('return').mean().alias('expected'))
+    )
+
+
+def test_bin_returns_matches_qcut(tied_signal):
+    returns = bin_returns(tied_signal)
+
+    assert returns['num_bins'].unique().sort().to_list() == list(BIN_COUNTS)
+    for n in BIN_COUNTS:
+        joined = _qcut_returns(tied_signal, n).join(
+            returns.filter(pl.col('num_bins') == n), on=['date', 'bin'], how='full', coalesce=True
+        )
+        assert joined.height == returns.filter(pl.col('num_bins') == n).height
+        np.testing.assert_allclose(
+            joined['ew_return'].to_numpy(), joined['expected'].to_numpy(), rtol=1e-12, atol=1e-15
+        )
+
+
+def test_bin_returns_skips_null_signal(tied_signal):
+    with_nulls = tied_signal.with_columns(
+        pl.when(pl.col('barrid').str.ends_with('3')).then(None).otherwise(pl.col('alpha')).alias('alpha')
+    )
+    expected = bin_returns(with_nulls.drop_nulls('alpha'), bin_counts=range(5, 6))
+
+    assert bin_returns(with_nulls, bin_counts=range(5, 6)).equals(expected)
+
+
+def test_quantile_ports_matches_generate_quantile_ports(tied_signal, benchmark, monkeypatch):
+    monkeypatch.setattr(
+        quantile_portfolios,
+        "load_benchmark_returns",
+        lambda start, end: benchmark.filter(pl.col('date').is_between(start, end)),
+    )
+    returns = bin_returns(tied_signal)
+
+    for n in [2, 5, 10]:
+        expected = sfr.generate_quantile_ports(tied_signal, n, 'alpha').sort('date')
+        result = quantile_ports(returns, n, benchmark)
+        # generate_quantile_ports orders p_10 after p_1
+        assert sorted(result.columns) == sorted(expected.columns)
+        expected = expected.select(result.columns)
+        assert result['date'].equals(expected['date'])
+        for col in result.columns[1:]:
+            np.testing.assert_allclose(result[col].to_numpy(), expected[col].to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_port_metrics_annualizes_each_portfolio(tied_signal, benchmark):
+    ports = quantile_ports(bin_returns(tied_signal, bin_counts=range(3, 4)), 3, benchmark)
+    metrics = port_metrics(ports)
+
+    assert metrics['quantile'].to_list() == ['p_1', 'p_2', 'p_3', 'spread']
+    spread = ports['spread'].drop_nulls()
+    row = metrics.filter(pl.col('quantile') == 'spread').row(0, named=True)
+    assert row['n_obs'] == spread.len()
+    assert row['annual_return'] == pytest.approx(spread.mean() * 252)
+    assert row['sharpe_ratio'] == pytest.approx(spread.mean() / spread.std() * np.sqrt(252))
+    assert row['total_return'] == pytest.approx((1 + spread).product() - 1)
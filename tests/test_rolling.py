@@ -0,0 +1,88 @@
+import datetime as dt
+import numpy as np
+import polars as pl
+import pytest
+
+from rolling import rolling_ics, rolling_returns
+
+WINDOWS = (5, 21, 63)
+
+
+@pytest.fixture(scope="module")
+def returns() -> pl.DataFrame:
+    rng = np.random.default_rng(11)
+    n = 300
+    market = rng.normal(0.0003, 0.01, n)
+    frame = pl.DataFrame({
+        'date': pl.date_range(dt.date(2020, 1, 1), dt.date(2020, 1, 1) + dt.timedelta(days=n - 1), eager=True),
+        # A level far from zero, which a naive sum of squares would lose precision on
+        'return': 0.05 + 0.8 * market + rng.normal(0.0, 0.005, n),
+        'bmk_return': market,
+    })
+    return frame.with_columns(
+        pl.when(pl.int_range(pl.len()) % 41 == 7).then(None).otherwise(pl.col('return')).alias('return')
+    ).reverse()
+
+
+def _naive_returns(returns: pl.DataFrame, window: int) -> pl.DataFrame:
+    frame = returns.drop_nulls().sort('date')
+    r, m = frame['return'].to_numpy(), frame['bmk_return'].to_numpy()
+    rows = []
+    for end in range(window - 1, len(r)):
+        x, y = r[end - window + 1:end + 1], m[end - window + 1:end + 1]
+        rows.append({
+            'date': frame['date'][end],
+            'sharpe': x.mean() / x.std(ddof=1) * np.sqrt(252),
+            'vol': x.std(ddof=1) * np.sqrt(252),
+            'hit_rate': (x > 0).mean(),
+            'beta': np.cov(x, y)[0, 1] / y.var(ddof=1),
+        })
+    return pl.DataFrame(rows)
+
+
+def test_rolling_returns_match_naive_windows(returns):
+    result = rolling_returns(returns, market='bmk_return', windows=WINDOWS)
+
+    assert result['window'].unique().sort().to_list() == list(WINDOWS)
+    for window in WINDOWS:
+        expected = _naive_returns(returns, window)
+        part = result.filter(pl.col('window') == window)
+        assert part['date'].equals(expected['date'])
+        for col in ['sharpe', 'vol', 'hit_rate', 'beta']:
+            np.testing.assert_allclose(part[col].to_numpy(), expected[col].to_numpy(), rtol=1e-8)
+
+
+def test_rolling_returns_without_market(returns):
+    result = rolling_returns(returns, windows=(21,))
+    with_market = rolling_returns(returns, market='bmk_return', windows=(21,))
+
+    assert result.columns == ['date', 'window', 'sharpe', 'vol', 'hit_rate']
+    assert result.equals(with_market.drop('beta'))
+
+
+def test_rolling_ics_match_polars_rolling(returns):
+    ics = returns.select('date', pl.col('return').alias('ic'))
+    result = rolling_ics(ics, windows=WINDOWS)
+
+    for window in WINDOWS:
+        expected = (
+            ics.drop_nulls().sort('date')
+            .select(
+                'date',
+                pl.col('ic').rolling_mean(window).alias('ic_mean'),
+                pl.col('ic').rolling_mean(window).truediv(pl.col('ic').rolling_std(window)).alias('icir'),
+            )
+            .drop_nulls()
+        )
+        part = result.filter(pl.col('window') == window)
+        assert part['date'].equals(expected['date'])
+        for col in ['ic_mean', 'icir']:
+            np.testing.assert_allclose(part[col].to_numpy(), expected[col].to_numpy(), rtol=1e-8)
+
+
+def test_windows_longer_than_the_series(returns):
+    short = returns.drop_nulls().head(10)
+
+    assert rolling_returns(short, market='bmk_return', windows=(21,)).is_empty()
+    assert rolling_ics(short.select('date', pl.col('return').alias('ic')), windows=(21,)).is_empty()
+    assert rolling_returns(short, windows=(5, 21))['window'].unique().to_list() == [5]
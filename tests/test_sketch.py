@@ -0,0 +1,81 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from sketch import TAIL_QUANTILES, Histogram, TDigest, column_sketch
+
+
+def _rank_error(values: np.ndarray, estimates: np.ndarray, q: np.ndarray) -> np.ndarray:
+    # Distance in probability between each estimate's empirical rank and its target
+    return np.abs(np.searchsorted(np.sort(values), estimates) / len(values) - q)
+
+
+@pytest.mark.parametrize("dist", ["normal", "student_t"])
+def test_tdigest_quantiles_match_numpy(dist):
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(200_000) if dist == "normal" else rng.standard_t(3, 200_000)
+    digest = TDigest()
+    for batch in np.array_split(values, 8):
+        digest.merge(TDigest().update(batch))
+
+    q = np.array(TAIL_QUANTILES)
+    # The arcsine scale keeps the rank error proportional to the tail mass
+    tolerance = np.minimum(1e-3, 0.1 * np.minimum(q, 1 - q))
+    assert (_rank_error(values, digest.quantile(q), q) <= tolerance).all()
+    np.testing.assert_allclose(digest.quantile(q), np.quantile(values, q), rtol=0.05, atol=0.02)
+    assert digest.n == len(values)
+    assert digest.quantile(0.0) == values.min()
+    assert digest.quantile(1.0) == values.max()
+    assert len(digest.weights) <= digest.compression + 1
+
+
+def test_tdigest_update_and_merge_agree():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(size=50_000)
+    values[::97] = np.nan
+    merged = TDigest()
+    for batch in np.array_split(values, 5):
+        merged.merge(TDigest().update(batch))
+    updated = TDigest()
+    for batch in np.array_split(values, 5):
+        updated.update(batch)
+
+    q = np.array(TAIL_QUANTILES)
+    finite = values[~np.isnan(values)]
+    assert merged.n == updated.n == len(finite)
+    assert (_rank_error(finite, merged.quantile(q), q) <= 1e-3).all()
+    assert (_rank_error(finite, updated.quantile(q), q) <= 1e-3).all()
+
+
+def test_empty_tdigest():
+    digest = TDigest().update(np.array([np.nan])).merge(TDigest())
+
+    assert digest.n == 0
+    assert np.isnan(digest.quantile([0.1, 0.9])).all()
+
+
+def test_histogram_matches_numpy():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=10_000)
+    edges = np.linspace(-2.0, 2.0, 21)
+    left, right = Histogram(edges).update(values[:4_000]), Histogram(edges).update(values[4_000:])
+    histogram = left.merge(right)
+
+    np.testing.assert_array_equal(histogram.counts, np.histogram(values, bins=edges)[0])
+    assert histogram.underflow == (values < -2.0).sum()
+    assert histogram.overflow == (values > 2.0).sum()
+    with pytest.raises(ValueError):
+        histogram.merge(Histogram(np.linspace(-1.0, 1.0, 21)))
+
+
+def test_column_sketch_bins_like_plt_hist(signal):
+    signal = signal.with_columns(pl.when(pl.col('barrid').str.ends_with('5')).then(None).otherwise(pl.col('alpha')).alias('alpha'))
+    values = signal['alpha'].drop_nulls().to_numpy()
+    digest, histogram = column_sketch(signal, 'alpha', bins=30)
+
+    counts, edges = np.histogram(values, bins=30)
+    np.testing.assert_allclose(histogram.edges, edges)
+    np.testing.assert_array_equal(histogram.counts, counts)
+    assert histogram.underflow == histogram.overflow == 0
+    assert digest.n == len(values)
+    assert (digest.min, digest.max) == (values.min(), values.max())
@@ -0,0 +1,75 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from create_signal import LOOKBACK, SKIP, compute_signal
+from sweep import sweep_momentum, to_long
+
+
+def _reference(assets: pl.DataFrame, lookback: int, skip: int) -> pl.DataFrame:
+    return (
+        assets
+        .sort('barrid', 'date')
+        .with_columns(
+            pl.col('return').truediv(100).log1p()
+            .rolling_sum(window_size=lookback).shift(skip).over('barrid')
+            .alias('signal')
+        )
+        .with_columns(
+            pl.col('signal').sub(pl.col('signal').mean()).truediv(pl.col('signal').std()).over('date')
+            .alias('score')
+        )
+        .select('date', 'barrid', 'score')
+    )
+
+
+def test_sweep_matches_rolling_sum_per_variant(assets):
+    lookbacks, skips = [5, 21, 63], [0, 1, 22]
+    scores = sweep_momentum(assets, lookbacks, skips)
+
+    for lookback in lookbacks:
+        for skip in skips:
+            joined = _reference(assets, lookback, skip).join(
+                scores.select('date', 'barrid', f"score_{lookback}_{skip}"),
+                on=['date', 'barrid'],
+                how='left',
+            )
+            expected = joined['score'].to_numpy()
+            actual = joined[f"score_{lookback}_{skip}"].to_numpy()
+            np.testing.assert_array_equal(np.isnan(expected), np.isnan(actual))
+            np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_sweep_matches_compute_signal(clean_assets):
+    signal = compute_signal(clean_assets).select('date', 'barrid', 'score').sort('date', 'barrid')
+    scores = (
+        sweep_momentum(clean_assets, [LOOKBACK], [SKIP])
+        .drop_nulls(f"score_{LOOKBACK}_{SKIP}")
+        .select('date', 'barrid', pl.col(f"score_{LOOKBACK}_{SKIP}").alias('score'))
+    )
+
+    assert signal.height > 0
+    assert scores.select('date', 'barrid').equals(signal.select('date', 'barrid'))
+    np.testing.assert_allclose(scores['score'].to_numpy(), signal['score'].to_numpy(), rtol=1e-9, atol=1e-9)
+
+
+def test_sweep_drops_rows_without_a_variant(assets):
+    scores = sweep_momentum(assets, [63], [0, 22])
+
+    assert scores.filter(pl.col('score_63_0').is_null() & pl.col('score_63_22').is_null()).height == 0
+    assert scores.select('date', 'barrid').is_duplicated().sum() == 0
+    assert scores.select('date', 'barrid').equals(scores.select('date', 'barrid').sort('date', 'barrid'))
+
+
+def test_to_long_keeps_one_row_per_valid_score(assets):
+    scores = sweep_momentum(assets, [5, 21], [0, 1])
+    long = to_long(scores)
+
+    names = [c for c in scores.columns if c.startswith('score_')]
+    assert long.height == sum(scores[name].is_not_null().sum() for name in names)
+    assert set(long.select('lookback', 'skip').unique().iter_rows()) == {(5, 0), (5, 1), (21, 0), (21, 1)}
+    row = long.filter(pl.col('lookback') == 21, pl.col('skip') == 1).head(1)
+    expected = scores.filter(
+        pl.col('date') == row['date'][0], pl.col('barrid') == row['barrid'][0]
+    )['score_21_1'][0]
+    assert row['score'][0] == pytest.approx(expected)